@@ -0,0 +1,48 @@
+"""
+Shared pytest setup for the auth service tests.
+Points the service at a throwaway SQLite database before any src module reads its settings.
+"""
+import asyncio
+import os
+import tempfile
+import uuid
+
+import pytest
+
+TEST_DIR = tempfile.mkdtemp(prefix="todo-auth-tests-")
+TEST_SECRET = "test-secret-key-test-secret-key-0123"
+
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{TEST_DIR}/auth.db"
+os.environ["AUTH_SECRET_KEY"] = TEST_SECRET
+os.environ["LOGIN_RATE_LIMIT_ENABLED"] = "0"
+# Cheapest bcrypt cost, pinned so startup skips the calibration
+os.environ["PASSWORD_HASH_ROUNDS"] = "4"
+# An empty PROMETHEUS_MULTIPROC_DIR would still switch prometheus_client to multiprocess mode
+os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+
+
+def run_app(scenario):
+    """
+    Start the app, run `await scenario(client)` against it through httpx, and close its pool.
+    The password hashing pool is left running for the next test.
+    """
+    import httpx
+    from src.main import app
+    from src.database import async_engine
+
+    async def main():
+        await app.router.startup()
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await scenario(client)
+        finally:
+            await async_engine.dispose()
+
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def credentials():
+    """Registration data of a user that does not exist yet"""
+    return {"email": f"user-{uuid.uuid4().hex[:12]}@example.com", "name": "Test User", "password": "Str0ng!Passw0rd"}
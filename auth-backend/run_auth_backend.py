@@ -8,9 +8,13 @@ load_dotenv()
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-# Import and run the main application
-from src.main import app
-
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    if "--production" in sys.argv:
+        # Several workers with uvloop/httptools and a shared connection budget
+        from src.server import serve
+        serve("src.main:app", app_dir=os.path.dirname(os.path.abspath(__file__)), port=8001)
+    else:
+        # Import and run the main application
+        from src.main import app
+        import uvicorn
+        uvicorn.run(app, host="0.0.0.0", port=8001)
@@ -0,0 +1,3 @@
+"""
+Authentication service source package.
+"""
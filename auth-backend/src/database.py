@@ -4,10 +4,13 @@ Handles database connection settings and initialization.
 """
 import os
 from typing import AsyncGenerator
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from sqlmodel import SQLModel
 from .models.user import User
+from .models.refresh_token import RefreshToken
+from .models.revoked_token import RevokedToken
+from .metrics import TimedQueuePool
 import logging
 
 # Get database URL from environment
@@ -26,18 +29,55 @@ else:
         # Handle older postgres:// format
         DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql+asyncpg://", 1)
 
+# SQLite performance profile, applied to every new connection
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}",
+    f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+    f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}",
+    f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply the SQLite performance profile to a new connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
 # Create async engine based on database type
 if DATABASE_URL.startswith("sqlite+aiosqlite"):
     # For SQLite, we don't need asyncpg
+    sqlite_options = {}
+    if ":memory:" not in DATABASE_URL:
+        # Keep connections open so the pragmas and page cache survive between requests
+        sqlite_options = {
+            "poolclass": TimedQueuePool,
+            "pool_size": int(os.getenv("DATABASE_POOL_SIZE", "5")),
+            "max_overflow": int(os.getenv("DATABASE_MAX_OVERFLOW", "10")),
+        }
     async_engine = create_async_engine(
         DATABASE_URL,
         echo=bool(os.getenv("DATABASE_ECHO", "")),  # Set DATABASE_ECHO=1 to enable SQL logging
+        **sqlite_options
     )
+    event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
 else:
     # For PostgreSQL (NeonDB), use asyncpg
     async_engine = create_async_engine(
         DATABASE_URL,
         echo=bool(os.getenv("DATABASE_ECHO", "")),  # Set DATABASE_ECHO=1 to enable SQL logging
+        poolclass=TimedQueuePool,  # Records checkout wait for /metrics
         pool_size=int(os.getenv("DATABASE_POOL_SIZE", "5")),
         max_overflow=int(os.getenv("DATABASE_MAX_OVERFLOW", "10")),
         pool_pre_ping=True,  # Verify connections before use
@@ -56,20 +96,7 @@ AsyncSessionLocal = sessionmaker(
 # Import all models to ensure they're registered with SQLModel
 def get_models():
     """Return list of all models for database creation"""
-    return [User]
-
-# Create all tables
-async def create_db_and_tables():
-    """Create all database tables"""
-    try:
-        async with async_engine.begin() as conn:
-            # Create tables if they don't exist
-            await conn.run_sync(SQLModel.metadata.create_all)
-        print("Database tables created successfully")
-    except Exception as e:
-        print(f"Error creating database tables: {e}")
-        # In production, you might want to handle this differently
-        # For now, we'll let the application continue but log the error
+    return [User, RefreshToken, RevokedToken]
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -10,6 +10,10 @@ import os
 from datetime import datetime, timedelta, timezone
 import secrets
 import logging
+import time
+import uuid
+
+from .metrics import auth_token_verifications
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -29,6 +33,9 @@ if not SECRET_KEY:
 
 ALGORITHM = "HS256"
 
+# Audience of the tokens services sign to read the revocation feed; user tokens have none
+REVOCATIONS_AUDIENCE = "todo-revocations"
+
 def verify_token(token: str) -> Optional[Dict]:
     """
     Verify JWT token and return payload if valid
@@ -46,14 +53,32 @@ def verify_token(token: str) -> Optional[Dict]:
 
         # Check if token is expired
         exp = payload.get("exp")
-        if exp and datetime.fromtimestamp(exp) < datetime.now(timezone.utc):
+        if exp and exp < time.time():
             logger.warning("Token expired")
+            auth_token_verifications.labels(result="expired").inc()
             return None
 
+        auth_token_verifications.labels(result="verified").inc()
         return payload
     except JWTError as e:
         logger.warning(f"Token verification failed: {str(e)}")
+        auth_token_verifications.labels(result="invalid").inc()
+        return None
+
+def verify_service_token(token: str, audience: str) -> Optional[Dict]:
+    """
+    Verify a service token addressed to the given audience and return its payload if valid.
+    User access tokens carry no audience and are rejected.
+    """
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM], audience=audience)
+    except JWTError as e:
+        logger.warning(f"Service token verification failed: {str(e)}")
+        return None
+    if payload.get("aud") != audience:
+        logger.warning("Service token verification failed: missing audience")
         return None
+    return payload
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict:
     """
@@ -62,6 +87,9 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     token = credentials.credentials
 
     user_data = verify_token(token)
+    # Service tokens are not user sessions, even though they share the signing key
+    if user_data is not None and "scope" in user_data:
+        user_data = None
     if user_data is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -97,7 +125,12 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         # Default to 1 hour if not specified
         expire = datetime.now(timezone.utc) + timedelta(hours=1)
 
-    to_encode.update({"exp": expire.timestamp()})
+    # jti identifies the token so it can be revoked on logout
+    to_encode.update({
+        "exp": expire.timestamp(),
+        "iat": datetime.now(timezone.utc).timestamp(),
+        "jti": uuid.uuid4().hex,
+    })
 
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
\ No newline at end of file
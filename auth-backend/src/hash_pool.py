@@ -0,0 +1,147 @@
+"""
+Password hashing worker pool for the Authentication service.
+Runs bcrypt hashing and verification off the event loop in a bounded thread pool,
+and calibrates the bcrypt cost to the host at startup.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Tuple
+from passlib.hash import bcrypt
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+
+from .metrics import password_hash_seconds, password_hash_queue_seconds, password_hash_rejected_total
+
+logger = logging.getLogger(__name__)
+
+# Pool configuration from environment
+# bcrypt releases the GIL while hashing, so threads scale across cores
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(os.cpu_count() or 1)))
+HASH_QUEUE_SIZE = int(os.getenv("HASH_QUEUE_SIZE", "64"))
+HASH_RETRY_AFTER = int(os.getenv("HASH_RETRY_AFTER", "1"))
+
+# Cost calibration: pick the bcrypt rounds whose hash time is closest to the target.
+# Set PASSWORD_HASH_ROUNDS to pin the cost and skip calibration.
+PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", "0"))
+PASSWORD_HASH_TARGET_MS = float(os.getenv("PASSWORD_HASH_TARGET_MS", "250"))
+PASSWORD_HASH_MIN_ROUNDS = int(os.getenv("PASSWORD_HASH_MIN_ROUNDS", "10"))
+PASSWORD_HASH_MAX_ROUNDS = int(os.getenv("PASSWORD_HASH_MAX_ROUNDS", "15"))
+
+# Rounds used to time the host; each extra round doubles the cost
+CALIBRATION_PROBE_ROUNDS = 8
+CALIBRATION_SAMPLES = 3
+
+
+def calibrate_bcrypt_rounds(
+    target_ms: float = PASSWORD_HASH_TARGET_MS,
+    min_rounds: int = PASSWORD_HASH_MIN_ROUNDS,
+    max_rounds: int = PASSWORD_HASH_MAX_ROUNDS
+) -> int:
+    """
+    Benchmark bcrypt on this host and return the rounds that best match the target latency,
+    clamped to [min_rounds, max_rounds]
+    """
+    hasher = bcrypt.using(rounds=CALIBRATION_PROBE_ROUNDS)
+    samples = []
+    for _ in range(CALIBRATION_SAMPLES):
+        started = time.perf_counter()
+        hasher.hash("calibration-probe")
+        samples.append(time.perf_counter() - started)
+    probe_ms = min(samples) * 1000
+
+    rounds = CALIBRATION_PROBE_ROUNDS + round(math.log2(target_ms / probe_ms))
+    rounds = max(min_rounds, min(max_rounds, rounds))
+    logger.info(
+        f"bcrypt calibration: {probe_ms:.1f}ms at {CALIBRATION_PROBE_ROUNDS} rounds, "
+        f"using {rounds} rounds (~{probe_ms * 2 ** (rounds - CALIBRATION_PROBE_ROUNDS):.0f}ms, target {target_ms:.0f}ms)"
+    )
+    return rounds
+
+
+class HashPoolSaturated(Exception):
+    """Raised when every worker is busy and the wait queue is full"""
+
+
+class HashPool:
+    """
+    Thread pool for password hashing with a bounded number of waiting jobs.
+    Tracks queue depth and hashing latency.
+    """
+
+    def __init__(self, workers: int = HASH_WORKERS, queue_size: int = HASH_QUEUE_SIZE):
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hash")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.hash_seconds_total = 0.0
+        self.hash_seconds_max = 0.0
+        self.wait_seconds_total = 0.0
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """
+        Run a hashing function in the pool and await its result.
+        Raises HashPoolSaturated instead of queueing beyond the configured bound.
+        """
+        with self._lock:
+            if self._pending >= self.workers + self.queue_size:
+                self.rejected += 1
+                password_hash_rejected_total.inc()
+                raise HashPoolSaturated()
+            self._pending += 1
+
+        submitted = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result, wait, elapsed = await loop.run_in_executor(self._executor, self._timed, func, submitted, args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+        password_hash_queue_seconds.observe(wait)
+        password_hash_seconds.labels(operation=getattr(func, "__name__", "hash")).observe(elapsed)
+        return result
+
+    def _timed(self, func: Callable[..., Any], submitted: float, args: tuple) -> Tuple[Any, float, float]:
+        """Run func in a worker thread; returns its result, queue wait and run time"""
+        started = time.perf_counter()
+        with self._lock:
+            self._running += 1
+        try:
+            result = func(*args)
+            return result, started - submitted, time.perf_counter() - started
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._running -= 1
+                self.completed += 1
+                self.hash_seconds_total += elapsed
+                self.hash_seconds_max = max(self.hash_seconds_max, elapsed)
+                self.wait_seconds_total += started - submitted
+
+    def stats(self) -> Dict[str, float]:
+        """Return queue depth and latency counters"""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "running": self._running,
+                "queue_depth": max(0, self._pending - self._running),
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_hash_seconds": self.hash_seconds_total / self.completed if self.completed else 0.0,
+                "max_hash_seconds": self.hash_seconds_max,
+                "avg_wait_seconds": self.wait_seconds_total / self.completed if self.completed else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        """Stop accepting work and wait for running jobs"""
+        self._executor.shutdown(wait=True)
+
+
+hash_pool = HashPool()
@@ -9,9 +9,18 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from fastapi import FastAPI
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 from .routes.auth import router as auth_router
-from .database import create_db_and_tables
+from .database import async_engine
+from .migrations import ensure_schema
+from .metrics import (
+    MetricsMiddleware, PROMETHEUS_MULTIPROC_DIR, CONTENT_TYPE, register_pools, render, sample_pools_forever
+)
+import asyncio
+from .hash_pool import hash_pool
+from .rate_limit import rate_limit_stats
+from .routes.auth import configure_password_hashing
 import json
 
 # Get allowed origins from environment, default to localhost
@@ -33,13 +42,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record request latency, status codes and in-flight requests for /metrics
+app.add_middleware(MetricsMiddleware)
+
+register_pools(lambda: {"primary": async_engine})
+
 # Event handlers for startup
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database tables on startup"""
+    """Calibrate password hashing and check the schema version, migrating if needed, on startup"""
     import os
     print(f"AUTH_SECRET_KEY loaded: {'YES' if os.getenv('AUTH_SECRET_KEY') else 'NO'}")
-    await create_db_and_tables()
+    await configure_password_hashing()
+    await ensure_schema()
+    if PROMETHEUS_MULTIPROC_DIR:
+        app.state.metrics_flush = asyncio.create_task(sample_pools_forever())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Wait for in-flight password hashing jobs and close pooled database connections"""
+    task = getattr(app.state, "metrics_flush", None)
+    if task is not None:
+        task.cancel()
+    hash_pool.shutdown()
+    await async_engine.dispose()
 
 # Include auth routes
 app.include_router(auth_router, prefix="/auth", tags=["authentication"])
@@ -52,4 +78,19 @@ def read_root():
 @app.get("/health")
 def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "authentication-api"}
\ No newline at end of file
+    return {"status": "healthy", "service": "authentication-api"}
+
+@app.get("/health/hashing")
+def hashing_stats():
+    """Password hashing pool queue depth and latency"""
+    return hash_pool.stats()
+
+@app.get("/health/rate-limit")
+def login_rate_limit_stats():
+    """Login admission control counters, including rejected attempts"""
+    return rate_limit_stats()
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics, aggregated across workers when running several"""
+    return Response(render(), media_type=CONTENT_TYPE)
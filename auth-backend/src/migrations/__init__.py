@@ -0,0 +1,152 @@
+"""
+Versioned schema migrations for the Authentication service, run with Alembic.
+Revisions live in versions/ and the applied one is recorded in this service's own version
+table, so the task service can keep its revisions in the same database.
+Startup reads that single row and runs no DDL when the schema is current. Pending revisions
+are applied by one worker at a time.
+Run `python -m src.migrations` from the auth-backend directory to migrate ahead of a deploy.
+"""
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+import asyncio
+import logging
+import os
+
+from ..database import async_engine
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; SQLite migrations then run unlocked
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Schema component tracked by this service
+COMPONENT = "auth"
+# Alembic version table of this component; the task service uses its own
+VERSION_TABLE = f"alembic_version_{COMPONENT}"
+# Apply pending migrations at startup (set DATABASE_AUTO_MIGRATE=0 to require running them ahead of deploys)
+DATABASE_AUTO_MIGRATE = os.getenv("DATABASE_AUTO_MIGRATE", "1").lower() in ("1", "true", "yes")
+# PostgreSQL advisory lock key held while migrating; distinct from the task service's key
+MIGRATION_LOCK_KEY = 0x7A5D
+# Directory holding env.py and versions/
+SCRIPT_LOCATION = os.path.dirname(os.path.abspath(__file__))
+
+
+class SchemaOutdated(RuntimeError):
+    """Raised at startup when migrations are pending and DATABASE_AUTO_MIGRATE is off"""
+
+
+def alembic_config(connection: Optional[Connection] = None) -> Config:
+    """Alembic configuration for this component; env.py runs on the given connection"""
+    config = Config()
+    config.set_main_option("script_location", SCRIPT_LOCATION)
+    config.attributes["connection"] = connection
+    config.attributes["version_table"] = VERSION_TABLE
+    return config
+
+
+def get_head_revision() -> str:
+    """Latest revision shipped with this release"""
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+async def get_schema_revision(engine: AsyncEngine) -> Optional[str]:
+    """Read the applied revision; None if nothing was ever migrated with Alembic"""
+    async with engine.connect() as conn:
+        try:
+            result = await conn.execute(text(f"SELECT version_num FROM {VERSION_TABLE}"))
+        except DBAPIError:
+            # The version table does not exist yet
+            return None
+        return result.scalar()
+
+
+@asynccontextmanager
+async def migration_lock(engine: AsyncEngine) -> AsyncIterator[None]:
+    """
+    Let one process migrate at a time: a session advisory lock on PostgreSQL, a lock file
+    next to the database on SQLite.
+    """
+    if engine.dialect.name == "postgresql":
+        async with engine.connect() as conn:
+            # Autocommit, so this connection holds no transaction a concurrent index build would wait for
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            try:
+                yield
+            finally:
+                await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        return
+
+    database = engine.url.database
+    if engine.dialect.name != "sqlite" or fcntl is None or not database or database == ":memory:":
+        yield
+        return
+    with open(f"{database}.{COMPONENT}.migrate.lock", "w") as lock_file:
+        await asyncio.to_thread(fcntl.flock, lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def upgrade(connection: Connection) -> None:
+    command.upgrade(alembic_config(connection), "head")
+
+
+async def migrate(engine: AsyncEngine = async_engine) -> Optional[str]:
+    """Apply pending revisions in order and return the resulting revision"""
+    async with migration_lock(engine):
+        # Alembic re-reads the version under the lock, so revisions another worker applied are skipped
+        async with engine.connect() as conn:
+            await conn.run_sync(upgrade)
+        return await get_schema_revision(engine)
+
+
+async def ensure_schema(engine: AsyncEngine = async_engine) -> None:
+    """
+    Startup check: one indexed read when the schema is current.
+    Otherwise migrates, or raises SchemaOutdated when DATABASE_AUTO_MIGRATE is off.
+    """
+    script = ScriptDirectory.from_config(alembic_config())
+    head = script.get_current_head()
+    revision = await get_schema_revision(engine)
+    if revision == head:
+        return
+    if revision is not None and revision not in {known.revision for known in script.walk_revisions()}:
+        logger.warning(f"{COMPONENT} schema revision {revision} is newer than this release ({head})")
+        return
+    if not DATABASE_AUTO_MIGRATE:
+        raise SchemaOutdated(
+            f"{COMPONENT} schema is at revision {revision}, expected {head}; run `python -m src.migrations`"
+        )
+    revision = await migrate(engine)
+    print(f"Database schema migrated to {COMPONENT} revision {revision}")
+
+
+async def main(argv) -> int:
+    """Migrate, or with --check only report whether migrations are pending"""
+    head = get_head_revision()
+    try:
+        if "--check" in argv:
+            revision = await get_schema_revision(async_engine)
+            print(f"{COMPONENT} schema revision {revision}, latest {head}")
+            return 0 if revision == head else 1
+        revision = await migrate()
+        print(f"{COMPONENT} schema revision {revision}")
+        return 0
+    finally:
+        await async_engine.dispose()
@@ -0,0 +1,12 @@
+"""
+Apply pending migrations: `python -m src.migrations`, or `--check` to only report them.
+"""
+import asyncio
+import logging
+import sys
+
+from . import main
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(asyncio.run(main(sys.argv[1:])))
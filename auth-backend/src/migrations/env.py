@@ -0,0 +1,17 @@
+"""
+Alembic environment: runs the revisions on the connection passed in by src.migrations,
+recording them in that component's own version table.
+"""
+from alembic import context
+
+config = context.config
+
+context.configure(
+    connection=config.attributes["connection"],
+    version_table=config.attributes["version_table"],
+    # Each revision commits together with its version bump
+    transaction_per_migration=True,
+)
+
+with context.begin_transaction():
+    context.run_migrations()
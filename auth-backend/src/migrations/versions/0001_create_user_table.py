@@ -0,0 +1,31 @@
+"""
+Create the user table
+
+Revision ID: 0001
+Revises:
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Databases created by the old create_all startup already have this table and are left as is
+    if not sa.inspect(op.get_bind()).has_table("user"):
+        op.create_table(
+            "user",
+            sa.Column("email", sa.String(255), nullable=False, unique=True),
+            sa.Column("name", sa.String(255), nullable=True),
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+            sa.Column("hashed_password", sa.String(255), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("user")
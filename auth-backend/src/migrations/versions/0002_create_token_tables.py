@@ -0,0 +1,48 @@
+"""
+Create the refresh and revoked token tables
+
+Revision ID: 0002
+Revises: 0001
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("refresh_token"):
+        op.create_table(
+            "refresh_token",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("user_id", sa.String(255), nullable=False),
+            # Every token rotated from the same login shares a family; reuse revokes the whole family
+            sa.Column("family_id", sa.String(64), nullable=False),
+            sa.Column("token_hash", sa.String(64), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("expires_at", sa.DateTime(), nullable=False),
+            sa.Column("revoked_at", sa.DateTime(), nullable=True),
+            sa.Column("replaced_by", sa.String(64), nullable=True),
+        )
+        op.create_index("ix_refresh_token_user_id", "refresh_token", ["user_id"])
+        op.create_index("ix_refresh_token_family_id", "refresh_token", ["family_id"])
+    if not inspector.has_table("revoked_token"):
+        op.create_table(
+            "revoked_token",
+            sa.Column("jti", sa.String(64), primary_key=True),
+            sa.Column("user_id", sa.String(255), nullable=False),
+            sa.Column("expires_at", sa.DateTime(), nullable=False),
+            sa.Column("revoked_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_revoked_token_expires_at", "revoked_token", ["expires_at"])
+        # Indexed so verifying services can fetch revocations incrementally
+        op.create_index("ix_revoked_token_revoked_at", "revoked_token", ["revoked_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("revoked_token")
+    op.drop_table("refresh_token")
@@ -0,0 +1,25 @@
+"""
+Index refresh tokens by expiry so expired ones can be pruned
+
+Revision ID: 0003
+Revises: 0002
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Built concurrently on PostgreSQL so logins and refreshes continue during the build
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_refresh_token_expires_at", "refresh_token", ["expires_at"],
+            if_not_exists=True, postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_refresh_token_expires_at", table_name="refresh_token", if_exists=True)
@@ -0,0 +1,27 @@
+"""
+Refresh token model for the Authentication service.
+Stores hashed, rotating refresh tokens grouped into families for reuse detection.
+"""
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+import uuid
+
+class RefreshToken(SQLModel, table=True):
+    """Refresh token record; only a hash of the token secret is stored"""
+    __tablename__ = "refresh_token"
+
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex, primary_key=True)
+    user_id: str = Field(index=True, max_length=255)
+    # Every token rotated from the same login shares a family; reuse revokes the whole family
+    family_id: str = Field(index=True, max_length=64)
+    token_hash: str = Field(nullable=False, max_length=64)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Indexed so expired tokens can be pruned without a table scan
+    expires_at: datetime = Field(nullable=False, index=True)
+    revoked_at: Optional[datetime] = Field(default=None)
+    replaced_by: Optional[str] = Field(default=None, max_length=64)
+
+class RefreshRequest(SQLModel):
+    """Model for exchanging a refresh token for new tokens"""
+    refresh_token: str
@@ -0,0 +1,31 @@
+"""
+Revoked access token model for the Authentication service.
+Records the jti of logged-out access tokens until they would have expired.
+"""
+from sqlmodel import SQLModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+class RevokedToken(SQLModel, table=True):
+    """Revoked access token, kept until its original expiry"""
+    __tablename__ = "revoked_token"
+
+    jti: str = Field(primary_key=True, max_length=64)
+    user_id: str = Field(max_length=255)
+    expires_at: datetime = Field(nullable=False, index=True)
+    # Indexed so verifying services can fetch revocations incrementally
+    revoked_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+
+class LogoutRequest(SQLModel):
+    """Model for logging out; the refresh token, if given, is revoked with its whole family"""
+    refresh_token: Optional[str] = None
+
+class RevokedTokenRead(SQLModel):
+    """Model for one entry of the revocation feed"""
+    jti: str
+    exp: float
+
+class RevocationFeed(SQLModel):
+    """Model for returning revocations since a point in time"""
+    revoked: List[RevokedTokenRead]
+    cursor: datetime
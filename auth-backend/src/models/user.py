@@ -14,6 +14,9 @@ class UserBase(SQLModel):
 
 class User(UserBase, table=True):
     """User model for database storage"""
+    # Both services define the user table; the combined deployment maps them onto one table
+    __table_args__ = {"extend_existing": True}
+
     id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
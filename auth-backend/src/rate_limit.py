@@ -0,0 +1,169 @@
+"""
+Login admission control for the Authentication service.
+Token-bucket limiters keyed by email and client IP reject excess login attempts
+before the database lookup and the bcrypt verification.
+"""
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import logging
+import math
+import os
+import threading
+import time
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # Shared-store limiting is optional
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+# Limiter configuration from environment (set LOGIN_RATE_LIMIT_ENABLED=0 to disable)
+LOGIN_RATE_LIMIT_ENABLED = os.getenv("LOGIN_RATE_LIMIT_ENABLED", "1").lower() in ("1", "true", "yes")
+LOGIN_EMAIL_RATE_PER_MINUTE = float(os.getenv("LOGIN_EMAIL_RATE_PER_MINUTE", "10"))
+LOGIN_EMAIL_BURST = int(os.getenv("LOGIN_EMAIL_BURST", "10"))
+LOGIN_IP_RATE_PER_MINUTE = float(os.getenv("LOGIN_IP_RATE_PER_MINUTE", "60"))
+LOGIN_IP_BURST = int(os.getenv("LOGIN_IP_BURST", "60"))
+LOGIN_RATE_LIMIT_MAX_KEYS = int(os.getenv("LOGIN_RATE_LIMIT_MAX_KEYS", "100000"))
+LOGIN_RATE_LIMIT_REDIS_URL = os.getenv("LOGIN_RATE_LIMIT_REDIS_URL", "")
+# Only trust X-Forwarded-For when the service sits behind a proxy that sets it
+TRUST_FORWARDED_FOR = os.getenv("TRUST_FORWARDED_FOR", "").lower() in ("1", "true", "yes")
+
+# Atomic token bucket for the shared store: KEYS[1] bucket, ARGV rate/sec, burst, now
+REDIS_TOKEN_BUCKET_SCRIPT = """
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local tokens = tonumber(bucket[1]) or burst
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + (now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class TokenBucketLimiter:
+    """
+    In-process token buckets, one per key, in a table bounded by max_keys.
+    The least recently seen keys are evicted first, so memory stays fixed.
+    """
+
+    def __init__(self, name: str, rate_per_minute: float, burst: int, max_keys: int = LOGIN_RATE_LIMIT_MAX_KEYS):
+        self.name = name
+        self.rate = rate_per_minute / 60.0
+        self.burst = max(1, burst)
+        self.max_keys = max_keys
+        self.allowed = 0
+        self.rejected = 0
+        self.evictions = 0
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def retry_after(self, tokens: float) -> int:
+        """Seconds until a bucket holding `tokens` regains one token"""
+        return max(1, math.ceil((1 - tokens) / self.rate)) if self.rate > 0 else 60
+
+    async def acquire(self, key: str) -> Tuple[bool, int]:
+        """Take one token for a key. Returns (allowed, retry-after seconds)."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [float(self.burst), now]
+                self._buckets[key] = bucket
+                while len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+                    self.evictions += 1
+            else:
+                self._buckets.move_to_end(key)
+
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens >= 1:
+                bucket[0] = tokens - 1
+                self.allowed += 1
+                return True, 0
+            bucket[0] = tokens
+            self.rejected += 1
+            return False, self.retry_after(tokens)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "keys": len(self._buckets),
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "evictions": self.evictions,
+        }
+
+
+class RedisTokenBucketLimiter(TokenBucketLimiter):
+    """
+    Token buckets held in Redis so every worker and instance shares the same limits.
+    Counters are per worker.
+    """
+
+    def __init__(self, name: str, rate_per_minute: float, burst: int, url: str):
+        super().__init__(name, rate_per_minute, burst, max_keys=0)
+        self._client = redis_asyncio.from_url(url, decode_responses=True)
+        self._script = self._client.register_script(REDIS_TOKEN_BUCKET_SCRIPT)
+
+    async def acquire(self, key: str) -> Tuple[bool, int]:
+        allowed, tokens = await self._script(
+            keys=[f"login_rl:{self.name}:{key}"],
+            args=[self.rate, self.burst, time.time()]
+        )
+        if int(allowed):
+            self.allowed += 1
+            return True, 0
+        self.rejected += 1
+        return False, self.retry_after(float(tokens))
+
+    def stats(self) -> Dict[str, float]:
+        return {"allowed": self.allowed, "rejected": self.rejected}
+
+
+def create_limiter(name: str, rate_per_minute: float, burst: int) -> TokenBucketLimiter:
+    """Create a limiter in Redis when LOGIN_RATE_LIMIT_REDIS_URL is set, in process otherwise"""
+    if LOGIN_RATE_LIMIT_REDIS_URL:
+        if redis_asyncio is not None:
+            return RedisTokenBucketLimiter(name, rate_per_minute, burst, LOGIN_RATE_LIMIT_REDIS_URL)
+        logger.warning("LOGIN_RATE_LIMIT_REDIS_URL is set but the redis package is not installed; limiting per process")
+    return TokenBucketLimiter(name, rate_per_minute, burst)
+
+
+email_limiter = create_limiter("email", LOGIN_EMAIL_RATE_PER_MINUTE, LOGIN_EMAIL_BURST)
+ip_limiter = create_limiter("ip", LOGIN_IP_RATE_PER_MINUTE, LOGIN_IP_BURST)
+
+
+def client_ip(headers, client_host: Optional[str]) -> str:
+    """Resolve the client address, honoring X-Forwarded-For only when configured to"""
+    if TRUST_FORWARDED_FOR:
+        forwarded = headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return client_host or "unknown"
+
+
+async def admit_login(email: str, ip: str) -> Tuple[bool, int]:
+    """
+    Check both the client IP and the target email buckets.
+    Returns (allowed, retry-after seconds).
+    """
+    if not LOGIN_RATE_LIMIT_ENABLED:
+        return True, 0
+    allowed, retry_after = await ip_limiter.acquire(ip)
+    if not allowed:
+        return False, retry_after
+    return await email_limiter.acquire(email.strip().lower())
+
+
+def rate_limit_stats() -> Dict:
+    """Return limiter counters by key type"""
+    return {"enabled": LOGIN_RATE_LIMIT_ENABLED, "ip": ip_limiter.stats(), "email": email_limiter.stats()}
@@ -2,16 +2,28 @@
 Authentication routes for the Authentication service.
 Handles user registration, login, and token management.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Body, Form
-from datetime import timedelta
-from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Body, Form
+from fastapi.security import HTTPAuthorizationCredentials
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
 from ..models.user import User, UserCreate, UserRead
-from ..dependencies import create_access_token
+from ..models.refresh_token import RefreshToken, RefreshRequest
+from ..models.revoked_token import RevokedToken, LogoutRequest, RevocationFeed
+from ..dependencies import create_access_token, security, verify_token, verify_service_token, REVOCATIONS_AUDIENCE
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..database import get_async_session
+from ..rate_limit import admit_login, client_ip
+from ..hash_pool import (
+    hash_pool, HashPoolSaturated, HASH_RETRY_AFTER, PASSWORD_HASH_ROUNDS, calibrate_bcrypt_rounds
+)
 from sqlmodel import select
+from sqlalchemy import delete, or_, update
 from passlib.context import CryptContext
+import hashlib
+import hmac
+import os
 import re
+import secrets
 import logging
 from pydantic import BaseModel
 
@@ -20,6 +32,10 @@ class AuthResponse(BaseModel):
     access_token: str
     token_type: str
     user: UserRead
+    refresh_token: Optional[str] = None
+
+# Refresh token lifetime (override with REFRESH_TOKEN_DAYS)
+REFRESH_TOKEN_DAYS = int(os.getenv("REFRESH_TOKEN_DAYS", "30"))
 
 # Initialize password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -43,6 +59,69 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify password against hash"""
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify password against hash, returning a new hash if the stored one uses outdated parameters"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+async def configure_password_hashing():
+    """
+    Set the bcrypt cost for this deployment: PASSWORD_HASH_ROUNDS if pinned, otherwise
+    calibrated against PASSWORD_HASH_TARGET_MS. Stored hashes with fewer rounds are
+    rehashed on the user's next successful login.
+    """
+    rounds = PASSWORD_HASH_ROUNDS or await hash_pool.run(calibrate_bcrypt_rounds)
+    pwd_context.update(bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds)
+
+async def run_in_hash_pool(func, *args):
+    """Run a password hashing function in the worker pool, answering 503 when it is saturated"""
+    try:
+        return await hash_pool.run(func, *args)
+    except HashPoolSaturated:
+        logger.warning("Password hashing pool saturated, rejecting request")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy, please retry shortly",
+            headers={"Retry-After": str(HASH_RETRY_AFTER)},
+        )
+
+def hash_refresh_secret(secret: str) -> str:
+    """Hash a refresh token secret; it is random enough that a fast hash is safe"""
+    return hashlib.sha256(secret.encode("utf-8")).hexdigest()
+
+def issue_refresh_token(session: AsyncSession, user_id: str, family_id: Optional[str] = None) -> Tuple[str, RefreshToken]:
+    """
+    Add a new refresh token for a user to the session (the caller commits).
+    Returns the token handed to the client, '<token id>.<secret>', and its record.
+    """
+    secret = secrets.token_urlsafe(32)
+    record = RefreshToken(
+        user_id=user_id,
+        family_id=family_id or secrets.token_hex(16),
+        token_hash=hash_refresh_secret(secret),
+        expires_at=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_DAYS)
+    )
+    session.add(record)
+    return f"{record.id}.{secret}", record
+
+async def prune_expired_tokens(session: AsyncSession, now: datetime, family_id: Optional[str] = None):
+    """
+    Delete expired revocations and refresh tokens, and the tokens of a family just revoked (the caller commits).
+    Other rotated refresh tokens are kept until they expire, so replaying one still revokes its family.
+    """
+    await session.execute(
+        delete(RevokedToken)
+        .where(RevokedToken.expires_at < now)
+        .execution_options(synchronize_session=False)
+    )
+    expired_or_revoked = RefreshToken.expires_at < now
+    if family_id is not None:
+        expired_or_revoked = or_(expired_or_revoked, RefreshToken.family_id == family_id)
+    await session.execute(
+        delete(RefreshToken)
+        .where(expired_or_revoked)
+        .execution_options(synchronize_session=False)
+    )
+
 def validate_password_strength(password: str) -> list:
     """Validate password strength and return list of issues"""
     issues = []
@@ -99,7 +178,7 @@ async def register_user(
             )
 
         # Hash the password
-        hashed_password = hash_password(user_create.password)
+        hashed_password = await run_in_hash_pool(hash_password, user_create.password)
 
         # Create new user
         user = User(
@@ -109,6 +188,7 @@ async def register_user(
         )
 
         session.add(user)
+        refresh_token, _ = issue_refresh_token(session, user.id)
         await session.commit()
         await session.refresh(user)
 
@@ -122,6 +202,7 @@ async def register_user(
         logger.info(f"New user registered: {user.email}")
         return {
             "access_token": access_token,
+            "refresh_token": refresh_token,
             "token_type": "bearer",
             "user": {
                 "id": user.id,
@@ -144,21 +225,38 @@ async def register_user(
 
 @router.post("/login", response_model=AuthResponse)
 async def login_user(
+    request: Request,
     email: str = Form(...),
     password: str = Form(...),
     session: AsyncSession = Depends(get_async_session)
 ):
     """
     Authenticate user and return JWT token.
+    Attempts beyond the per-IP and per-email rate limits get 429 before any password check.
     """
     try:
+        # Admission control runs before the database lookup and the bcrypt verification
+        ip = client_ip(request.headers, request.client.host if request.client else None)
+        allowed, retry_after = await admit_login(email, ip)
+        if not allowed:
+            logger.warning(f"Rate limited login attempt for email: {email} from {ip}")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts, please retry later",
+                headers={"Retry-After": str(retry_after)},
+            )
+
         # Find user by email
         user_result = await session.execute(
             select(User).where(User.email == email)
         )
         user = user_result.scalar_one_or_none()
 
-        if not user or not verify_password(password, user.hashed_password):
+        valid, new_hash = (False, None)
+        if user:
+            valid, new_hash = await run_in_hash_pool(verify_and_update_password, password, user.hashed_password)
+
+        if not valid:
             logger.warning(f"Failed login attempt for email: {email}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -166,6 +264,14 @@ async def login_user(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+        # Transparently upgrade hashes made with outdated cost parameters
+        if new_hash:
+            user.hashed_password = new_hash
+            logger.info(f"Rehashed password with current parameters for user: {user.email}")
+
+        refresh_token, _ = issue_refresh_token(session, user.id)
+        await session.commit()
+
         # Create access token
         access_token_expires = timedelta(hours=1)  # Shorter token lifetime for security
         access_token = create_access_token(
@@ -176,6 +282,7 @@ async def login_user(
         logger.info(f"Successful login for user: {user.email}")
         return {
             "access_token": access_token,
+            "refresh_token": refresh_token,
             "token_type": "bearer",
             "user": {
                 "id": user.id,
@@ -196,14 +303,181 @@ async def login_user(
             detail="An unexpected error occurred during login"
         )
 
-@router.post("/refresh")
-async def refresh_token():
+@router.post("/refresh", response_model=AuthResponse)
+async def refresh_token(
+    refresh_request: RefreshRequest,
+    session: AsyncSession = Depends(get_async_session)
+):
     """
-    Refresh the access token.
+    Exchange a refresh token for a new access token and a rotated refresh token.
+    Presenting an already-rotated token revokes every token of its family.
     """
-    # In a real implementation, you would implement refresh token functionality
-    # This is a placeholder that would be implemented with actual refresh token logic
-    raise HTTPException(
-        status_code=status.HTTP_501_NOT_IMPLEMENTED,
-        detail="Refresh token functionality not yet implemented"
-    )
\ No newline at end of file
+    invalid = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    token_id, _, secret = refresh_request.refresh_token.partition(".")
+    if not token_id or not secret:
+        raise invalid
+
+    try:
+        # One primary-key lookup loads the token with its user
+        result = await session.execute(
+            select(RefreshToken, User)
+            .join(User, User.id == RefreshToken.user_id)
+            .where(RefreshToken.id == token_id)
+        )
+        row = result.first()
+        if row is None:
+            raise invalid
+        record, user = row
+
+        if not hmac.compare_digest(record.token_hash, hash_refresh_secret(secret)):
+            raise invalid
+
+        now = datetime.utcnow()
+        if record.expires_at < now:
+            raise invalid
+
+        # Claim the token atomically so concurrent refreshes cannot both rotate it
+        claimed = await session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.id == record.id)
+            .where(RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        if claimed.rowcount != 1:
+            # Reuse of a rotated token: assume it leaked and revoke the whole family
+            await session.execute(
+                update(RefreshToken)
+                .where(RefreshToken.family_id == record.family_id)
+                .where(RefreshToken.revoked_at.is_(None))
+                .values(revoked_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            logger.warning(f"Refresh token reuse detected for user: {user.email}, family revoked")
+            raise invalid
+
+        new_refresh_token, new_record = issue_refresh_token(session, user.id, record.family_id)
+        await session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.id == record.id)
+            .values(replaced_by=new_record.id)
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+
+        access_token = create_access_token(
+            data={"user_id": user.id, "email": user.email},
+            expires_delta=timedelta(hours=1)
+        )
+
+        return {
+            "access_token": access_token,
+            "refresh_token": new_refresh_token,
+            "token_type": "bearer",
+            "user": {
+                "id": user.id,
+                "email": user.email,
+                "name": user.name,
+                "created_at": user.created_at,
+                "updated_at": user.updated_at
+            }
+        }
+
+    except HTTPException:
+        # Re-raise HTTP exceptions as-is
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error during token refresh: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred during token refresh"
+        )
+
+@router.post("/logout")
+async def logout_user(
+    logout_request: Optional[LogoutRequest] = None,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Revoke the presented access token, and the given refresh token's family if any.
+    Verifying services learn about the revocation through /auth/revocations.
+    """
+    payload = verify_token(credentials.credentials)
+    if payload is None or "scope" in payload:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    try:
+        now = datetime.utcnow()
+        user_id = payload.get("user_id") or payload.get("sub")
+        jti = payload.get("jti")
+        if jti and payload.get("exp"):
+            await session.merge(RevokedToken(
+                jti=jti,
+                user_id=user_id,
+                expires_at=datetime.utcfromtimestamp(payload["exp"]),
+                revoked_at=now
+            ))
+
+        revoked_family = None
+        if logout_request and logout_request.refresh_token:
+            token_id, _, secret = logout_request.refresh_token.partition(".")
+            record = await session.get(RefreshToken, token_id) if token_id else None
+            if record and record.user_id == user_id and hmac.compare_digest(record.token_hash, hash_refresh_secret(secret)):
+                # Deleting the family revokes it: none of its tokens can be looked up any more
+                revoked_family = record.family_id
+
+        await prune_expired_tokens(session, now, revoked_family)
+        await session.commit()
+    except Exception as e:
+        logger.error(f"Unexpected error during logout: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred during logout"
+        )
+
+    return {"message": "Logged out successfully"}
+
+@router.get("/revocations", response_model=RevocationFeed)
+async def list_revocations(
+    since: Optional[datetime] = None,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    List unexpired revoked token ids, optionally only those revoked since a point in time.
+    Callers are services signing a short-lived token with the shared secret, scope "revocations"
+    and audience REVOCATIONS_AUDIENCE.
+    """
+    payload = verify_service_token(credentials.credentials, REVOCATIONS_AUDIENCE)
+    if payload is None or payload.get("scope") != "revocations":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to read revocations"
+        )
+
+    now = datetime.utcnow()
+    statement = select(RevokedToken.jti, RevokedToken.expires_at).where(RevokedToken.expires_at > now)
+    if since is not None:
+        if since.tzinfo is not None:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        statement = statement.where(RevokedToken.revoked_at >= since)
+    result = await session.execute(statement)
+
+    return {
+        "revoked": [
+            {"jti": jti, "exp": expires_at.replace(tzinfo=timezone.utc).timestamp()}
+            for jti, expires_at in result.all()
+        ],
+        "cursor": now
+    }
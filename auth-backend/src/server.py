@@ -0,0 +1,102 @@
+"""
+Production serving mode for the Authentication service.
+Runs several uvicorn worker processes with uvloop and httptools when they are installed,
+keeps the database connections of all workers within one budget, and drains in-flight
+requests on SIGTERM before the engine is disposed.
+"""
+from typing import Dict
+import glob
+import importlib.util
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# Worker processes (0 = one per CPU)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "0"))
+# Connections all workers together may open (0 = no budget, use DATABASE_POOL_SIZE as is)
+DATABASE_CONNECTION_BUDGET = int(os.getenv("DATABASE_CONNECTION_BUDGET", "0"))
+# Seconds to wait for in-flight requests after SIGTERM
+GRACEFUL_SHUTDOWN_TIMEOUT = int(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", "30"))
+SERVER_KEEPALIVE_TIMEOUT = int(os.getenv("SERVER_KEEPALIVE_TIMEOUT", "5"))
+
+
+def worker_count() -> int:
+    """Number of worker processes to fork"""
+    return WEB_CONCURRENCY if WEB_CONCURRENCY > 0 else (os.cpu_count() or 1)
+
+
+def pool_settings(workers: int) -> Dict[str, int]:
+    """
+    Per-worker pool size and overflow keeping workers * (pool_size + max_overflow)
+    within DATABASE_CONNECTION_BUDGET.
+    """
+    pool_size = int(os.getenv("DATABASE_POOL_SIZE", "5"))
+    max_overflow = int(os.getenv("DATABASE_MAX_OVERFLOW", "10"))
+    if DATABASE_CONNECTION_BUDGET <= 0:
+        return {"pool_size": pool_size, "max_overflow": max_overflow}
+    per_worker = max(1, DATABASE_CONNECTION_BUDGET // workers)
+    if per_worker * workers > DATABASE_CONNECTION_BUDGET:
+        logger.warning(
+            f"DATABASE_CONNECTION_BUDGET={DATABASE_CONNECTION_BUDGET} is below one connection per worker; "
+            f"{workers} workers will open up to {workers} connections"
+        )
+    pool_size = min(pool_size, per_worker)
+    return {"pool_size": pool_size, "max_overflow": per_worker - pool_size}
+
+
+def event_loop() -> str:
+    """uvloop when installed, the standard asyncio loop otherwise"""
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def http_protocol() -> str:
+    """httptools when installed, h11 otherwise"""
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def prepare_metrics_dir(workers: int) -> None:
+    """Give the workers a shared, empty PROMETHEUS_MULTIPROC_DIR for aggregating /metrics"""
+    if workers <= 1:
+        return
+    if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="metrics-")
+    for path in glob.glob(os.path.join(os.environ["PROMETHEUS_MULTIPROC_DIR"], "*.db")):
+        os.remove(path)
+
+
+def serve(app: str, app_dir: str, host: str = "0.0.0.0", port: int = 8001) -> None:
+    """
+    Run the application given as an import string ("src.main:app") in production mode.
+    Pool settings are passed to the workers through the environment, so they must be
+    applied before the application module is imported.
+    """
+    import uvicorn
+
+    workers = worker_count()
+    pool = pool_settings(workers)
+    os.environ["DATABASE_POOL_SIZE"] = str(pool["pool_size"])
+    os.environ["DATABASE_MAX_OVERFLOW"] = str(pool["max_overflow"])
+    prepare_metrics_dir(workers)
+    # Split the CPUs between the workers' bcrypt pools instead of giving each one all of them
+    os.environ.setdefault("HASH_WORKERS", str(max(1, (os.cpu_count() or 1) // workers)))
+
+    loop, http = event_loop(), http_protocol()
+    logger.info(
+        f"Starting {workers} workers ({loop}, {http}), "
+        f"pool_size={pool['pool_size']} max_overflow={pool['max_overflow']} per worker"
+    )
+    uvicorn.run(
+        app,
+        app_dir=app_dir,
+        host=host,
+        port=port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        proxy_headers=True,
+        access_log=False,
+        timeout_keep_alive=SERVER_KEEPALIVE_TIMEOUT,
+        timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_TIMEOUT,
+    )
@@ -0,0 +1,34 @@
+"""
+Tests for the bounded password hashing pool
+"""
+import asyncio
+import threading
+
+from conftest import run_app
+from src.hash_pool import HashPool, HASH_RETRY_AFTER
+from src.routes import auth
+
+
+def test_full_queue_answers_503_with_retry_after(monkeypatch, credentials):
+    pool = HashPool(workers=1, queue_size=1)
+    monkeypatch.setattr(auth, "hash_pool", pool)
+    release = threading.Event()
+
+    async def scenario(client):
+        # One job runs and one waits, so the pool is at its bound
+        blocked = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        try:
+            rejected = await client.post("/auth/register", json=credentials)
+        finally:
+            release.set()
+            await asyncio.gather(*blocked)
+        accepted = await client.post("/auth/register", json=credentials)
+        return rejected, accepted
+
+    rejected, accepted = run_app(scenario)
+    pool.shutdown()
+    assert rejected.status_code == 503
+    assert rejected.headers["Retry-After"] == str(HASH_RETRY_AFTER)
+    assert accepted.status_code == 200
+    assert pool.stats()["rejected"] == 1
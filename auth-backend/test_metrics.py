@@ -0,0 +1,21 @@
+"""
+Tests for the auth service's /metrics exposition
+"""
+from prometheus_client.parser import text_string_to_metric_families
+
+from src import metrics
+
+
+def test_password_hashing_families_are_exposed_with_the_service_metrics():
+    metrics.password_hash_seconds.labels(operation="hash").observe(0.3)
+    metrics.auth_token_verifications.labels(result="verified").inc()
+
+    families = {family.name: family for family in text_string_to_metric_families(metrics.render().decode())}
+    assert {"http_request_duration_seconds", "password_hash_seconds", "auth_token_verifications"} <= set(families)
+    hashing = {
+        (sample.name, sample.labels.get("le")): sample.value
+        for sample in families["password_hash_seconds"].samples
+        if sample.labels.get("operation") == "hash"
+    }
+    assert hashing[("password_hash_seconds_count", None)] == hashing[("password_hash_seconds_bucket", "+Inf")] == 1
+    assert hashing[("password_hash_seconds_bucket", "0.25")] == 0
@@ -0,0 +1,33 @@
+"""
+Tests for the Alembic schema migrations of the auth service
+"""
+import asyncio
+import uuid
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from conftest import TEST_DIR
+from src import migrations
+
+
+def test_fresh_database_is_migrated_to_head():
+    async def main():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{TEST_DIR}/migrations-{uuid.uuid4().hex}.db")
+        try:
+            await migrations.ensure_schema(engine)
+            async with engine.connect() as conn:
+                tables = await conn.run_sync(lambda sync_conn: set(sa.inspect(sync_conn).get_table_names()))
+            return await migrations.get_schema_revision(engine), tables
+        finally:
+            await engine.dispose()
+
+    revision, tables = asyncio.run(main())
+    assert revision == migrations.get_head_revision()
+    assert {"user", "refresh_token", "revoked_token", "alembic_version_auth"} <= tables
+
+
+def test_version_table_and_lock_differ_from_the_task_service():
+    # Both services may migrate the same database in the combined deployment
+    assert migrations.VERSION_TABLE == "alembic_version_auth"
+    assert migrations.MIGRATION_LOCK_KEY != 0x7A5C
@@ -0,0 +1,42 @@
+"""
+Tests for upgrading stored password hashes on login
+"""
+import asyncio
+
+from sqlmodel import select
+
+from conftest import run_app
+from src.database import AsyncSessionLocal
+from src.models.user import User
+from src.routes import auth
+
+
+async def stored_hash(email: str) -> str:
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(User.hashed_password).where(User.email == email))
+        return result.scalar_one()
+
+
+def test_login_rehashes_a_password_stored_with_fewer_rounds(monkeypatch, credentials):
+    form = {"email": credentials["email"], "password": credentials["password"]}
+
+    async def register(client):
+        await client.post("/auth/register", json=credentials)
+        return await stored_hash(credentials["email"])
+
+    async def login(client):
+        response = await client.post("/auth/login", data=form)
+        return response, await stored_hash(credentials["email"])
+
+    old_hash = run_app(register)
+    # The next startup raises the cost, as a recalibration on faster hardware would
+    monkeypatch.setattr(auth, "PASSWORD_HASH_ROUNDS", 5)
+    response, new_hash = run_app(login)
+    # Restore the pinned cost for the tests that follow
+    monkeypatch.undo()
+    asyncio.run(auth.configure_password_hashing())
+
+    assert old_hash.startswith("$2b$04$")
+    assert response.status_code == 200
+    assert new_hash.startswith("$2b$05$")
+    assert auth.verify_password(credentials["password"], new_hash)
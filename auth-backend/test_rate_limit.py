@@ -0,0 +1,98 @@
+"""
+Tests for the login token-bucket limiters
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import run_app
+from src import rate_limit
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=clock, time=clock))
+    return clock
+
+
+@pytest.fixture
+def limiters(monkeypatch):
+    """Enable limiting with small fresh limiters: 2 attempts per IP, 1 per email"""
+    ip = rate_limit.TokenBucketLimiter("ip", rate_per_minute=60, burst=2)
+    email = rate_limit.TokenBucketLimiter("email", rate_per_minute=60, burst=1)
+    monkeypatch.setattr(rate_limit, "LOGIN_RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(rate_limit, "ip_limiter", ip)
+    monkeypatch.setattr(rate_limit, "email_limiter", email)
+    return ip, email
+
+
+def acquire_all(limiter, keys):
+    async def scenario():
+        return [await limiter.acquire(key) for key in keys]
+    return asyncio.run(scenario())
+
+
+def test_bucket_refills_over_time(clock):
+    limiter = rate_limit.TokenBucketLimiter("test", rate_per_minute=30, burst=2)
+    assert acquire_all(limiter, ["key"] * 3) == [(True, 0), (True, 0), (False, 2)]
+    clock.now += 1
+    assert acquire_all(limiter, ["key"]) == [(False, 1)]
+    clock.now += 1
+    assert acquire_all(limiter, ["key", "key"]) == [(True, 0), (False, 2)]
+    # A long idle period refills the bucket to its burst, no further
+    clock.now += 600
+    assert acquire_all(limiter, ["key"] * 3) == [(True, 0), (True, 0), (False, 2)]
+
+
+def test_ip_and_email_limits_are_separate(clock, limiters):
+    async def scenario():
+        return [
+            await rate_limit.admit_login(email, ip)
+            for email, ip in [
+                ("a@example.com", "10.0.0.1"),
+                # The email's bucket is empty, whatever the IP
+                ("A@example.com", "10.0.0.2"),
+                ("b@example.com", "10.0.0.1"),
+                # The IP's bucket is empty, whatever the email
+                ("c@example.com", "10.0.0.1"),
+                # The IP rejection left c's email bucket untouched
+                ("c@example.com", "10.0.0.3"),
+            ]
+        ]
+
+    allowed = [result[0] for result in asyncio.run(scenario())]
+    assert allowed == [True, False, True, False, True]
+
+
+def test_rejected_login_gets_429_with_retry_after(clock, limiters, credentials):
+    form = {"email": credentials["email"], "password": credentials["password"]}
+
+    async def scenario(client):
+        await client.post("/auth/register", json=credentials)
+        return [await client.post("/auth/login", data=form) for _ in range(2)]
+
+    first, second = run_app(scenario)
+    assert first.status_code == 200
+    assert second.status_code == 429
+    assert second.headers["Retry-After"] == "1"
+
+
+def test_least_recently_seen_buckets_are_evicted(clock):
+    limiter = rate_limit.TokenBucketLimiter("test", rate_per_minute=1, burst=1, max_keys=2)
+    acquire_all(limiter, ["first", "second"])
+    # Touching "first" makes "second" the least recently seen key
+    assert acquire_all(limiter, ["first", "third"]) == [(False, 60), (True, 0)]
+    assert limiter.stats()["keys"] == 2
+    assert limiter.stats()["evictions"] == 1
+    # Evicted keys start over with a full bucket; re-adding "second" evicts "first" in turn
+    assert acquire_all(limiter, ["second", "first"]) == [(True, 0), (True, 0)]
@@ -0,0 +1,91 @@
+"""
+Tests for refresh token rotation, reuse detection and pruning
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+from sqlmodel import select
+
+from conftest import run_app
+from src.database import AsyncSessionLocal
+from src.models.refresh_token import RefreshToken
+
+
+def token_id(refresh_token: str) -> str:
+    return refresh_token.partition(".")[0]
+
+
+async def family_tokens(refresh_token: str):
+    async with AsyncSessionLocal() as session:
+        record = await session.get(RefreshToken, token_id(refresh_token))
+        results = await session.execute(select(RefreshToken).where(RefreshToken.family_id == record.family_id))
+        return results.scalars().all()
+
+
+async def expire(refresh_token: str):
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.id == token_id(refresh_token))
+            .values(expires_at=datetime.utcnow() - timedelta(seconds=1))
+        )
+        await session.commit()
+
+
+def login_as(client, credentials):
+    return client.post("/auth/login", data={"email": credentials["email"], "password": credentials["password"]})
+
+
+def refresh(client, refresh_token: str):
+    return client.post("/auth/refresh", json={"refresh_token": refresh_token})
+
+
+def test_rotation_rejects_the_old_token_and_replay_revokes_the_family(credentials):
+    async def scenario(client):
+        original = (await client.post("/auth/register", json=credentials)).json()["refresh_token"]
+        rotated = await refresh(client, original)
+        replayed = await refresh(client, original)
+        # The token issued by the rotation is revoked along with its family
+        successor = await refresh(client, rotated.json()["refresh_token"])
+        return rotated, replayed, successor, await family_tokens(original)
+
+    rotated, replayed, successor, tokens = run_app(scenario)
+    assert rotated.status_code == 200
+    assert rotated.json()["access_token"]
+    assert replayed.status_code == 401
+    assert successor.status_code == 401
+    assert len(tokens) == 2
+    assert all(token.revoked_at is not None for token in tokens)
+
+
+def test_expired_refresh_token_is_rejected(credentials):
+    async def scenario(client):
+        refresh_token = (await client.post("/auth/register", json=credentials)).json()["refresh_token"]
+        await expire(refresh_token)
+        return await refresh(client, refresh_token)
+
+    response = run_app(scenario)
+    assert response.status_code == 401
+
+
+def test_logout_prunes_expired_tokens_and_the_revoked_family(credentials):
+    async def scenario(client):
+        registered = (await client.post("/auth/register", json=credentials)).json()
+        login = (await login_as(client, credentials)).json()
+        other = (await login_as(client, credentials)).json()
+        await expire(other["refresh_token"])
+        await client.post(
+            "/auth/logout",
+            json={"refresh_token": login["refresh_token"]},
+            headers={"Authorization": f"Bearer {login['access_token']}"},
+        )
+        async with AsyncSessionLocal() as session:
+            results = await session.execute(select(RefreshToken.id))
+            remaining = set(results.scalars().all())
+        return registered, login, other, remaining, await refresh(client, login["refresh_token"])
+
+    registered, login, other, remaining, refreshed = run_app(scenario)
+    assert token_id(registered["refresh_token"]) in remaining
+    assert token_id(login["refresh_token"]) not in remaining
+    assert token_id(other["refresh_token"]) not in remaining
+    assert refreshed.status_code == 401
@@ -0,0 +1,51 @@
+"""
+Tests for the revocation feed and the service tokens that read it
+"""
+import time
+
+from jose import jwt
+
+from conftest import run_app, TEST_SECRET
+from src.dependencies import REVOCATIONS_AUDIENCE
+
+
+def sign(claims) -> str:
+    return jwt.encode({"exp": time.time() + 60, **claims}, TEST_SECRET, algorithm="HS256")
+
+
+SERVICE_CLAIMS = {"sub": "todo-service", "scope": "revocations"}
+
+
+def test_revocation_feed_requires_a_service_token_with_audience(credentials):
+    async def scenario(client):
+        registered = await client.post("/auth/register", json=credentials)
+        user_token = registered.json()["access_token"]
+        await client.post("/auth/logout", headers={"Authorization": f"Bearer {user_token}"})
+        responses = {}
+        for name, token in {
+            "service": sign({**SERVICE_CLAIMS, "aud": REVOCATIONS_AUDIENCE}),
+            "no_audience": sign(SERVICE_CLAIMS),
+            "other_audience": sign({**SERVICE_CLAIMS, "aud": "something-else"}),
+            "user": user_token,
+        }.items():
+            responses[name] = await client.get("/auth/revocations", headers={"Authorization": f"Bearer {token}"})
+        return user_token, responses
+
+    user_token, responses = run_app(scenario)
+    assert responses["service"].status_code == 200
+    revoked = {entry["jti"] for entry in responses["service"].json()["revoked"]}
+    assert jwt.get_unverified_claims(user_token)["jti"] in revoked
+    assert responses["no_audience"].status_code == 403
+    assert responses["other_audience"].status_code == 403
+    assert responses["user"].status_code == 403
+
+
+def test_service_tokens_cannot_log_out_as_a_user():
+    async def scenario(client):
+        return [
+            await client.post("/auth/logout", headers={"Authorization": f"Bearer {token}"})
+            for token in (sign({**SERVICE_CLAIMS, "aud": REVOCATIONS_AUDIENCE}), sign(SERVICE_CLAIMS))
+        ]
+
+    for response in run_app(scenario):
+        assert response.status_code == 401
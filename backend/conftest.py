@@ -0,0 +1,64 @@
+"""
+Shared pytest setup for the backend tests.
+Points the service at a throwaway SQLite database before any src module reads its settings.
+"""
+import asyncio
+import os
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+TEST_DIR = tempfile.mkdtemp(prefix="todo-backend-tests-")
+TEST_SECRET = "test-secret-key-test-secret-key-0123"
+
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{TEST_DIR}/tasks.db"
+os.environ["TODO_SERVICE_SECRET"] = TEST_SECRET
+os.environ["AUTH_SERVICE_URL"] = ""
+os.environ["DATABASE_READ_URLS"] = ""
+os.environ["DATABASE_READ_URL"] = ""
+os.environ["DATABASE_SLOW_QUERY_MS"] = "0"
+# An empty PROMETHEUS_MULTIPROC_DIR would still switch prometheus_client to multiprocess mode
+os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+
+
+def make_token(user_id: str, **claims) -> str:
+    """Sign an access token the way the auth service does"""
+    from jose import jwt
+    payload = {
+        "sub": user_id,
+        "user_id": user_id,
+        "email": f"{user_id}@example.com",
+        "exp": datetime.utcnow() + timedelta(minutes=30),
+        "jti": uuid.uuid4().hex,
+        **claims,
+    }
+    return jwt.encode(payload, TEST_SECRET, algorithm="HS256")
+
+
+def run_app(scenario):
+    """
+    Start the app, run `await scenario(client)` against it through httpx, and stop it.
+    Each call gets its own event loop and disposes the pools it opened.
+    """
+    import httpx
+    from src.main import app
+
+    async def main():
+        await app.router.startup()
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await scenario(client)
+        finally:
+            await app.router.shutdown()
+
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def user():
+    """A fresh user id with the Authorization headers of a valid token"""
+    user_id = f"user-{uuid.uuid4().hex[:12]}"
+    return {"id": user_id, "headers": {"Authorization": f"Bearer {make_token(user_id)}"}}
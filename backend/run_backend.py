@@ -8,9 +8,16 @@ load_dotenv()
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-# Import and run the main application
-from src.main import app
-
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    if "--production" in sys.argv:
+        # Several workers with uvloop/httptools and a shared connection budget
+        from src.server import serve
+        # One pool per worker to each read replica listed for src/replicas.py
+        read_urls = os.getenv("DATABASE_READ_URLS", os.getenv("DATABASE_READ_URL", ""))
+        replicas = len([url for url in read_urls.split(",") if url.strip()])
+        serve("src.main:app", app_dir=os.path.dirname(os.path.abspath(__file__)), port=8000, replicas=replicas)
+    else:
+        # Import and run the main application
+        from src.main import app
+        import uvicorn
+        uvicorn.run(app, host="0.0.0.0", port=8000)
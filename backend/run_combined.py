@@ -0,0 +1,23 @@
+import os
+import sys
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+if __name__ == "__main__":
+    if "--production" in sys.argv:
+        # Several workers with uvloop/httptools and a shared connection budget
+        from src.server import serve
+        # One pool per worker to each read replica listed for src/replicas.py
+        read_urls = os.getenv("DATABASE_READ_URLS", os.getenv("DATABASE_READ_URL", ""))
+        replicas = len([url for url in read_urls.split(",") if url.strip()])
+        serve("src.combined:app", app_dir=os.path.dirname(os.path.abspath(__file__)), port=8000, replicas=replicas)
+    else:
+        # Import and run the combined auth + tasks application
+        from src.combined import app
+        import uvicorn
+        uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -2,26 +2,73 @@
 API routes for task management in the Todo application.
 Implements CRUD operations for tasks with user ownership validation.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
-from ...models.task import Task, TaskRead, TaskUpdate, TaskCreate
-from ...database import get_async_session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from ...models.task import (
+    Task, TaskRead, TaskUpdate, TaskCreate, TaskPage, TaskQuery, TaskSortField, SortOrder,
+    TaskBatchRequest, TaskBatchResponse, TaskFileFormat, TaskImportSummary
+)
+from ...database import get_read_session, get_write_session, replica_router
 from ...dependencies import get_current_user
-from ...services.task_service import TaskService
+from ...services.task_service import TaskService, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, null_update_fields
+from ...services.cache import task_cache
+from ...services.task_io import (
+    export_tasks, import_tasks, MEDIA_TYPES, IMPORT_BATCH_SIZE, MAX_IMPORT_BATCH_SIZE
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import NoResultFound
 from datetime import datetime
+import hashlib
 
 router = APIRouter()
 
-@router.get("/{user_id}/tasks", response_model=List[TaskRead])
+# Clients may keep responses but must revalidate them with If-None-Match
+CONDITIONAL_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from the values that determine a response body"""
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches the current ETag"""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    """Build a 304 Not Modified response for the given ETag"""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CONDITIONAL_CACHE_CONTROL}
+    )
+
+@router.get("/{user_id}/tasks", response_model=TaskPage)
 async def get_tasks(
     user_id: str,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    completed: Optional[bool] = Query(None),
+    created_after: Optional[datetime] = Query(None),
+    created_before: Optional[datetime] = Query(None),
+    updated_since: Optional[datetime] = Query(None),
+    sort: TaskSortField = Query(TaskSortField.created_at),
+    order: SortOrder = Query(SortOrder.asc),
+    if_none_match: Optional[str] = Header(None),
     current_user: dict = Depends(get_current_user),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_read_session)
 ):
     """
-    Get all tasks for the specified user.
+    Get one page of tasks for the specified user, filtered and sorted in the database.
+    Pass the returned next_cursor back as `cursor` (with the same filters and sort)
+    to fetch the following page.
+    Answers 304 Not Modified when If-None-Match carries the current ETag.
     Validates that the requesting user matches the user_id in the path.
     """
     # Verify user identity matches the requested user_id
@@ -31,9 +78,40 @@ async def get_tasks(
             detail="Not authorized to access tasks for this user"
         )
 
-    # Get tasks using the service layer
-    tasks = await TaskService.get_tasks_by_user_id(session, user_id)
-    return tasks
+    query = TaskQuery(
+        completed=completed,
+        created_after=created_after,
+        created_before=created_before,
+        updated_since=updated_since,
+        sort=sort,
+        order=order
+    )
+
+    # Without the cache, compare the list version before loading any rows
+    if not task_cache.enabled:
+        version = await TaskService.get_tasks_version(session, user_id)
+        etag = make_etag(user_id, version, query.model_dump_json(), limit, cursor)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    # Get the requested page using the service layer
+    try:
+        page = await TaskService.list_tasks(session, user_id, query, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    # With the cache, the page usually comes from memory; tag its contents instead
+    if task_cache.enabled:
+        etag = make_etag(user_id, page.model_dump_json())
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CONDITIONAL_CACHE_CONTROL
+    return page
 
 
 @router.post("/{user_id}/tasks", response_model=TaskRead)
@@ -41,7 +119,7 @@ async def create_task(
     user_id: str,
     task_create: TaskCreate,
     current_user: dict = Depends(get_current_user),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_write_session)
 ):
     """
     Create a new task for the specified user.
@@ -66,15 +144,136 @@ async def create_task(
     return task
 
 
+@router.post("/{user_id}/tasks/batch", response_model=TaskBatchResponse)
+async def batch_tasks(
+    user_id: str,
+    batch: TaskBatchRequest,
+    current_user: dict = Depends(get_current_user),
+    session: AsyncSession = Depends(get_write_session)
+):
+    """
+    Apply a list of create/update/delete/toggle operations in one transaction.
+    Each task id may appear at most once per batch. Returns one result per operation.
+    Validates that the requesting user matches the user_id in the path.
+    """
+    # Verify user identity matches the requested user_id
+    if current_user["id"] != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to update tasks for this user"
+        )
+
+    # Apply the batch using the service layer
+    try:
+        results = await TaskService.apply_batch(session, user_id, batch.operations)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return {"results": results}
+
+
+@router.get("/{user_id}/tasks/search", response_model=TaskPage)
+async def search_tasks(
+    user_id: str,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    current_user: dict = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session)
+):
+    """
+    Search the specified user's tasks by title and description, best matches first.
+    Validates that the requesting user matches the user_id in the path.
+    """
+    # Verify user identity matches the requested user_id
+    if current_user["id"] != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access tasks for this user"
+        )
+
+    # Run the ranked search using the service layer
+    try:
+        tasks, next_cursor = await TaskService.search_tasks(session, user_id, q, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return {"items": tasks, "next_cursor": next_cursor}
+
+
+@router.get("/{user_id}/tasks/export")
+async def export_user_tasks(
+    user_id: str,
+    format: TaskFileFormat = Query(TaskFileFormat.ndjson),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Stream all tasks of the specified user as NDJSON or CSV.
+    Validates that the requesting user matches the user_id in the path.
+    """
+    # Verify user identity matches the requested user_id
+    if current_user["id"] != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access tasks for this user"
+        )
+
+    async def generate():
+        # The session lives as long as the stream, not the request handler
+        async with replica_router.session_factory(user_id)() as session:
+            async for chunk in export_tasks(session, user_id, format):
+                yield chunk
+
+    return StreamingResponse(
+        generate(),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format.value}"'}
+    )
+
+
+@router.post("/{user_id}/tasks/import", response_model=TaskImportSummary)
+async def import_user_tasks(
+    user_id: str,
+    request: Request,
+    format: TaskFileFormat = Query(TaskFileFormat.ndjson),
+    batch_size: int = Query(IMPORT_BATCH_SIZE, ge=1, le=MAX_IMPORT_BATCH_SIZE),
+    current_user: dict = Depends(get_current_user),
+    session: AsyncSession = Depends(get_write_session)
+):
+    """
+    Import tasks for the specified user from an NDJSON or CSV (with header) request body.
+    The body is consumed as a stream and rows are inserted in batches.
+    Validates that the requesting user matches the user_id in the path.
+    """
+    # Verify user identity matches the requested user_id
+    if current_user["id"] != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to create tasks for this user"
+        )
+
+    # Import the uploaded rows using the service layer
+    return await import_tasks(session, user_id, request.stream(), format, batch_size)
+
+
 @router.get("/{user_id}/tasks/{id}", response_model=TaskRead)
 async def get_task(
     user_id: str,
     id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     current_user: dict = Depends(get_current_user),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_read_session)
 ):
     """
     Get a specific task by ID.
+    Answers 304 Not Modified when If-None-Match carries the current ETag.
     Validates that the requesting user matches the user_id in the path and owns the task.
     """
     # Verify user identity matches the requested user_id
@@ -92,6 +291,12 @@ async def get_task(
             detail="Task not found"
         )
 
+    etag = make_etag(user_id, task.id, task.updated_at.isoformat())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CONDITIONAL_CACHE_CONTROL
     return task
 
 
@@ -101,7 +306,7 @@ async def update_task(
     id: int,
     task_update: TaskUpdate,
     current_user: dict = Depends(get_current_user),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_write_session)
 ):
     """
     Update a specific task by ID.
@@ -114,6 +319,13 @@ async def update_task(
             detail="Not authorized to update tasks for this user"
         )
 
+    nulls = null_update_fields(task_update)
+    if nulls:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{', '.join(nulls)} cannot be null"
+        )
+
     # Update the task using the service layer
     task = await TaskService.update_task(session, id, user_id, task_update)
     if task is None:
@@ -130,7 +342,7 @@ async def delete_task(
     user_id: str,
     id: int,
     current_user: dict = Depends(get_current_user),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_write_session)
 ):
     """
     Delete a specific task by ID.
@@ -159,7 +371,7 @@ async def toggle_task_completion(
     user_id: str,
     id: int,
     current_user: dict = Depends(get_current_user),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_write_session)
 ):
     """
     Toggle the completion status of a specific task.
@@ -0,0 +1,124 @@
+"""
+Combined FastAPI application for the Todo application.
+Serves the authentication routes and the task routes from one process, sharing one
+database engine, one connection pool and one User table. The app is built here from
+the task service's create_app() plus the auth routes, leaving src.main.app untouched. Run
+with `uvicorn src.combined:app` from the backend directory; the split deployment is unchanged.
+"""
+from datetime import datetime, timezone
+from sqlmodel import select
+import asyncio
+import importlib
+import importlib.util
+import logging
+import os
+import pathlib
+import sys
+
+from .main import create_app
+from .database import async_engine, AsyncSessionLocal, get_async_session
+from .dependencies import SECRET_KEY
+from .revocation import revocation_list, REVOCATION_SYNC_INTERVAL, REVOCATION_SYNC_OVERLAP
+from .metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Location of the auth service sources (both services name their package "src")
+AUTH_BACKEND_PATH = pathlib.Path(
+    os.getenv("AUTH_BACKEND_PATH", pathlib.Path(__file__).resolve().parents[2] / "auth-backend")
+)
+AUTH_PACKAGE = "auth_service"
+
+
+def load_auth_package():
+    """Import the auth service's src package under the name auth_service"""
+    if AUTH_PACKAGE in sys.modules:
+        return sys.modules[AUTH_PACKAGE]
+    source = AUTH_BACKEND_PATH / "src"
+    spec = importlib.util.spec_from_file_location(
+        AUTH_PACKAGE, source / "__init__.py", submodule_search_locations=[str(source)]
+    )
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[AUTH_PACKAGE] = package
+    spec.loader.exec_module(package)
+    return package
+
+
+load_auth_package()
+auth_dependencies = importlib.import_module(f"{AUTH_PACKAGE}.dependencies")
+auth_routes = importlib.import_module(f"{AUTH_PACKAGE}.routes.auth")
+auth_database = importlib.import_module(f"{AUTH_PACKAGE}.database")
+auth_hash_pool = importlib.import_module(f"{AUTH_PACKAGE}.hash_pool")
+auth_migrations = importlib.import_module(f"{AUTH_PACKAGE}.migrations")
+auth_metrics = importlib.import_module(f"{AUTH_PACKAGE}.metrics")
+auth_rate_limit = importlib.import_module(f"{AUTH_PACKAGE}.rate_limit")
+RevokedToken = importlib.import_module(f"{AUTH_PACKAGE}.models.revoked_token").RevokedToken
+
+# Tokens issued by the auth routes must verify against the task routes' key
+if SECRET_KEY:
+    auth_dependencies.SECRET_KEY = SECRET_KEY
+
+app = create_app(title="Todo API (combined)")
+# Auth routes use the task backend's engine and pool; the auth engine never connects
+app.dependency_overrides[auth_database.get_async_session] = get_async_session
+app.include_router(auth_routes.router, prefix="/auth", tags=["authentication"])
+# Password hashing and auth token metrics appear in this app's /metrics
+REGISTRY.register(auth_metrics.AUTH_REGISTRY)
+
+
+async def sync_revocations_from_database():
+    """
+    Poll the shared revoked_token table into the in-memory deny-list until cancelled.
+    Replaces the HTTP feed used by the split deployment.
+    """
+    since = None
+    while True:
+        try:
+            async with AsyncSessionLocal() as session:
+                now = datetime.utcnow()
+                statement = select(RevokedToken.jti, RevokedToken.expires_at).where(RevokedToken.expires_at > now)
+                if since is not None:
+                    statement = statement.where(RevokedToken.revoked_at >= since - REVOCATION_SYNC_OVERLAP)
+                result = await session.execute(statement)
+                for jti, expires_at in result.all():
+                    revocation_list.add(jti, expires_at.replace(tzinfo=timezone.utc).timestamp())
+            revocation_list.prune()
+            since = now
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Revocation sync failed: {str(e)}")
+        await asyncio.sleep(REVOCATION_SYNC_INTERVAL)
+
+
+@app.on_event("startup")
+async def combined_startup_event():
+    """Migrate the auth tables, calibrate password hashing and start syncing revocations"""
+    # The auth schema is versioned separately, in its own Alembic version table
+    await auth_migrations.ensure_schema(async_engine)
+    await auth_routes.configure_password_hashing()
+    app.state.database_revocation_sync = asyncio.create_task(sync_revocations_from_database())
+
+
+async def combined_shutdown_event():
+    """Stop the revocation sync and wait for in-flight password hashing jobs"""
+    task = getattr(app.state, "database_revocation_sync", None)
+    if task is not None:
+        task.cancel()
+    auth_hash_pool.hash_pool.shutdown()
+
+
+# Stop the revocation sync before the task service's handler disposes the engine it queries
+app.router.on_shutdown.insert(0, combined_shutdown_event)
+
+
+@app.get("/health/hashing")
+def hashing_stats():
+    """Password hashing pool queue depth and latency"""
+    return auth_hash_pool.hash_pool.stats()
+
+
+@app.get("/health/rate-limit")
+def login_rate_limit_stats():
+    """Login admission control counters, including rejected attempts"""
+    return auth_rate_limit.rate_limit_stats()
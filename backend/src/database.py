@@ -1,5 +1,6 @@
 """
 Database setup and initialization for the Todo application.
-Handles NeonDB connection and table creation.
+Handles NeonDB connection and sessions.
 """
-from .database_config import AsyncSessionLocal, get_async_session, create_db_and_tables
\ No newline at end of file
+from .database_config import async_engine, AsyncSessionLocal, get_async_session
+from .replicas import get_read_session, get_write_session, replica_router
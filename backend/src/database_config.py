@@ -3,12 +3,16 @@ Database configuration for the Todo application.
 Handles NeonDB connection settings and initialization.
 """
 import os
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from sqlmodel import SQLModel
 from .models.task import Task
 from .models.user import User
+from .instrumentation import instrument_engine
+from .metrics import TimedQueuePool
+import asyncio
 import logging
 
 # Get database URL from environment
@@ -27,24 +31,85 @@ else:
         # Handle older postgres:// format
         DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql+asyncpg://", 1)
 
+IS_SQLITE = DATABASE_URL.startswith("sqlite+aiosqlite")
+
+# SQLite performance profile, applied to every new connection
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+# Serialize writes within the process (set SQLITE_SERIALIZE_WRITES=0 to disable)
+SQLITE_SERIALIZE_WRITES = os.getenv("SQLITE_SERIALIZE_WRITES", "1").lower() in ("1", "true", "yes")
+
+SQLITE_PRAGMAS = (
+    # Readers no longer block the writer, and commits append to the log instead of rewriting pages
+    "PRAGMA journal_mode=WAL",
+    # With WAL, NORMAL only fsyncs at checkpoints and stays safe against corruption
+    f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}",
+    # Wait for a competing writer instead of failing with "database is locked"
+    f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+    # Negative cache_size is in KiB
+    f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}",
+    f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply the SQLite performance profile to a new connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+# PostgreSQL pool maintenance
+# Seconds before a pooled connection is replaced
+DATABASE_POOL_RECYCLE = int(os.getenv("DATABASE_POOL_RECYCLE", "1800"))
+# Seconds between liveness checks of idle connections (0 disables them and pings on every checkout)
+DATABASE_KEEPALIVE_INTERVAL = float(os.getenv("DATABASE_KEEPALIVE_INTERVAL", "60"))
+DATABASE_POOL_PRE_PING = DATABASE_KEEPALIVE_INTERVAL <= 0 or os.getenv("DATABASE_POOL_PRE_PING", "").lower() in ("1", "true", "yes")
+DATABASE_STATEMENT_CACHE_SIZE = int(os.getenv("DATABASE_STATEMENT_CACHE_SIZE", "100"))
+# Open the pool and prepare the hot task queries before serving (set DATABASE_WARMUP=0 to disable)
+DATABASE_WARMUP = os.getenv("DATABASE_WARMUP", "1").lower() in ("1", "true", "yes")
+
 # Create async engine based on database type
-if DATABASE_URL.startswith("sqlite+aiosqlite"):
+if IS_SQLITE:
     # For SQLite, we don't need asyncpg
+    sqlite_options = {}
+    if ":memory:" not in DATABASE_URL:
+        # Keep connections open so the pragmas and page cache survive between requests
+        sqlite_options = {
+            "poolclass": TimedQueuePool,
+            "pool_size": int(os.getenv("DATABASE_POOL_SIZE", "5")),
+            "max_overflow": int(os.getenv("DATABASE_MAX_OVERFLOW", "10")),
+        }
     async_engine = create_async_engine(
         DATABASE_URL,
         echo=bool(os.getenv("DATABASE_ECHO", "")),  # Set DATABASE_ECHO=1 to enable SQL logging
+        **sqlite_options
     )
+    event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
 else:
     # For PostgreSQL (NeonDB), use asyncpg
     async_engine = create_async_engine(
         DATABASE_URL,
         echo=bool(os.getenv("DATABASE_ECHO", "")),  # Set DATABASE_ECHO=1 to enable SQL logging
+        poolclass=TimedQueuePool,  # Records checkout wait for /metrics
         pool_size=int(os.getenv("DATABASE_POOL_SIZE", "5")),
         max_overflow=int(os.getenv("DATABASE_MAX_OVERFLOW", "10")),
-        pool_pre_ping=True,  # Verify connections before use
-        pool_recycle=300,    # Recycle connections every 5 minutes
+        # The background keepalive replaces the per-checkout ping unless it is disabled
+        pool_pre_ping=DATABASE_POOL_PRE_PING,
+        pool_recycle=DATABASE_POOL_RECYCLE,
+        # Prepared statements cached per connection by asyncpg (0 disables, e.g. behind PgBouncer)
+        connect_args={"prepared_statement_cache_size": DATABASE_STATEMENT_CACHE_SIZE},
     )
 
+# Count and time statements per request, and log slow ones
+instrument_engine(async_engine)
+
 # Create async session maker
 AsyncSessionLocal = sessionmaker(
     autocommit=False,
@@ -54,25 +119,53 @@ AsyncSessionLocal = sessionmaker(
     expire_on_commit=False  # Don't expire objects after commit
 )
 
+class SQLiteWriteQueue:
+    """
+    Admits one write transaction at a time, in arrival order, so concurrent writers in
+    this process queue up instead of contending for SQLite's database lock.
+    Reads do not go through the queue and run in parallel under WAL.
+    """
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.waiting = 0
+        self.writes = 0
+        self._lock = asyncio.Lock()
+        self._loop = None
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        """Hold the writer slot while a write transaction runs and commits"""
+        if not self.enabled:
+            yield
+            return
+        # An asyncio.Lock binds to the loop that first waits on it; start a fresh one
+        # when the queue is used from a new loop (a restarted server, or each test run)
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._lock, self._loop = asyncio.Lock(), loop
+        self.waiting += 1
+        try:
+            await self._lock.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            self.writes += 1
+            yield
+        finally:
+            self._lock.release()
+
+    def stats(self):
+        return {"enabled": self.enabled, "waiting": self.waiting, "writes": self.writes}
+
+
+write_queue = SQLiteWriteQueue(IS_SQLITE and SQLITE_SERIALIZE_WRITES)
+
 # Import all models to ensure they're registered with SQLModel
 def get_models():
     """Return list of all models for database creation"""
     return [Task, User]
 
-# Create all tables
-async def create_db_and_tables():
-    """Create all database tables for NeonDB"""
-    try:
-        async with async_engine.begin() as conn:
-            # Create tables if they don't exist
-            await conn.run_sync(SQLModel.metadata.create_all)
-        print("Database tables created successfully")
-    except Exception as e:
-        print(f"Error creating database tables: {e}")
-        # In production, you might want to handle this differently
-        # For now, we'll let the application continue but log the error
-        # In a real production environment, you'd want to use migrations instead
-
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency to get async database session for NeonDB
@@ -5,11 +5,19 @@ Handles JWT token verification and user identification by validating tokens from
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
+from prometheus_client import Counter
 from typing import Dict, Optional
+from collections import OrderedDict
 import os
 from datetime import datetime, timedelta
+import hashlib
 import logging
 import pathlib
+import threading
+import time
+
+from .revocation import revocation_list
+from .metrics import REGISTRY
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -49,12 +57,75 @@ else:
     logger.info(f"Secret key loaded successfully, length: {len(SECRET_KEY)}")
 ALGORITHM = "HS256"
 
+# Maximum number of verified tokens remembered (override with TOKEN_CACHE_MAX_ENTRIES)
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+
+
+class TokenCache:
+    """
+    Bounded, thread-safe LRU of verified token payloads keyed by a hash of the token.
+    Entries expire at the token's own exp claim.
+    """
+
+    def __init__(self, max_entries: int = TOKEN_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict]:
+        key = self.key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, token: str, payload: Dict, expires_at: float) -> None:
+        key = self.key(token)
+        with self._lock:
+            self._entries[key] = (payload, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+token_cache = TokenCache()
+
+token_verifications = Counter(
+    "token_verifications_total", "Access token checks by outcome", ["result"], registry=REGISTRY
+)
+
 def verify_token(token: str) -> Optional[Dict]:
     """
-    Verify JWT token from auth service and return payload if valid
+    Verify JWT token from auth service and return payload if valid.
+    Tokens verified before are served from token_cache without checking the signature again.
     """
-    logger.info(f"SECRET_KEY status in verify_token: {'SET' if SECRET_KEY else 'NOT SET'}")
-    logger.info(f"SECRET_KEY length: {len(SECRET_KEY) if SECRET_KEY else 0}")
+    cached = token_cache.get(token)
+    if cached is not None:
+        token_verifications.labels(result="cached").inc()
+        return cached
+
+    logger.debug(f"SECRET_KEY status in verify_token: {'SET' if SECRET_KEY else 'NOT SET'}")
 
     if not SECRET_KEY:
         logger.error("Server configuration error: Missing secret key for token verification")
@@ -65,20 +136,24 @@ def verify_token(token: str) -> Optional[Dict]:
 
     try:
         # Decode the token issued by auth service
-        logger.info("Attempting to decode token...")
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        logger.info(f"Token decoded successfully: {payload}")
+        logger.debug(f"Token decoded successfully: {payload}")
 
         # Check if token is expired
         exp = payload.get("exp")
-        if exp and datetime.fromtimestamp(exp) < datetime.now(timezone.utc):
-            logger.warning("Token expired")
+        if exp and exp < time.time():
+            logger.debug("Token expired")
+            token_verifications.labels(result="expired").inc()
             return None
 
+        # Only tokens with an expiry are cached, so no entry outlives its token
+        if exp:
+            token_cache.set(token, payload, exp)
+        token_verifications.labels(result="verified").inc()
         return payload
     except JWTError as e:
-        logger.error(f"Token verification failed: {str(e)}")
-        logger.error(f"Token being verified: {token[:20]}..." if token else 'None')
+        logger.warning(f"Token verification failed: {str(e)}")
+        token_verifications.labels(result="invalid").inc()
         return None
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict:
@@ -88,6 +163,13 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     token = credentials.credentials
 
     user_data = verify_token(token)
+    # Service tokens are not user sessions, even though they share the signing key
+    if user_data is not None and "scope" in user_data:
+        user_data = None
+    # Logged-out tokens are rejected from the in-memory deny-list, without a database query
+    if user_data is not None and revocation_list.is_revoked(user_data.get("jti")):
+        token_verifications.labels(result="revoked").inc()
+        user_data = None
     if user_data is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -0,0 +1,142 @@
+"""
+Request-level database instrumentation for the Todo application.
+Cursor-execute events on the engines count statements and time them into per-request
+stats held in a contextvar. The middleware reports the totals in a Server-Timing header,
+and statements over a threshold are logged with the shape of their parameters (never values).
+"""
+from contextvars import ContextVar
+from typing import Any, Optional
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+import logging
+import os
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+# Set DATABASE_TIMING_ENABLED=0 to skip the events and the Server-Timing header
+DATABASE_TIMING_ENABLED = os.getenv("DATABASE_TIMING_ENABLED", "1").lower() in ("1", "true", "yes")
+# Statements slower than this are logged (0 disables the slow-query log)
+DATABASE_SLOW_QUERY_MS = float(os.getenv("DATABASE_SLOW_QUERY_MS", "200"))
+# Requests issuing more statements than this are logged, to surface N+1 patterns (0 disables)
+DATABASE_REQUEST_STATEMENT_WARN = int(os.getenv("DATABASE_REQUEST_STATEMENT_WARN", "20"))
+# Longest statement text written to the slow-query log
+SLOW_QUERY_MAX_LENGTH = 1000
+
+
+class QueryStats:
+    """Statement count and database time of one request"""
+
+    __slots__ = ("count", "total_ms", "slowest_ms")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+
+    def record(self, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+
+
+# Stats of the request being served; the events mutate the object, so it is shared by
+# every context copied from the request's (worker threads, SQLAlchemy greenlets)
+query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """Describe bound parameters by name and type, e.g. {user_id: str, limit: int}"""
+    if executemany:
+        rows = list(parameters or [])
+        return f"{len(rows)} x {parameter_shape(rows[0])}" if rows else "[]"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return type(parameters).__name__
+
+
+def compact_statement(statement: str) -> str:
+    """Collapse whitespace and truncate a statement for logging"""
+    statement = re.sub(r"\s+", " ", statement).strip()
+    if len(statement) > SLOW_QUERY_MAX_LENGTH:
+        statement = statement[:SLOW_QUERY_MAX_LENGTH] + "..."
+    return statement
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started_at"].pop()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    stats = query_stats.get()
+    if stats is not None:
+        stats.record(elapsed_ms)
+    if DATABASE_SLOW_QUERY_MS > 0 and elapsed_ms >= DATABASE_SLOW_QUERY_MS:
+        logger.warning(
+            f"Slow query ({elapsed_ms:.1f}ms) params={parameter_shape(parameters, executemany)}: "
+            f"{compact_statement(statement)}"
+        )
+
+
+def handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started_at"):
+        connection.info["query_started_at"].pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Time every statement executed through an engine"""
+    if not DATABASE_TIMING_ENABLED:
+        return
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", handle_error)
+
+
+class DatabaseTimingMiddleware:
+    """
+    ASGI middleware giving each HTTP request its own QueryStats and reporting them as
+    Server-Timing: db;dur=<ms>;desc="<n> queries", app;dur=<ms>.
+    Streamed bodies are timed up to the start of the response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not DATABASE_TIMING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = query_stats.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                timing = (
+                    f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries", '
+                    f"app;dur={elapsed_ms:.1f}"
+                )
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", timing.encode("latin-1"))
+                ]
+                if 0 < DATABASE_REQUEST_STATEMENT_WARN < stats.count:
+                    logger.warning(
+                        f"{scope['method']} {scope['path']} issued {stats.count} statements "
+                        f"({stats.total_ms:.1f}ms in the database)"
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            query_stats.reset(token)
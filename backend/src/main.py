@@ -9,10 +9,23 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from fastapi import FastAPI
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 from .api.routes import router as api_router
-from .database import create_db_and_tables
-from .dependencies import security
+from .database import async_engine
+from .migrations import ensure_schema
+from .database_config import AsyncSessionLocal, write_queue, DATABASE_WARMUP, DATABASE_KEEPALIVE_INTERVAL, IS_SQLITE
+from .replicas import replica_router
+from .warmup import warm_pool, keep_pool_alive
+from .instrumentation import DatabaseTimingMiddleware
+from .metrics import (
+    MetricsMiddleware, PROMETHEUS_MULTIPROC_DIR, CONTENT_TYPE, register_pools, render, sample_pools_forever
+)
+from .dependencies import security, token_cache, SECRET_KEY, ALGORITHM
+from .revocation import sync_revocations_forever, AUTH_SERVICE_URL
+import asyncio
+from .services.cache import task_cache
+from .services.task_service import detect_trigram_search
 import json
 
 # Get allowed origins from environment, default to localhost
@@ -22,37 +35,99 @@ try:
 except json.JSONDecodeError:
     allowed_origins = ["http://localhost:3000", "http://localhost:8000"]
 
-# Create FastAPI app instance
-app = FastAPI(title="Todo API", version="1.0.0")
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=allowed_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+register_pools(
+    lambda: {"primary": async_engine, **{replica.name: replica.engine for replica in replica_router.replicas}}
 )
 
-# Event handlers for startup
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database tables on startup"""
-    import os
-    print(f"TODO_SERVICE_SECRET loaded: {'YES' if os.getenv('TODO_SERVICE_SECRET') else 'NO'}")
-    print(f"BETTER_AUTH_SECRET loaded: {'YES' if os.getenv('BETTER_AUTH_SECRET') else 'NO'}")
-    print(f"AUTH_SECRET_KEY loaded: {'YES' if os.getenv('AUTH_SECRET_KEY') else 'NO'}")
-    await create_db_and_tables()
-
-# Include API routes (includes both auth and task routes)
-app.include_router(api_router, prefix="/api")
-
-@app.get("/")
-def read_root():
-    """Root endpoint for health check"""
-    return {"message": "Todo API is running"}
-
-@app.get("/health")
-def health_check():
-    """Health check endpoint"""
-    return {"status": "healthy", "service": "todo-api"}
\ No newline at end of file
+
+def create_app(title: str = "Todo API") -> FastAPI:
+    """
+    Build the task service application with its middleware, startup and shutdown handlers,
+    task routes and health endpoints. The combined app builds its own and adds the auth routes.
+    """
+    app = FastAPI(title=title, version="1.0.0")
+
+    # Add CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=allowed_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["ETag", "Server-Timing"],
+    )
+
+    # Report per-request database time in a Server-Timing header
+    app.add_middleware(DatabaseTimingMiddleware)
+    # Record request latency, status codes and in-flight requests for /metrics
+    app.add_middleware(MetricsMiddleware)
+
+    # Event handlers for startup
+    @app.on_event("startup")
+    async def startup_event():
+        """Check the schema version, migrating if needed, and start background tasks on startup"""
+        import os
+        print(f"TODO_SERVICE_SECRET loaded: {'YES' if os.getenv('TODO_SERVICE_SECRET') else 'NO'}")
+        print(f"BETTER_AUTH_SECRET loaded: {'YES' if os.getenv('BETTER_AUTH_SECRET') else 'NO'}")
+        print(f"AUTH_SECRET_KEY loaded: {'YES' if os.getenv('AUTH_SECRET_KEY') else 'NO'}")
+        await ensure_schema()
+        await detect_trigram_search(async_engine)
+        if AUTH_SERVICE_URL:
+            app.state.revocation_sync = asyncio.create_task(sync_revocations_forever(SECRET_KEY, ALGORITHM))
+        if replica_router.replicas:
+            app.state.replica_health = asyncio.create_task(replica_router.check_forever())
+        pools = [(async_engine, AsyncSessionLocal)] + [(replica.engine, replica.sessionmaker) for replica in replica_router.replicas]
+        if DATABASE_WARMUP:
+            await asyncio.gather(*(warm_pool(engine, session_factory) for engine, session_factory in pools))
+        if DATABASE_KEEPALIVE_INTERVAL > 0 and not IS_SQLITE:
+            app.state.pool_keepalive = [asyncio.create_task(keep_pool_alive(engine)) for engine, _ in pools]
+        if PROMETHEUS_MULTIPROC_DIR:
+            app.state.metrics_flush = asyncio.create_task(sample_pools_forever())
+
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        """Stop background tasks and close pooled database connections"""
+        for name in ("revocation_sync", "replica_health", "metrics_flush"):
+            task = getattr(app.state, name, None)
+            if task is not None:
+                task.cancel()
+        for task in getattr(app.state, "pool_keepalive", []):
+            task.cancel()
+        await async_engine.dispose()
+        await replica_router.dispose()
+
+    # Include API routes (includes both auth and task routes)
+    app.include_router(api_router, prefix="/api")
+
+    @app.get("/")
+    def read_root():
+        """Root endpoint for health check"""
+        return {"message": "Todo API is running"}
+
+    @app.get("/health")
+    def health_check():
+        """Health check endpoint"""
+        return {"status": "healthy", "service": "todo-api"}
+
+    @app.get("/health/cache")
+    def cache_stats():
+        """Task list and verified-token cache counters, for sizing the caches"""
+        return {
+            "task_cache": {"enabled": task_cache.enabled, **task_cache.stats()},
+            "token_cache": token_cache.stats(),
+        }
+
+    @app.get("/health/database")
+    def database_stats():
+        """SQLite write queue depth and read replica routing"""
+        return {"write_queue": write_queue.stats(), "read_replicas": replica_router.stats()}
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus metrics, aggregated across workers when running several"""
+        return Response(render(), media_type=CONTENT_TYPE)
+
+    return app
+
+
+app = create_app()
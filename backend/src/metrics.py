@@ -0,0 +1,157 @@
+"""
+Prometheus metrics for the Todo application, recorded with prometheus_client.
+With several workers the production launcher sets PROMETHEUS_MULTIPROC_DIR: each worker
+keeps its values in memory-mapped files there and /metrics aggregates the files of all
+workers, including exited ones for counters and histograms.
+"""
+from typing import Callable, Dict, List
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+import asyncio
+import glob
+import logging
+import os
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+# Directory shared by the workers of one server (set automatically by the production launcher)
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+# How often each worker samples its pool gauges for the other workers' scrapes
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REGISTRY = CollectorRegistry()
+
+# Gauges are summed over the workers that are still running
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight", "HTTP requests being served", registry=REGISTRY, multiprocess_mode="livesum"
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ["method", "route"],
+    buckets=LATENCY_BUCKETS, registry=REGISTRY
+)
+http_responses_total = Counter(
+    "http_responses_total", "HTTP responses by route and status code", ["method", "route", "status"],
+    registry=REGISTRY
+)
+db_pool_checkout_seconds = Histogram(
+    "db_pool_checkout_seconds", "Time to check a connection out of the pool, including opening it",
+    buckets=LATENCY_BUCKETS, registry=REGISTRY
+)
+db_pool_gauges = [
+    (Gauge(name, documentation, ["engine"], registry=REGISTRY, multiprocess_mode="livesum"), method)
+    for name, method, documentation in (
+        ("db_pool_size", "size", "Connections the pool keeps open"),
+        ("db_pool_checked_out", "checkedout", "Connections in use"),
+        ("db_pool_checked_in", "checkedin", "Idle connections in the pool"),
+        ("db_pool_overflow", "overflow", "Connections opened beyond the pool size"),
+    )
+]
+pool_sources: List[Callable[[], Dict[str, object]]] = []
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool recording how long each checkout waited"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_checkout_seconds.observe(time.perf_counter() - started)
+
+
+def register_pools(engines: Callable[[], Dict[str, object]]) -> None:
+    """Report size, checked-out and overflow connections of named async engines"""
+    pool_sources.append(engines)
+
+
+def sample_pools() -> None:
+    for engines in pool_sources:
+        for name, engine in engines().items():
+            for gauge, method in db_pool_gauges:
+                sample = getattr(engine.pool, method, None)
+                if callable(sample):
+                    gauge.labels(engine=name).set(sample())
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording in-flight requests, latency and status codes per route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        http_requests_in_flight.inc()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            # The route template keeps label cardinality bounded; unmatched paths share one label
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            http_request_duration_seconds.labels(method=method, route=route).observe(time.perf_counter() - started)
+            http_responses_total.labels(method=method, route=route, status=str(status_code)).inc()
+
+
+def process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def remove_dead_workers(path: str) -> None:
+    """Drop the gauge files of exited workers, so their last in-flight and pool values stop counting"""
+    pids = set()
+    for gauge_file in glob.glob(os.path.join(path, "gauge_live*_*.db")):
+        match = re.search(r"_(\d+)\.db$", gauge_file)
+        if match:
+            pids.add(int(match.group(1)))
+    for pid in pids:
+        if pid != os.getpid() and not process_alive(pid):
+            multiprocess.mark_process_dead(pid, path)
+
+
+def render(registry: CollectorRegistry = REGISTRY) -> bytes:
+    """Metrics of this worker in the text exposition format, or of all workers when PROMETHEUS_MULTIPROC_DIR is set"""
+    sample_pools()
+    if not PROMETHEUS_MULTIPROC_DIR:
+        return generate_latest(registry)
+    remove_dead_workers(PROMETHEUS_MULTIPROC_DIR)
+    workers = CollectorRegistry()
+    multiprocess.MultiProcessCollector(workers, PROMETHEUS_MULTIPROC_DIR)
+    return generate_latest(workers)
+
+
+async def sample_pools_forever() -> None:
+    """Refresh this worker's pool gauges every METRICS_FLUSH_INTERVAL seconds until cancelled"""
+    while True:
+        await asyncio.sleep(METRICS_FLUSH_INTERVAL)
+        try:
+            sample_pools()
+        except Exception as e:
+            logger.warning(f"Sampling pool metrics failed: {str(e)}")
@@ -0,0 +1,46 @@
+"""
+Create the user and task tables
+
+Revision ID: 0001
+Revises:
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Databases created by the old create_all startup already have these tables and are left as is
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("user"):
+        op.create_table(
+            "user",
+            sa.Column("email", sa.String(255), nullable=False, unique=True),
+            sa.Column("name", sa.String(255), nullable=True),
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+            sa.Column("hashed_password", sa.String(255), nullable=True),
+        )
+    if not inspector.has_table("task"):
+        op.create_table(
+            "task",
+            sa.Column("title", sa.String(200), nullable=False),
+            sa.Column("description", sa.String(1000), nullable=True),
+            sa.Column("completed", sa.Boolean(), nullable=False),
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.String(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_task_user_id", "task", ["user_id"])
+        op.create_index("ix_task_created_at", "task", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("task")
+    op.drop_table("user")
@@ -0,0 +1,30 @@
+"""
+Add the task list keyset indexes
+
+Revision ID: 0002
+Revises: 0001
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    "ix_task_user_id_created_at_id": "(user_id, created_at, id)",
+    "ix_task_user_id_updated_at_id": "(user_id, updated_at, id)",
+    "ix_task_user_id_title_id": "(user_id, title, id)",
+    "ix_task_user_id_completed_created_at_id": "(user_id, completed, created_at, id)",
+}
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES.items():
+            op.create_index_online(name, "task", definition)
+
+
+def downgrade() -> None:
+    for name in INDEXES:
+        op.drop_index(name, table_name="task", if_exists=True)
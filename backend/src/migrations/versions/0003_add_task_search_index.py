@@ -0,0 +1,62 @@
+"""
+Add the task full-text search index
+
+Revision ID: 0003
+Revises: 0002
+"""
+from alembic import op
+import os
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# Set SEARCH_TRIGRAM=1 to also build the pg_trgm index; search uses the typo-tolerant fallback whenever it exists
+SEARCH_TRIGRAM = os.getenv("SEARCH_TRIGRAM", "").lower() in ("1", "true", "yes")
+
+# Frozen copy of TSVECTOR_EXPRESSION in models/task_search.py; queries must use the same text to hit the index
+TSVECTOR_EXPRESSION = "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))"
+
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS task_fts "
+    "USING fts5(title, description, content='task', content_rowid='id')",
+    """CREATE TRIGGER IF NOT EXISTS task_fts_ai AFTER INSERT ON task BEGIN
+        INSERT INTO task_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS task_fts_ad AFTER DELETE ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS task_fts_au AFTER UPDATE OF title, description ON task BEGIN
+        INSERT INTO task_fts(task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO task_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    # Index the rows that existed before the FTS table was created
+    "INSERT INTO task_fts(task_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+    elif dialect == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index_online("ix_task_search_document", "task", f"USING GIN ({TSVECTOR_EXPRESSION})")
+            if SEARCH_TRIGRAM:
+                op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+                op.create_index_online("ix_task_title_trgm", "task", "USING GIN (title gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for trigger in ("task_fts_ai", "task_fts_ad", "task_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS task_fts")
+    elif dialect == "postgresql":
+        op.drop_index("ix_task_title_trgm", table_name="task", if_exists=True)
+        op.drop_index("ix_task_search_document", table_name="task", if_exists=True)
@@ -0,0 +1,26 @@
+"""
+Add the per-user task list version counter
+
+Revision ID: 0004
+Revises: 0003
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("task_list_version"):
+        op.create_table(
+            "task_list_version",
+            sa.Column("user_id", sa.String(), primary_key=True),
+            sa.Column("version", sa.Integer(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("task_list_version")
@@ -3,10 +3,43 @@ Data models for the Todo application using SQLModel.
 Defines the Task entity with user ownership enforcement.
 """
 from sqlmodel import SQLModel, Field, create_engine
-from typing import Optional
-from datetime import datetime
+from sqlalchemy import Index
+from pydantic import field_validator
+from typing import List, Optional
+from datetime import datetime, timezone
+from enum import Enum
 import uuid
 
+
+def to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Convert an aware datetime to naive UTC, the form stored in the TIMESTAMP columns"""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+class TaskSortField(str, Enum):
+    """Columns the task list can be sorted by"""
+    created_at = "created_at"
+    updated_at = "updated_at"
+    title = "title"
+
+class SortOrder(str, Enum):
+    """Sort direction for the task list"""
+    asc = "asc"
+    desc = "desc"
+
+class TaskFileFormat(str, Enum):
+    """File formats for task export and import"""
+    ndjson = "ndjson"
+    csv = "csv"
+
+class BatchOperationType(str, Enum):
+    """Operations accepted by the batch endpoint"""
+    create = "create"
+    update = "update"
+    delete = "delete"
+    toggle = "toggle"
+
 class TaskBase(SQLModel):
     """Base model for Task with common fields"""
     title: str = Field(min_length=1, max_length=200)
@@ -15,11 +48,27 @@ class TaskBase(SQLModel):
 
 class Task(TaskBase, table=True):
     """Task model with all fields for database storage"""
+    __table_args__ = (
+        # Serve the per-user keyset pagination of the task list for each sort order
+        Index("ix_task_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_task_user_id_updated_at_id", "user_id", "updated_at", "id"),
+        Index("ix_task_user_id_title_id", "user_id", "title", "id"),
+        # Turns the "open tasks only" view into a range scan
+        Index("ix_task_user_id_completed_created_at_id", "user_id", "completed", "created_at", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: str = Field(index=True)  # Foreign key to Better Auth User
     created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+class TaskListVersion(SQLModel, table=True):
+    """Per-user counter bumped in the transaction of every task write, used for list ETags"""
+    __tablename__ = "task_list_version"
+
+    user_id: str = Field(primary_key=True)
+    version: int = Field(default=0)
+
 class TaskRead(TaskBase):
     """Model for returning task data with ID and timestamps"""
     id: int
@@ -27,6 +76,26 @@ class TaskRead(TaskBase):
     created_at: datetime
     updated_at: datetime
 
+class TaskPage(SQLModel):
+    """Model for returning one page of tasks with the cursor to the next page"""
+    items: List[TaskRead]
+    next_cursor: Optional[str] = None
+
+class TaskQuery(SQLModel):
+    """Model for the filters and sort order applied to the task list"""
+    completed: Optional[bool] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    updated_since: Optional[datetime] = None
+    sort: TaskSortField = TaskSortField.created_at
+    order: SortOrder = SortOrder.asc
+
+    @field_validator("created_after", "created_before", "updated_since")
+    @classmethod
+    def normalize_timestamps(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # Clients may send offsets ("...Z", "+02:00"); the columns hold naive UTC
+        return to_naive_utc(value)
+
 class TaskUpdate(SQLModel):
     """Model for updating task fields"""
     title: Optional[str] = Field(default=None, min_length=1, max_length=200)
@@ -35,4 +104,49 @@ class TaskUpdate(SQLModel):
 
 class TaskCreate(TaskBase):
     """Model for creating new tasks - extends base with user_id"""
-    user_id: str
\ No newline at end of file
+    user_id: str
+
+class TaskBatchOperation(SQLModel):
+    """Model for one operation in a batch; `id` targets update/delete/toggle, `task` carries create/update fields"""
+    op: BatchOperationType
+    id: Optional[int] = None
+    task: Optional[TaskUpdate] = None
+
+class TaskBatchRequest(SQLModel):
+    """Model for a batch of task operations applied in one transaction"""
+    operations: List[TaskBatchOperation]
+
+class TaskBatchResult(SQLModel):
+    """Model for the outcome of one batch operation, in request order"""
+    index: int
+    op: BatchOperationType
+    status: int
+    id: Optional[int] = None
+    task: Optional[TaskRead] = None
+    detail: Optional[str] = None
+
+class TaskBatchResponse(SQLModel):
+    """Model for returning the per-operation results of a batch"""
+    results: List[TaskBatchResult]
+
+class TaskImportRow(TaskBase):
+    """Model for one imported task; timestamps are kept when the source provides them"""
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @field_validator("created_at", "updated_at")
+    @classmethod
+    def normalize_timestamps(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # Exports of other tools often carry offsets; the columns hold naive UTC
+        return to_naive_utc(value)
+
+class TaskImportError(SQLModel):
+    """Model for a rejected import row"""
+    line: int
+    detail: str
+
+class TaskImportSummary(SQLModel):
+    """Model for returning the outcome of an import"""
+    accepted: int = 0
+    rejected: int = 0
+    errors: List[TaskImportError] = []
@@ -0,0 +1,15 @@
+"""
+Full-text search settings shared by the Task queries.
+The index itself (an FTS5 table kept in sync by triggers on SQLite, a tsvector GIN index
+plus an optional pg_trgm index on PostgreSQL) is created by migration 0003, so databases
+that existed before search was added get it too.
+"""
+
+# Name of the FTS5 virtual table shadowing task(title, description) on SQLite
+FTS_TABLE = "task_fts"
+
+# Document expression indexed on PostgreSQL; queries must use the same text to hit the index
+TSVECTOR_EXPRESSION = "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))"
+
+# Trigram index built by migration 0003 when SEARCH_TRIGRAM was set; its presence enables the typo-tolerant fallback
+TRIGRAM_INDEX = "ix_task_title_trgm"
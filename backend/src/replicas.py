@@ -0,0 +1,220 @@
+"""
+Read replica routing for the Todo application.
+Read-only endpoints are served from the replicas listed in DATABASE_READ_URLS, in
+round-robin order, skipping replicas that failed their last health check or lag too far
+behind. Users who wrote recently read from the primary so they always see their own changes.
+"""
+from collections import OrderedDict
+from typing import AsyncGenerator, Dict, List, Optional
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from fastapi import Depends
+import asyncio
+import itertools
+import logging
+import os
+import threading
+import time
+
+from .dependencies import get_current_user
+from .instrumentation import instrument_engine
+from .metrics import TimedQueuePool
+from .database_config import (
+    AsyncSessionLocal, DATABASE_POOL_PRE_PING, DATABASE_POOL_RECYCLE, DATABASE_STATEMENT_CACHE_SIZE
+)
+
+logger = logging.getLogger(__name__)
+
+# Comma-separated replica URLs (leave empty to serve every request from the primary)
+DATABASE_READ_URLS = [
+    url.strip()
+    for url in os.getenv("DATABASE_READ_URLS", os.getenv("DATABASE_READ_URL", "")).split(",")
+    if url.strip()
+]
+REPLICA_HEALTH_INTERVAL = float(os.getenv("REPLICA_HEALTH_INTERVAL", "5"))
+# Replicas further behind the primary than this are skipped until they catch up
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "10"))
+# Users who wrote within this window read from the primary
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+RECENT_WRITERS_MAX_ENTRIES = int(os.getenv("RECENT_WRITERS_MAX_ENTRIES", "100000"))
+
+# Seconds of WAL not yet replayed; 0 when the replica has replayed everything it received
+POSTGRESQL_LAG_QUERY = """
+SELECT CASE
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+
+def async_database_url(url: str) -> str:
+    """Use the asyncpg driver for PostgreSQL URLs, as the primary engine does"""
+    for prefix in ("postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return url.replace(prefix, "postgresql+asyncpg://", 1)
+    return url
+
+
+class Replica:
+    """One read replica: its engine, session maker and last health check result"""
+
+    def __init__(self, url: str):
+        url = async_database_url(url)
+        options = {}
+        if url.startswith("postgresql+asyncpg://"):
+            options = {
+                "poolclass": TimedQueuePool,
+                "pool_size": int(os.getenv("DATABASE_READ_POOL_SIZE", os.getenv("DATABASE_POOL_SIZE", "5"))),
+                "max_overflow": int(os.getenv("DATABASE_READ_MAX_OVERFLOW", os.getenv("DATABASE_MAX_OVERFLOW", "10"))),
+                "pool_pre_ping": DATABASE_POOL_PRE_PING,
+                "pool_recycle": DATABASE_POOL_RECYCLE,
+                "connect_args": {"prepared_statement_cache_size": DATABASE_STATEMENT_CACHE_SIZE},
+            }
+        self.engine = create_async_engine(url, echo=bool(os.getenv("DATABASE_ECHO", "")), **options)
+        instrument_engine(self.engine)
+        self.sessionmaker = sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            bind=self.engine,
+            class_=AsyncSession,
+            expire_on_commit=False
+        )
+        self.name = self.engine.url.host or self.engine.url.database or "replica"
+        self.healthy = True
+        self.lag: Optional[float] = None
+        self.failures = 0
+
+    async def check(self) -> None:
+        """Probe the replica and measure its replication lag"""
+        try:
+            async with self.engine.connect() as conn:
+                if self.engine.dialect.name == "postgresql":
+                    lag = (await conn.execute(text(POSTGRESQL_LAG_QUERY))).scalar()
+                else:
+                    await conn.execute(text("SELECT 1"))
+                    lag = 0
+            self.lag = float(lag or 0)
+            healthy = self.lag <= REPLICA_MAX_LAG_SECONDS
+            if not healthy and self.healthy:
+                logger.warning(f"Replica {self.name} is {self.lag:.1f}s behind; reading from other replicas")
+            self.healthy = healthy
+        except Exception as e:
+            self.mark_failed(e)
+
+    def mark_failed(self, error: Exception) -> None:
+        """Take the replica out of rotation until its next successful health check"""
+        if self.healthy:
+            logger.warning(f"Replica {self.name} is unavailable: {str(error)}")
+        self.healthy = False
+        self.failures += 1
+
+
+class ReplicaRouter:
+    """
+    Chooses where a read runs. Recent writers are remembered per process in a table
+    bounded by RECENT_WRITERS_MAX_ENTRIES; with several workers, keep READ_YOUR_WRITES_SECONDS
+    above the replicas' usual lag so a read landing on another worker is still fresh enough.
+    """
+
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(url) for url in urls]
+        self.primary_reads = 0
+        self.replica_reads = 0
+        self._next = itertools.count()
+        self._recent_writes: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record_write(self, user_id: str) -> None:
+        """Pin the user's reads to the primary for READ_YOUR_WRITES_SECONDS"""
+        if not self.replicas:
+            return
+        with self._lock:
+            self._recent_writes[user_id] = time.monotonic()
+            self._recent_writes.move_to_end(user_id)
+            while len(self._recent_writes) > RECENT_WRITERS_MAX_ENTRIES:
+                self._recent_writes.popitem(last=False)
+
+    def wrote_recently(self, user_id: str) -> bool:
+        written_at = self._recent_writes.get(user_id)
+        return written_at is not None and time.monotonic() - written_at < READ_YOUR_WRITES_SECONDS
+
+    def choose(self, user_id: str) -> Optional[Replica]:
+        """The next healthy replica in rotation, or None to read from the primary"""
+        if self.replicas and not self.wrote_recently(user_id):
+            for _ in range(len(self.replicas)):
+                replica = self.replicas[next(self._next) % len(self.replicas)]
+                if replica.healthy:
+                    self.replica_reads += 1
+                    return replica
+        self.primary_reads += 1
+        return None
+
+    def session_factory(self, user_id: str) -> sessionmaker:
+        """Session maker for a read of the user's tasks outside a request dependency"""
+        replica = self.choose(user_id)
+        return replica.sessionmaker if replica is not None else AsyncSessionLocal
+
+    async def check_forever(self) -> None:
+        """Health-check every replica until cancelled"""
+        while True:
+            await asyncio.gather(*(replica.check() for replica in self.replicas))
+            await asyncio.sleep(REPLICA_HEALTH_INTERVAL)
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def stats(self) -> Dict:
+        return {
+            "primary_reads": self.primary_reads,
+            "replica_reads": self.replica_reads,
+            "replicas": [
+                {"name": replica.name, "healthy": replica.healthy, "lag": replica.lag, "failures": replica.failures}
+                for replica in self.replicas
+            ],
+        }
+
+
+replica_router = ReplicaRouter(DATABASE_READ_URLS)
+
+
+async def get_read_session(user_id: str) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get a session for a read-only endpoint.
+    Uses a replica unless none is healthy or the user wrote recently.
+    """
+    replica = replica_router.choose(user_id)
+    session_factory = replica.sessionmaker if replica is not None else AsyncSessionLocal
+    async with session_factory() as session:
+        try:
+            yield session
+        except (DBAPIError, OSError) as e:
+            if replica is not None:
+                replica.mark_failed(e)
+            raise
+        finally:
+            await session.close()
+
+
+async def get_write_session(
+    user_id: str,
+    current_user: dict = Depends(get_current_user)
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get a primary session for an endpoint that writes the user's tasks.
+    The user's reads stay on the primary until the replicas have caught up.
+    Only the authenticated owner of the path's user_id pins it; other callers get a 403
+    from the endpoint and must not move that user's reads.
+    """
+    authorized = current_user["id"] == user_id
+    if authorized:
+        replica_router.record_write(user_id)
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+            if authorized:
+                replica_router.record_write(user_id)
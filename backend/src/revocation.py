@@ -0,0 +1,109 @@
+"""
+Access token revocation for the Todo application.
+Keeps an in-memory deny-list of revoked token ids, synced incrementally from the
+auth service, so checking a token costs no database round trip.
+"""
+from typing import Dict, Optional, Set
+from datetime import datetime, timedelta
+from jose import jwt
+import asyncio
+import httpx
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Auth service feed of revocations (leave AUTH_SERVICE_URL empty to disable syncing)
+AUTH_SERVICE_URL = os.getenv("AUTH_SERVICE_URL", "").rstrip("/")
+REVOCATION_SYNC_INTERVAL = float(os.getenv("REVOCATION_SYNC_INTERVAL", "5"))
+# Each sync re-reads this window so revocations committed late are not missed
+REVOCATION_SYNC_OVERLAP = timedelta(seconds=30)
+
+# Audience the auth service requires on revocation feed tokens; user tokens have none
+REVOCATIONS_AUDIENCE = "todo-revocations"
+
+# Width of the expiry buckets used to prune revocations once their tokens expire
+BUCKET_SECONDS = 300
+
+
+class RevocationList:
+    """
+    Exact set of revoked token ids, bucketed by expiry time.
+    Lookups are O(1); whole buckets are dropped once every token in them has expired.
+    """
+
+    def __init__(self):
+        self._revoked: Set[str] = set()
+        self._buckets: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.last_synced_at: Optional[float] = None
+
+    def add(self, jti: str, exp: float) -> None:
+        """Revoke a token id until its expiry"""
+        if exp < time.time():
+            return
+        with self._lock:
+            self._revoked.add(jti)
+            self._buckets.setdefault(int(exp // BUCKET_SECONDS), set()).add(jti)
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """Whether a token id has been revoked"""
+        return jti is not None and jti in self._revoked
+
+    def prune(self) -> None:
+        """Forget revocations whose tokens have expired on their own"""
+        current = int(time.time() // BUCKET_SECONDS)
+        with self._lock:
+            for bucket in [bucket for bucket in self._buckets if bucket < current]:
+                self._revoked.difference_update(self._buckets.pop(bucket))
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+revocation_list = RevocationList()
+
+
+def service_token(secret_key: str, algorithm: str) -> str:
+    """Sign a short-lived token authorizing this service to read the revocation feed"""
+    return jwt.encode(
+        {"sub": "todo-service", "scope": "revocations", "aud": REVOCATIONS_AUDIENCE, "exp": time.time() + 60},
+        secret_key,
+        algorithm=algorithm
+    )
+
+
+async def sync_revocations(client: httpx.AsyncClient, secret_key: str, algorithm: str, since: Optional[datetime]) -> datetime:
+    """
+    Fetch revocations made since the given time into the deny-list.
+    Returns the cursor to pass on the next call.
+    """
+    params = {"since": (since - REVOCATION_SYNC_OVERLAP).isoformat()} if since else {}
+    response = await client.get(
+        f"{AUTH_SERVICE_URL}/auth/revocations",
+        params=params,
+        headers={"Authorization": f"Bearer {service_token(secret_key, algorithm)}"}
+    )
+    response.raise_for_status()
+    feed = response.json()
+    for entry in feed["revoked"]:
+        revocation_list.add(entry["jti"], entry["exp"])
+    revocation_list.prune()
+    revocation_list.last_synced_at = time.time()
+    return datetime.fromisoformat(feed["cursor"])
+
+
+async def sync_revocations_forever(secret_key: str, algorithm: str) -> None:
+    """Poll the auth service for new revocations until cancelled"""
+    since: Optional[datetime] = None
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        while True:
+            try:
+                since = await sync_revocations(client, secret_key, algorithm, since)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Revocation sync failed: {str(e)}")
+            await asyncio.sleep(REVOCATION_SYNC_INTERVAL)
@@ -0,0 +1,124 @@
+"""
+Production serving mode for the task service and the combined app.
+Runs several uvicorn worker processes with uvloop and httptools when they are installed,
+keeps the database connections of all workers within one budget, splits the CPUs between
+the workers' password hashing pools, and drains in-flight requests on SIGTERM before the
+engine is disposed.
+"""
+from typing import Dict, Tuple
+import glob
+import importlib.util
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# Worker processes (0 = one per CPU)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "0"))
+# Connections all workers together may open (0 = no budget, use DATABASE_POOL_SIZE as is)
+DATABASE_CONNECTION_BUDGET = int(os.getenv("DATABASE_CONNECTION_BUDGET", "0"))
+# Seconds to wait for in-flight requests after SIGTERM
+GRACEFUL_SHUTDOWN_TIMEOUT = int(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", "30"))
+SERVER_KEEPALIVE_TIMEOUT = int(os.getenv("SERVER_KEEPALIVE_TIMEOUT", "5"))
+
+
+def worker_count() -> int:
+    """Number of worker processes to fork"""
+    return WEB_CONCURRENCY if WEB_CONCURRENCY > 0 else (os.cpu_count() or 1)
+
+
+def fit_pool(pool_size: int, connections: int) -> Tuple[int, int]:
+    """Split a pool's share of the budget into pool_size (at most the configured one) and max_overflow"""
+    pool_size = min(pool_size, connections)
+    return pool_size, connections - pool_size
+
+
+def pool_settings(workers: int, replicas: int = 0) -> Dict[str, int]:
+    """
+    Per-worker pool sizes and overflows keeping the connections of all workers to the
+    primary and to each of the given number of read replicas within DATABASE_CONNECTION_BUDGET.
+    Returned as the environment variables the database modules read.
+    """
+    pool_size = int(os.getenv("DATABASE_POOL_SIZE", "5"))
+    max_overflow = int(os.getenv("DATABASE_MAX_OVERFLOW", "10"))
+    settings = {"DATABASE_POOL_SIZE": pool_size, "DATABASE_MAX_OVERFLOW": max_overflow}
+    if replicas:
+        settings["DATABASE_READ_POOL_SIZE"] = int(os.getenv("DATABASE_READ_POOL_SIZE", str(pool_size)))
+        settings["DATABASE_READ_MAX_OVERFLOW"] = int(os.getenv("DATABASE_READ_MAX_OVERFLOW", str(max_overflow)))
+    if DATABASE_CONNECTION_BUDGET <= 0:
+        return settings
+
+    pools = workers * (1 + replicas)
+    per_pool = max(1, DATABASE_CONNECTION_BUDGET // pools)
+    if per_pool * pools > DATABASE_CONNECTION_BUDGET:
+        logger.warning(
+            f"DATABASE_CONNECTION_BUDGET={DATABASE_CONNECTION_BUDGET} is below one connection per pool; "
+            f"{workers} workers with {1 + replicas} pools each will open up to {pools} connections"
+        )
+    settings["DATABASE_POOL_SIZE"], settings["DATABASE_MAX_OVERFLOW"] = fit_pool(pool_size, per_pool)
+    if replicas:
+        settings["DATABASE_READ_POOL_SIZE"], settings["DATABASE_READ_MAX_OVERFLOW"] = fit_pool(settings["DATABASE_READ_POOL_SIZE"], per_pool)
+    return settings
+
+
+def hash_workers(workers: int) -> int:
+    """bcrypt threads per worker, splitting the CPUs between the workers' hashing pools"""
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+def event_loop() -> str:
+    """uvloop when installed, the standard asyncio loop otherwise"""
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def http_protocol() -> str:
+    """httptools when installed, h11 otherwise"""
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def prepare_metrics_dir(workers: int) -> None:
+    """Give the workers a shared, empty PROMETHEUS_MULTIPROC_DIR for aggregating /metrics"""
+    if workers <= 1:
+        return
+    if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="metrics-")
+    for path in glob.glob(os.path.join(os.environ["PROMETHEUS_MULTIPROC_DIR"], "*.db")):
+        os.remove(path)
+
+
+def serve(app: str, app_dir: str, host: str = "0.0.0.0", port: int = 8000, replicas: int = 0) -> None:
+    """
+    Run the application given as an import string ("src.main:app") in production mode,
+    with one pool per worker to each of `replicas` read replicas besides the primary.
+    Pool settings are passed to the workers through the environment, so they must be
+    applied before the application module is imported.
+    """
+    import uvicorn
+
+    workers = worker_count()
+    pool = pool_settings(workers, replicas)
+    os.environ.update({name: str(value) for name, value in pool.items()})
+    # Read by the auth routes of the combined app
+    os.environ.setdefault("HASH_WORKERS", str(hash_workers(workers)))
+    prepare_metrics_dir(workers)
+
+    loop, http = event_loop(), http_protocol()
+    pools = ", ".join(f"{name}={value}" for name, value in pool.items())
+    logger.info(
+        f"Starting {workers} workers ({loop}, {http}), {pools}, "
+        f"HASH_WORKERS={os.environ['HASH_WORKERS']} per worker"
+    )
+    uvicorn.run(
+        app,
+        app_dir=app_dir,
+        host=host,
+        port=port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        proxy_headers=True,
+        access_log=False,
+        timeout_keep_alive=SERVER_KEEPALIVE_TIMEOUT,
+        timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_TIMEOUT,
+    )
@@ -0,0 +1,209 @@
+"""
+Caching layer for the Todo application.
+Provides a per-user read-through cache for task lists with an in-process LRU
+backend and an optional Redis backend shared across workers.
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+from collections import OrderedDict
+import itertools
+import logging
+import os
+import threading
+import time
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # Redis support is optional
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+# Cache configuration from environment (set TASK_CACHE_ENABLED=1 to enable)
+TASK_CACHE_ENABLED = os.getenv("TASK_CACHE_ENABLED", "").lower() in ("1", "true", "yes")
+TASK_CACHE_BACKEND = os.getenv("TASK_CACHE_BACKEND", "memory")
+TASK_CACHE_TTL = float(os.getenv("TASK_CACHE_TTL", "30"))
+TASK_CACHE_MAX_ENTRIES = int(os.getenv("TASK_CACHE_MAX_ENTRIES", "10000"))
+TASK_CACHE_REDIS_URL = os.getenv("TASK_CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+
+class CacheBackend(ABC):
+    """
+    Interface of a cache backend storing string values with a TTL.
+    Each user has a generation number; bumping it invalidates every entry keyed with the old one.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    async def get_generation(self, user_id: str) -> int:
+        ...
+
+    @abstractmethod
+    async def bump_generation(self, user_id: str) -> int:
+        ...
+
+    def stats(self) -> Dict[str, float]:
+        """Return the cache counters"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process LRU cache bounded by entry count, with per-entry expiry
+    """
+
+    def __init__(self, max_entries: int = TASK_CACHE_MAX_ENTRIES):
+        super().__init__()
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._generations: "OrderedDict[str, int]" = OrderedDict()
+        # Generations are never reused, so entries of a forgotten generation stay unreachable
+        self._generation_counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    async def get_generation(self, user_id: str) -> int:
+        with self._lock:
+            generation = self._generations.get(user_id)
+            if generation is None:
+                generation = self._new_generation(user_id)
+            else:
+                self._generations.move_to_end(user_id)
+            return generation
+
+    async def bump_generation(self, user_id: str) -> int:
+        with self._lock:
+            self.invalidations += 1
+            return self._new_generation(user_id)
+
+    def _new_generation(self, user_id: str) -> int:
+        generation = next(self._generation_counter)
+        self._generations[user_id] = generation
+        self._generations.move_to_end(user_id)
+        while len(self._generations) > self.max_entries:
+            self._generations.popitem(last=False)
+        return generation
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redis-backed cache shared by every worker; counters are per worker
+    """
+
+    def __init__(self, url: str = TASK_CACHE_REDIS_URL):
+        super().__init__()
+        self._client = redis_asyncio.from_url(url, decode_responses=True)
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self._client.get(f"task_cache:{key}")
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        await self._client.set(f"task_cache:{key}", value, px=int(ttl * 1000))
+
+    async def get_generation(self, user_id: str) -> int:
+        generation = await self._client.get(f"task_cache_gen:{user_id}")
+        return int(generation) if generation is not None else 0
+
+    async def bump_generation(self, user_id: str) -> int:
+        self.invalidations += 1
+        # Generation keys never expire: a counter restarting at 1 would match entries still cached
+        return int(await self._client.incr(f"task_cache_gen:{user_id}"))
+
+
+class TaskCache:
+    """
+    Read-through cache of task list pages keyed by user, generation and query parameters
+    """
+
+    def __init__(self, backend: Optional[CacheBackend], ttl: float = TASK_CACHE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    async def key(self, user_id: str, params: str) -> str:
+        """Build the cache key of a query for the user's current generation"""
+        generation = await self.backend.get_generation(user_id)
+        return f"{user_id}:{generation}:{params}"
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self.backend.get(key)
+
+    async def set(self, key: str, value: str) -> None:
+        await self.backend.set(key, value, self.ttl)
+
+    async def invalidate(self, user_id: str) -> None:
+        """Drop every cached page of a user after one of their tasks changed"""
+        if self.backend is not None:
+            await self.backend.bump_generation(user_id)
+
+    def stats(self) -> Dict[str, float]:
+        """Return the backend counters, or an empty dict when caching is disabled"""
+        if self.backend is None:
+            return {}
+        return {"backend": type(self.backend).__name__, **self.backend.stats()}
+
+
+def create_task_cache() -> TaskCache:
+    """Create the task cache configured by the TASK_CACHE_* environment variables"""
+    if not TASK_CACHE_ENABLED:
+        return TaskCache(None)
+
+    if TASK_CACHE_BACKEND == "redis":
+        if redis_asyncio is not None:
+            return TaskCache(RedisCacheBackend(TASK_CACHE_REDIS_URL), TASK_CACHE_TTL)
+        logger.warning("TASK_CACHE_BACKEND=redis but the redis package is not installed; using memory cache")
+
+    return TaskCache(MemoryCacheBackend(TASK_CACHE_MAX_ENTRIES), TASK_CACHE_TTL)
+
+
+task_cache = create_task_cache()
@@ -0,0 +1,226 @@
+"""
+Task export and import service for the Todo application.
+Serializes a user's tasks to NDJSON or CSV as a stream of text chunks, and
+parses streamed NDJSON or CSV uploads into batched inserts.
+"""
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import DBAPIError
+from pydantic import ValidationError
+from datetime import datetime
+import codecs
+import csv
+import io
+import json
+import os
+
+from ..models.task import Task, TaskFileFormat, TaskImportRow, TaskImportError, TaskImportSummary
+from .task_service import TaskService, to_task_read
+
+# Number of tasks fetched and serialized per chunk of an export
+EXPORT_CHUNK_SIZE = 1000
+
+# Rows inserted per statement during an import (override with TASK_IMPORT_BATCH_SIZE)
+IMPORT_BATCH_SIZE = int(os.getenv("TASK_IMPORT_BATCH_SIZE", "1000"))
+MAX_IMPORT_BATCH_SIZE = 10000
+
+# Rejected rows reported individually in an import summary; the rest are only counted
+MAX_REPORTED_IMPORT_ERRORS = 100
+
+# Column order of CSV exports
+EXPORT_COLUMNS = ["id", "user_id", "title", "description", "completed", "created_at", "updated_at"]
+
+MEDIA_TYPES = {
+    TaskFileFormat.ndjson: "application/x-ndjson",
+    TaskFileFormat.csv: "text/csv",
+}
+
+
+def format_ndjson(tasks: List[Task]) -> str:
+    """Serialize tasks as newline-delimited JSON"""
+    return "".join(to_task_read(task).model_dump_json() + "\n" for task in tasks)
+
+
+def format_csv(tasks: List[Task], header: bool = False) -> str:
+    """Serialize tasks as CSV rows, optionally preceded by the header row"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    for task in tasks:
+        writer.writerow([
+            task.id,
+            task.user_id,
+            task.title,
+            task.description if task.description is not None else "",
+            "true" if task.completed else "false",
+            task.created_at.isoformat(),
+            task.updated_at.isoformat(),
+        ])
+    return buffer.getvalue()
+
+
+async def export_tasks(session: AsyncSession, user_id: str, file_format: TaskFileFormat) -> AsyncIterator[str]:
+    """
+    Stream all of a user's tasks in the requested format, one chunk of rows at a time
+    """
+    if file_format == TaskFileFormat.csv:
+        yield format_csv([], header=True)
+
+    async for tasks in TaskService.stream_tasks(session, user_id, EXPORT_CHUNK_SIZE):
+        if file_format == TaskFileFormat.csv:
+            yield format_csv(tasks)
+        else:
+            yield format_ndjson(tasks)
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Split a stream of UTF-8 byte chunks into lines without buffering the whole body
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def iter_records(
+    lines: AsyncIterator[str],
+    file_format: TaskFileFormat
+) -> AsyncIterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Parse NDJSON or CSV (with a header row) lines into (line number, row, error) records
+    """
+    header: Optional[List[str]] = None
+    record = ""
+    start = 0
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if file_format == TaskFileFormat.ndjson:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield line_number, None, "Invalid JSON"
+                continue
+            if not isinstance(row, dict):
+                yield line_number, None, "Expected a JSON object"
+                continue
+            yield line_number, row, None
+            continue
+
+        # A CSV record may span lines while a quoted field is open
+        if not record:
+            start = line_number
+        record += line.rstrip("\r") if not record else "\n" + line.rstrip("\r")
+        if record.count('"') % 2:
+            continue
+        values, record = next(csv.reader([record]), []), ""
+        if not values:
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+        elif len(values) != len(header):
+            yield start, None, f"Expected {len(header)} columns, got {len(values)}"
+        else:
+            yield start, dict(zip(header, values)), None
+
+    if record:
+        yield start, None, "Unterminated quoted field"
+
+
+def format_validation_error(error: ValidationError) -> str:
+    """Summarize a validation error as 'field: message' pairs"""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in error.errors()
+    )
+
+
+def reject(summary: TaskImportSummary, line_number: int, detail: str) -> None:
+    """Count a rejected row, reporting it while under MAX_REPORTED_IMPORT_ERRORS"""
+    summary.rejected += 1
+    if len(summary.errors) < MAX_REPORTED_IMPORT_ERRORS:
+        summary.errors.append(TaskImportError(line=line_number, detail=detail))
+
+
+async def insert_batch(
+    session: AsyncSession,
+    batch: List[Dict[str, Any]],
+    line_numbers: List[int],
+    summary: TaskImportSummary
+) -> None:
+    """
+    Insert one batch of validated rows. If the database rejects the batch, its rows are
+    retried one at a time so only the offending rows are reported and the import goes on.
+    """
+    try:
+        summary.accepted += await TaskService.insert_tasks(session, batch)
+        return
+    except DBAPIError:
+        await session.rollback()
+
+    for row, line_number in zip(batch, line_numbers):
+        try:
+            summary.accepted += await TaskService.insert_tasks(session, [row])
+        except DBAPIError as e:
+            await session.rollback()
+            reject(summary, line_number, f"Rejected by the database: {e.orig}")
+
+
+async def import_tasks(
+    session: AsyncSession,
+    user_id: str,
+    chunks: AsyncIterator[bytes],
+    file_format: TaskFileFormat,
+    batch_size: int = IMPORT_BATCH_SIZE
+) -> TaskImportSummary:
+    """
+    Validate streamed NDJSON or CSV rows against TaskBase and insert them for a user
+    in batches, holding at most one batch in memory. Each batch is committed on its own.
+    Invalid rows, and rows the database rejects, are reported in the summary.
+    """
+    batch_size = max(1, min(batch_size, MAX_IMPORT_BATCH_SIZE))
+    summary = TaskImportSummary()
+    batch: List[Dict[str, Any]] = []
+    line_numbers: List[int] = []
+
+    async for line_number, row, error in iter_records(iter_lines(chunks), file_format):
+        task = None
+        if error is None:
+            if file_format == TaskFileFormat.csv:
+                # Empty CSV cells mean "not provided", except for the required title
+                row = {key: value for key, value in row.items() if value != "" or key == "title"}
+            try:
+                task = TaskImportRow.model_validate(row)
+            except ValidationError as e:
+                error = format_validation_error(e)
+
+        if task is None:
+            reject(summary, line_number, error)
+            continue
+
+        now = datetime.utcnow()
+        batch.append({
+            "title": task.title,
+            "description": task.description,
+            "completed": task.completed,
+            "user_id": user_id,
+            "created_at": task.created_at or now,
+            "updated_at": task.updated_at or task.created_at or now,
+        })
+        line_numbers.append(line_number)
+        if len(batch) >= batch_size:
+            await insert_batch(session, batch, line_numbers, summary)
+            batch, line_numbers = [], []
+
+    await insert_batch(session, batch, line_numbers, summary)
+    return summary
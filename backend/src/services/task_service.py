@@ -2,13 +2,211 @@
 Task service layer for the Todo application.
 Handles business logic for task operations.
 """
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from sqlmodel import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, func, insert, not_, text, tuple_, update
+from sqlalchemy.sql import column, table
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlalchemy.exc import NoResultFound
+from pydantic import ValidationError
 from datetime import datetime
+import base64
+import json
+import re
 
-from ..models.task import Task, TaskCreate, TaskUpdate
+from ..models.task import (
+    Task, TaskListVersion, TaskCreate, TaskUpdate, TaskQuery, TaskSortField, SortOrder,
+    TaskRead, TaskPage, BatchOperationType, TaskBatchOperation, TaskBatchResult
+)
+from ..models.task_search import FTS_TABLE, TSVECTOR_EXPRESSION, TRIGRAM_INDEX
+from ..database_config import write_queue
+from .cache import task_cache
+
+# Page size bounds for the task list
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Upper bound on the number of operations accepted in one batch
+MAX_BATCH_OPERATIONS = 500
+
+# Fields a partial update may leave out but not set to null
+NOT_NULL_UPDATE_FIELDS = ("title", "completed")
+
+# Whether search falls back to pg_trgm similarity; set at startup by detect_trigram_search
+trigram_search = False
+
+
+async def detect_trigram_search(engine: AsyncEngine) -> bool:
+    """
+    Enable the trigram search fallback if the migrated schema has the pg_trgm index.
+    The migration alone decides whether it is built, so the query never uses an operator the
+    database lacks. Returns whether the fallback is enabled.
+    """
+    global trigram_search
+    trigram_search = False
+    if engine.dialect.name == "postgresql":
+        async with engine.connect() as conn:
+            result = await conn.execute(text("SELECT to_regclass(:index) IS NOT NULL"), {"index": TRIGRAM_INDEX})
+            trigram_search = bool(result.scalar())
+    return trigram_search
+
+
+def supports_returning(session: AsyncSession) -> bool:
+    """
+    Whether the session's database can return rows from INSERT/UPDATE/DELETE statements
+    """
+    dialect = session.bind.dialect
+    # SQLAlchemy 2.x reports update_returning (PostgreSQL, SQLite >= 3.35); 1.4 only full_returning
+    return bool(getattr(dialect, "update_returning", getattr(dialect, "full_returning", False)))
+
+
+async def bump_list_version(session: AsyncSession, user_id: str) -> None:
+    """
+    Increment a user's task list version inside the current write transaction.
+    Every task write calls this, so the version changes whatever ids or timestamps the write leaves behind.
+    """
+    dialect = session.bind.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        upsert = (sqlite if dialect == "sqlite" else postgresql).insert(TaskListVersion)
+        await session.execute(
+            upsert.values(user_id=user_id, version=1).on_conflict_do_update(
+                index_elements=[TaskListVersion.user_id], set_={"version": TaskListVersion.version + 1}
+            )
+        )
+        return
+    result = await session.execute(
+        update(TaskListVersion)
+        .where(TaskListVersion.user_id == user_id)
+        .values(version=TaskListVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        await session.execute(insert(TaskListVersion).values(user_id=user_id, version=1))
+
+
+def encode_cursor(task: Task, query: TaskQuery) -> str:
+    """
+    Encode the keyset position of a task under the given sort as an opaque cursor
+    """
+    value = getattr(task, query.sort.value)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([query.sort.value, query.order.value, value, task.id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, query: TaskQuery) -> Tuple[Any, int]:
+    """
+    Decode an opaque cursor back into its (sort value, id) keyset position.
+    Raises ValueError if the cursor is malformed or was issued for another sort order.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort, order, value, task_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if query.sort != TaskSortField.title:
+            value = datetime.fromisoformat(value)
+        task_id = int(task_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if sort != query.sort.value or order != query.order.value:
+        raise ValueError("Cursor does not match the requested sort order")
+    return value, task_id
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """
+    Encode a result offset as an opaque cursor, for ranked results without a stable keyset
+    """
+    raw = json.dumps({"offset": offset}).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    """
+    Decode an opaque offset cursor. Raises ValueError if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        offset = int(json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))["offset"])
+    except (TypeError, ValueError, KeyError, UnicodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if offset < 0:
+        raise ValueError("Invalid cursor")
+    return offset
+
+
+def null_update_fields(task_update: Optional[TaskUpdate]) -> List[str]:
+    """
+    Names of NOT NULL fields that an update explicitly sets to null
+    """
+    if task_update is None:
+        return []
+    changes = task_update.model_dump(exclude_unset=True)
+    return [name for name in NOT_NULL_UPDATE_FIELDS if name in changes and changes[name] is None]
+
+
+def search_terms(q: str) -> List[str]:
+    """
+    Split a free-text search string into word terms safe to embed in FTS query syntax
+    """
+    return re.findall(r"\w+", q.lower())
+
+
+def to_task_read(task: Optional[Task]) -> Optional[TaskRead]:
+    """
+    Convert a stored task to its response model
+    """
+    return TaskRead.model_validate(task) if task is not None else None
+
+
+async def update_one_task(session: AsyncSession, statement, task_id: int, user_id: str) -> Optional[Task]:
+    """
+    Execute an ownership-scoped UPDATE of one task, commit, and return the updated task.
+    Uses RETURNING where supported; otherwise re-reads the row inside the same transaction.
+    Returns None if no task matched.
+    """
+    statement = statement.execution_options(synchronize_session=False)
+    if supports_returning(session):
+        async with write_queue.transaction():
+            result = await session.execute(statement.returning(*Task.__table__.columns))
+            row = result.first()
+            if row is not None:
+                await bump_list_version(session, user_id)
+            await session.commit()
+        if row is None:
+            return None
+        await task_cache.invalidate(user_id)
+        return Task(**row._mapping)
+
+    async with write_queue.transaction():
+        result = await session.execute(statement)
+        if result.rowcount == 0:
+            await session.rollback()
+            return None
+        await bump_list_version(session, user_id)
+        results = await session.execute(
+            select(Task).where(Task.id == task_id).where(Task.user_id == user_id)
+        )
+        task = results.scalar_one()
+        await session.commit()
+    await task_cache.invalidate(user_id)
+    return task
+
+
+def apply_task_filters(statement, query: TaskQuery):
+    """
+    Add the SQL predicates for the filters set on a task query
+    """
+    if query.completed is not None:
+        statement = statement.where(Task.completed == query.completed)
+    if query.created_after is not None:
+        statement = statement.where(Task.created_at > query.created_after)
+    if query.created_before is not None:
+        statement = statement.where(Task.created_at < query.created_before)
+    if query.updated_since is not None:
+        statement = statement.where(Task.updated_at >= query.updated_since)
+    return statement
 
 
 class TaskService:
@@ -17,13 +215,168 @@ class TaskService:
     """
 
     @staticmethod
-    async def get_tasks_by_user_id(session: AsyncSession, user_id: str) -> List[Task]:
+    async def get_tasks_page(
+        session: AsyncSession,
+        user_id: str,
+        query: Optional[TaskQuery] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Task], Optional[str]]:
+        """
+        Retrieve one page of filtered tasks for a specific user, ordered by (sort field, id).
+        Returns the tasks and the cursor of the next page, or None on the last page.
+        """
+        query = query or TaskQuery()
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        sort_column = getattr(Task, query.sort.value)
+        descending = query.order == SortOrder.desc
+
+        statement = apply_task_filters(select(Task).where(Task.user_id == user_id), query)
+        if cursor:
+            value, task_id = decode_cursor(cursor, query)
+            position = tuple_(sort_column, Task.id)
+            statement = statement.where(
+                position < tuple_(value, task_id) if descending else position > tuple_(value, task_id)
+            )
+
+        if descending:
+            statement = statement.order_by(sort_column.desc(), Task.id.desc())
+        else:
+            statement = statement.order_by(sort_column, Task.id)
+
+        # Fetch one extra row to know whether another page exists
+        results = await session.execute(statement.limit(limit + 1))
+        tasks = results.scalars().all()
+
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = encode_cursor(tasks[-1], query)
+        return tasks, next_cursor
+
+    @staticmethod
+    async def list_tasks(
+        session: AsyncSession,
+        user_id: str,
+        query: Optional[TaskQuery] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> TaskPage:
+        """
+        Retrieve one page of tasks for a specific user through the task list cache.
+        Falls through to get_tasks_page on a miss or when caching is disabled.
+        """
+        query = query or TaskQuery()
+        if not task_cache.enabled:
+            tasks, next_cursor = await TaskService.get_tasks_page(session, user_id, query, limit, cursor)
+            return TaskPage(items=[to_task_read(task) for task in tasks], next_cursor=next_cursor)
+
+        key = await task_cache.key(user_id, f"{query.model_dump_json()}:{limit}:{cursor or ''}")
+        cached = await task_cache.get(key)
+        if cached is not None:
+            return TaskPage.model_validate_json(cached)
+
+        tasks, next_cursor = await TaskService.get_tasks_page(session, user_id, query, limit, cursor)
+        page = TaskPage(items=[to_task_read(task) for task in tasks], next_cursor=next_cursor)
+        await task_cache.set(key, page.model_dump_json())
+        return page
+
+    @staticmethod
+    async def get_tasks_version(session: AsyncSession, user_id: str) -> str:
+        """
+        Return a version string of a user's task list that changes on every write.
+        Reads the user's TaskListVersion counter, a primary key lookup.
+        Only used for ETags while the task list cache is disabled.
+        """
+        results = await session.execute(
+            select(TaskListVersion.version).where(TaskListVersion.user_id == user_id)
+        )
+        return str(results.scalar_one_or_none() or 0)
+
+    @staticmethod
+    async def stream_tasks(
+        session: AsyncSession,
+        user_id: str,
+        chunk_size: int = 1000
+    ) -> AsyncIterator[List[Task]]:
+        """
+        Stream all tasks for a specific user in chunks, ordered by (created_at, id).
+        Rows are fetched through a server-side cursor so memory stays constant.
+        """
+        statement = (
+            select(Task)
+            .where(Task.user_id == user_id)
+            .order_by(Task.created_at, Task.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await session.stream_scalars(statement)
+        async for tasks in result.partitions(chunk_size):
+            yield tasks
+
+    @staticmethod
+    async def search_tasks(
+        session: AsyncSession,
+        user_id: str,
+        q: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Task], Optional[str]]:
         """
-        Retrieve all tasks for a specific user
+        Full-text search over a user's task titles and descriptions, best matches first.
+        Every term must match, and the last term also matches as a prefix.
+        Returns the tasks and the cursor of the next page, or None on the last page.
         """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        offset = decode_offset_cursor(cursor) if cursor else 0
+        terms = search_terms(q)
+        if not terms:
+            return [], None
+
+        dialect = session.bind.dialect.name
         statement = select(Task).where(Task.user_id == user_id)
-        results = await session.execute(statement)
-        return results.scalars().all()
+        if dialect == "sqlite":
+            fts = table(FTS_TABLE, column("rowid"))
+            match = " ".join(f'"{term}"' for term in terms) + "*"
+            statement = (
+                statement.join(fts, fts.c.rowid == Task.id)
+                .where(text(f"{FTS_TABLE} MATCH :match").bindparams(match=match))
+                .order_by(text(f"bm25({FTS_TABLE})"), Task.id)
+            )
+        elif dialect == "postgresql":
+            tsquery = " & ".join(terms) + ":*"
+            matches = text(f"{TSVECTOR_EXPRESSION} @@ to_tsquery('simple', :tsquery)")
+            rank = text(f"ts_rank({TSVECTOR_EXPRESSION}, to_tsquery('simple', :tsquery)) DESC")
+            statement = (
+                statement.where(matches.bindparams(tsquery=tsquery))
+                .order_by(rank.bindparams(tsquery=tsquery), Task.id)
+            )
+        else:
+            # No text index on this backend; fall back to a substring scan
+            for term in terms:
+                pattern = f"%{term}%"
+                statement = statement.where(Task.title.ilike(pattern) | Task.description.ilike(pattern))
+            statement = statement.order_by(Task.id)
+
+        results = await session.execute(statement.offset(offset).limit(limit + 1))
+        tasks = results.scalars().all()
+
+        # Nothing matched exactly: retry on title trigram similarity to tolerate typos
+        if not tasks and offset == 0 and dialect == "postgresql" and trigram_search:
+            statement = (
+                select(Task)
+                .where(Task.user_id == user_id)
+                .where(Task.title.op("%")(q))
+                .order_by(func.similarity(Task.title, q).desc(), Task.id)
+                .limit(limit)
+            )
+            results = await session.execute(statement)
+            return results.scalars().all(), None
+
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = encode_offset_cursor(offset + limit)
+        return tasks, next_cursor
 
     @staticmethod
     async def get_task_by_id_and_user_id(session: AsyncSession, task_id: int, user_id: str) -> Optional[Task]:
@@ -44,70 +397,220 @@ class TaskService:
         Create a new task
         """
         task = Task.model_validate(task_create)
-        session.add(task)
-        await session.commit()
+        async with write_queue.transaction():
+            session.add(task)
+            await bump_list_version(session, task.user_id)
+            await session.commit()
         await session.refresh(task)
+        await task_cache.invalidate(task.user_id)
         return task
 
     @staticmethod
-    async def update_task(session: AsyncSession, task_id: int, user_id: str, task_update: TaskUpdate) -> Optional[Task]:
+    async def insert_tasks(session: AsyncSession, rows: List[Dict[str, Any]]) -> int:
         """
-        Update a task with the given ID for the specified user
+        Insert many tasks with one executemany INSERT and commit.
+        Each row must carry every column except the id. Returns the number of rows inserted.
         """
-        # Get the existing task
-        statement = select(Task).where(Task.id == task_id).where(Task.user_id == user_id)
-        results = await session.execute(statement)
-        try:
-            task = results.scalar_one()
+        if not rows:
+            return 0
+        user_ids = sorted({row["user_id"] for row in rows})
+        async with write_queue.transaction():
+            await session.execute(insert(Task), rows)
+            for user_id in user_ids:
+                await bump_list_version(session, user_id)
+            await session.commit()
+        for user_id in user_ids:
+            await task_cache.invalidate(user_id)
+        return len(rows)
+
+    @staticmethod
+    async def apply_batch(
+        session: AsyncSession,
+        user_id: str,
+        operations: List[TaskBatchOperation]
+    ) -> List[TaskBatchResult]:
+        """
+        Apply a batch of create/update/delete/toggle operations in a single transaction.
+        Operations are grouped into set-based statements: one ownership lookup, one UPDATE
+        per distinct set of changed fields, one UPDATE for all toggles, one DELETE, one
+        batched INSERT and one SELECT of the affected tasks.
+        Returns one result per operation, in request order.
+        Raises ValueError if the batch is too large or targets the same task twice.
+        """
+        if len(operations) > MAX_BATCH_OPERATIONS:
+            raise ValueError(f"A batch may contain at most {MAX_BATCH_OPERATIONS} operations")
+
+        results: List[Optional[TaskBatchResult]] = [None] * len(operations)
+
+        def fail(index: int, status: int, detail: str):
+            results[index] = TaskBatchResult(index=index, op=operations[index].op, status=status, detail=detail)
+
+        # Validate operations and index the targeted task ids
+        creates: List[Tuple[int, TaskCreate]] = []
+        targeted: Dict[int, int] = {}
+        for index, operation in enumerate(operations):
+            if operation.op == BatchOperationType.create:
+                fields = operation.task.model_dump(exclude_unset=True) if operation.task else {}
+                try:
+                    creates.append((index, TaskCreate.model_validate({**fields, "user_id": user_id})))
+                except ValidationError as e:
+                    fail(index, 422, str(e))
+                continue
+
+            if operation.id is None:
+                fail(index, 400, "Operation requires a task id")
+                continue
+            if operation.id in targeted:
+                raise ValueError(f"Task {operation.id} appears more than once in the batch")
+            if operation.op == BatchOperationType.update:
+                nulls = null_update_fields(operation.task)
+                if nulls:
+                    fail(index, 422, f"{', '.join(nulls)} cannot be null")
+                    continue
+            targeted[operation.id] = index
+
+        # The ownership lookup shares the write transaction, so it queues with the writes
+        async with write_queue.transaction():
+            # One lookup resolves ownership for every targeted task
+            owned = set()
+            if targeted:
+                rows = await session.execute(
+                    select(Task.id).where(Task.user_id == user_id).where(Task.id.in_(list(targeted)))
+                )
+                owned = set(rows.scalars().all())
+
+            updates: Dict[tuple, List[int]] = {}
+            toggles: List[int] = []
+            deletes: List[int] = []
+            for task_id, index in targeted.items():
+                operation = operations[index]
+                if task_id not in owned:
+                    fail(index, 404, "Task not found")
+                elif operation.op == BatchOperationType.update:
+                    changes = operation.task.model_dump(exclude_unset=True) if operation.task else {}
+                    if not changes:
+                        fail(index, 400, "Update requires at least one field")
+                        continue
+                    # Updates setting identical values share one statement
+                    updates.setdefault(tuple(sorted(changes.items())), []).append(task_id)
+                elif operation.op == BatchOperationType.toggle:
+                    toggles.append(task_id)
+                else:
+                    deletes.append(task_id)
+
+            now = datetime.utcnow()
+            no_sync = {"synchronize_session": False}
+            for changes, task_ids in updates.items():
+                await session.execute(
+                    update(Task)
+                    .where(Task.user_id == user_id)
+                    .where(Task.id.in_(task_ids))
+                    .values(**dict(changes), updated_at=now)
+                    .execution_options(**no_sync)
+                )
+            if toggles:
+                await session.execute(
+                    update(Task)
+                    .where(Task.user_id == user_id)
+                    .where(Task.id.in_(toggles))
+                    .values(completed=not_(Task.completed), updated_at=now)
+                    .execution_options(**no_sync)
+                )
+            if deletes:
+                await session.execute(
+                    delete(Task)
+                    .where(Task.user_id == user_id)
+                    .where(Task.id.in_(deletes))
+                    .execution_options(**no_sync)
+                )
 
-            # Update task fields
-            update_data = task_update.model_dump(exclude_unset=True)
-            for field, value in update_data.items():
-                setattr(task, field, value)
+            created_ids: List[int] = []
+            if creates:
+                # The ORM flush matches generated ids to their objects, whatever order RETURNING uses
+                tasks = [
+                    Task(**task_create.model_dump(), created_at=now, updated_at=now)
+                    for _, task_create in creates
+                ]
+                session.add_all(tasks)
+                await session.flush()
+                created_ids = [task.id for task in tasks]
 
-            # Update timestamp
-            task.updated_at = datetime.utcnow()
+            # Read back every task that still exists after the batch in one query
+            changed_ids = [task_id for task_ids in updates.values() for task_id in task_ids] + toggles + created_ids
+            tasks_by_id: Dict[int, Task] = {}
+            if changed_ids:
+                rows = await session.execute(
+                    select(Task).where(Task.user_id == user_id).where(Task.id.in_(changed_ids))
+                )
+                tasks_by_id = {task.id: task for task in rows.scalars().all()}
 
+            if changed_ids or deletes:
+                await bump_list_version(session, user_id)
             await session.commit()
-            await session.refresh(task)
-            return task
-        except NoResultFound:
-            return None
+        if changed_ids or deletes:
+            await task_cache.invalidate(user_id)
+
+        for task_id in [task_id for task_ids in updates.values() for task_id in task_ids] + toggles:
+            index = targeted[task_id]
+            results[index] = TaskBatchResult(
+                index=index, op=operations[index].op, status=200, id=task_id, task=to_task_read(tasks_by_id.get(task_id))
+            )
+        for task_id in deletes:
+            index = targeted[task_id]
+            results[index] = TaskBatchResult(index=index, op=operations[index].op, status=200, id=task_id)
+        for (index, _), task_id in zip(creates, created_ids):
+            results[index] = TaskBatchResult(
+                index=index, op=operations[index].op, status=201, id=task_id, task=to_task_read(tasks_by_id.get(task_id))
+            )
+        return results
 
     @staticmethod
-    async def delete_task(session: AsyncSession, task_id: int, user_id: str) -> bool:
+    async def update_task(session: AsyncSession, task_id: int, user_id: str, task_update: TaskUpdate) -> Optional[Task]:
         """
-        Delete a task with the given ID for the specified user
+        Update a task with the given ID for the specified user.
+        Issues a single ownership-scoped UPDATE ... RETURNING.
         """
-        # Get the existing task
-        statement = select(Task).where(Task.id == task_id).where(Task.user_id == user_id)
-        results = await session.execute(statement)
-        try:
-            task = results.scalar_one()
+        update_data = task_update.model_dump(exclude_unset=True)
+        statement = (
+            update(Task)
+            .where(Task.id == task_id)
+            .where(Task.user_id == user_id)
+            .values(**update_data, updated_at=datetime.utcnow())
+        )
+        return await update_one_task(session, statement, task_id, user_id)
 
-            await session.delete(task)
+    @staticmethod
+    async def delete_task(session: AsyncSession, task_id: int, user_id: str) -> bool:
+        """
+        Delete a task with the given ID for the specified user.
+        Issues a single ownership-scoped DELETE and checks the affected row count.
+        """
+        statement = (
+            delete(Task)
+            .where(Task.id == task_id)
+            .where(Task.user_id == user_id)
+            .execution_options(synchronize_session=False)
+        )
+        async with write_queue.transaction():
+            result = await session.execute(statement)
+            if result.rowcount:
+                await bump_list_version(session, user_id)
             await session.commit()
-            return True
-        except NoResultFound:
+        if result.rowcount == 0:
             return False
+        await task_cache.invalidate(user_id)
+        return True
 
     @staticmethod
     async def toggle_task_completion(session: AsyncSession, task_id: int, user_id: str) -> Optional[Task]:
         """
-        Toggle the completion status of a task
+        Toggle the completion status of a task.
+        Flips the flag in the database so concurrent toggles cannot lose an update.
         """
-        # Get the existing task
-        statement = select(Task).where(Task.id == task_id).where(Task.user_id == user_id)
-        results = await session.execute(statement)
-        try:
-            task = results.scalar_one()
-
-            # Toggle completion status
-            task.completed = not task.completed
-            task.updated_at = datetime.utcnow()
-
-            await session.commit()
-            await session.refresh(task)
-            return task
-        except NoResultFound:
-            return None
\ No newline at end of file
+        statement = (
+            update(Task)
+            .where(Task.id == task_id)
+            .where(Task.user_id == user_id)
+            .values(completed=not_(Task.completed), updated_at=datetime.utcnow())
+        )
+        return await update_one_task(session, statement, task_id, user_id)
@@ -0,0 +1,100 @@
+"""
+Connection pool warmup and keepalive for the Todo application.
+Opens the pool before the first request and prepares the hot task queries on every
+connection, then keeps idle connections alive with periodic liveness checks, so requests
+right after a deploy or a Neon compute resume skip TLS, authentication and ping.
+"""
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import sessionmaker
+import asyncio
+import logging
+import time
+
+from .database_config import DATABASE_KEEPALIVE_INTERVAL
+from .models.task import Task, TaskQuery, TaskSortField, SortOrder
+from .services.task_service import TaskService, DEFAULT_PAGE_SIZE, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+# Owner of no tasks; the warmup queries prepare statements without reading rows
+WARMUP_USER_ID = "__warmup__"
+
+
+def pool_capacity(engine: AsyncEngine) -> int:
+    """Number of connections the pool keeps open (1 for pools without a fixed size)"""
+    size = getattr(engine.pool, "size", None)
+    return max(1, size()) if callable(size) else 1
+
+
+async def prime_connection(session_factory: sessionmaker) -> None:
+    """
+    Run the hot task queries once on one connection.
+    asyncpg caches prepared statements per connection by SQL text, so later requests
+    issuing the same statements skip the prepare round trip.
+    """
+    # Stands in for the last task of a page, to prepare the next-page statements
+    placeholder = Task(id=0, user_id=WARMUP_USER_ID, title="", created_at=datetime.utcnow(), updated_at=datetime.utcnow())
+    async with session_factory() as session:
+        for sort in TaskSortField:
+            for order in SortOrder:
+                query = TaskQuery(sort=sort, order=order)
+                await TaskService.get_tasks_page(session, WARMUP_USER_ID, query, DEFAULT_PAGE_SIZE)
+                await TaskService.get_tasks_page(
+                    session, WARMUP_USER_ID, query, DEFAULT_PAGE_SIZE, encode_cursor(placeholder, query)
+                )
+        await TaskService.get_tasks_page(session, WARMUP_USER_ID, TaskQuery(completed=False), DEFAULT_PAGE_SIZE)
+        await TaskService.get_tasks_version(session, WARMUP_USER_ID)
+        await TaskService.get_task_by_id_and_user_id(session, 0, WARMUP_USER_ID)
+
+
+async def warm_pool(engine: AsyncEngine, session_factory: sessionmaker) -> Dict[str, float]:
+    """
+    Open pool_size connections at once and prime each of them.
+    Sessions are held concurrently so every one checks out a different connection.
+    """
+    connections = pool_capacity(engine)
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(prime_connection(session_factory) for _ in range(connections)),
+        return_exceptions=True
+    )
+    failed = [result for result in results if isinstance(result, Exception)]
+    if failed:
+        logger.warning(f"Pool warmup: {len(failed)} of {connections} connections failed: {str(failed[0])}")
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(f"Pool warmup opened {connections - len(failed)} connections in {elapsed_ms:.0f}ms")
+    return {"connections": connections - len(failed), "failed": len(failed), "elapsed_ms": elapsed_ms}
+
+
+async def ping_idle_connections(engine: AsyncEngine) -> int:
+    """
+    Check every connection not in use with SELECT 1, topping the pool back up to its size.
+    Dead connections are invalidated by the pool and reopened here rather than on a request.
+    Returns the number of failed checks.
+    """
+    idle = max(0, pool_capacity(engine) - engine.pool.checkedout())
+
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    results = await asyncio.gather(*(ping() for _ in range(idle)), return_exceptions=True)
+    return sum(1 for result in results if isinstance(result, Exception))
+
+
+async def keep_pool_alive(engine: AsyncEngine, interval: Optional[float] = None) -> None:
+    """Ping idle connections every DATABASE_KEEPALIVE_INTERVAL seconds until cancelled"""
+    interval = interval or DATABASE_KEEPALIVE_INTERVAL
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            failed = await ping_idle_connections(engine)
+            if failed:
+                logger.warning(f"Pool keepalive: {failed} connections failed their liveness check")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Pool keepalive failed: {str(e)}")
@@ -0,0 +1,73 @@
+"""
+Tests for the batch task endpoint
+"""
+from conftest import run_app
+
+
+def test_batch_reports_created_tasks_against_their_operations(user):
+    operations = [{"op": "create", "task": {"title": f"Created {index}"}} for index in range(20)]
+
+    async def scenario(client):
+        return await client.post(
+            f"/api/{user['id']}/tasks/batch", json={"operations": operations}, headers=user["headers"]
+        )
+
+    response = run_app(scenario)
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["index"] for result in results] == list(range(20))
+    for index, result in enumerate(results):
+        assert result["status"] == 201
+        assert result["task"]["id"] == result["id"]
+        assert result["task"]["title"] == f"Created {index}"
+
+
+def test_batch_rejects_explicit_nulls_per_operation(user):
+    async def scenario(client):
+        created = await client.post(
+            f"/api/{user['id']}/tasks",
+            json={"title": "Original", "user_id": user["id"]},
+            headers=user["headers"]
+        )
+        task_id = created.json()["id"]
+        batch = await client.post(
+            f"/api/{user['id']}/tasks/batch",
+            json={"operations": [
+                {"op": "update", "id": task_id, "task": {"title": None}},
+                {"op": "create", "task": {"title": "Still created"}},
+            ]},
+            headers=user["headers"]
+        )
+        single = await client.put(
+            f"/api/{user['id']}/tasks/{task_id}", json={"completed": None}, headers=user["headers"]
+        )
+        current = await client.get(f"/api/{user['id']}/tasks/{task_id}", headers=user["headers"])
+        return batch, single, current
+
+    batch, single, current = run_app(scenario)
+    assert batch.status_code == 200
+    update_result, create_result = batch.json()["results"]
+    assert update_result["status"] == 422
+    assert "title" in update_result["detail"]
+    assert create_result["status"] == 201
+    assert single.status_code == 422
+    assert current.json()["title"] == "Original"
+
+
+def test_batch_update_may_clear_the_description(user):
+    async def scenario(client):
+        created = await client.post(
+            f"/api/{user['id']}/tasks",
+            json={"title": "Described", "description": "text", "user_id": user["id"]},
+            headers=user["headers"]
+        )
+        return await client.post(
+            f"/api/{user['id']}/tasks/batch",
+            json={"operations": [{"op": "update", "id": created.json()["id"], "task": {"description": None}}]},
+            headers=user["headers"]
+        )
+
+    response = run_app(scenario)
+    result = response.json()["results"][0]
+    assert result["status"] == 200
+    assert result["task"]["description"] is None
@@ -0,0 +1,73 @@
+"""
+Tests for the task list cache and its invalidation on writes
+"""
+import asyncio
+import json
+
+import pytest
+
+from conftest import run_app
+from src.services import cache
+
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    backend = cache.MemoryCacheBackend()
+    monkeypatch.setattr(cache.task_cache, "backend", backend)
+    return backend
+
+
+def test_every_write_invalidates_the_cached_list(user, memory_cache):
+    async def scenario(client):
+        url, headers = f"/api/{user['id']}/tasks", user["headers"]
+
+        async def titles():
+            items = (await client.get(url, headers=headers)).json()["items"]
+            return sorted((task["title"], task["completed"]) for task in items)
+
+        # The repeated read is served from the cache
+        seen = [await titles(), await titles()]
+        task = (await client.post(url, json={"title": "Created", "user_id": user["id"]}, headers=headers)).json()
+        seen.append(await titles())
+        await client.put(f"{url}/{task['id']}", json={"title": "Updated"}, headers=headers)
+        seen.append(await titles())
+        await client.patch(f"{url}/{task['id']}/complete", headers=headers)
+        seen.append(await titles())
+        await client.post(
+            f"{url}/batch", json={"operations": [{"op": "create", "task": {"title": "Batched"}}]}, headers=headers
+        )
+        seen.append(await titles())
+        await client.post(f"{url}/import", content=json.dumps({"title": "Imported"}) + "\n", headers=headers)
+        seen.append(await titles())
+        await client.delete(f"{url}/{task['id']}", headers=headers)
+        seen.append(await titles())
+        return seen
+
+    assert run_app(scenario) == [
+        [],
+        [],
+        [("Created", False)],
+        [("Updated", False)],
+        [("Updated", True)],
+        [("Batched", False), ("Updated", True)],
+        [("Batched", False), ("Imported", False), ("Updated", True)],
+        [("Batched", False), ("Imported", False)],
+    ]
+    assert memory_cache.hits == 1
+    assert memory_cache.invalidations == 6
+
+
+def test_invalidation_moves_the_user_to_a_new_key():
+    task_cache = cache.TaskCache(cache.MemoryCacheBackend(), ttl=60)
+
+    async def scenario():
+        key = await task_cache.key("user-1", "params")
+        await task_cache.set(key, "page")
+        other = await task_cache.key("user-2", "params")
+        await task_cache.invalidate("user-1")
+        return key, other, await task_cache.key("user-1", "params"), await task_cache.key("user-2", "params")
+
+    key, other, new_key, other_again = asyncio.run(scenario())
+    assert new_key != key
+    assert other_again == other
+    assert asyncio.run(task_cache.get(new_key)) is None
@@ -0,0 +1,45 @@
+"""
+Tests for the combined auth + tasks application
+"""
+import asyncio
+import uuid
+
+import httpx
+
+from src import combined, main
+
+
+def run_combined(scenario):
+    async def run():
+        await combined.app.router.startup()
+        try:
+            transport = httpx.ASGITransport(app=combined.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await scenario(client)
+        finally:
+            await combined.app.router.shutdown()
+
+    return asyncio.run(run())
+
+
+def test_registered_user_can_create_a_task(monkeypatch):
+    # Cheapest bcrypt cost, pinned so startup skips the calibration
+    monkeypatch.setattr(combined.auth_routes, "PASSWORD_HASH_ROUNDS", 4)
+    credentials = {"email": f"user-{uuid.uuid4().hex[:12]}@example.com", "name": "Combined", "password": "Str0ng!Passw0rd"}
+
+    async def scenario(client):
+        registered = (await client.post("/auth/register", json=credentials)).json()
+        user_id, headers = registered["user"]["id"], {"Authorization": f"Bearer {registered['access_token']}"}
+        created = await client.post(f"/api/{user_id}/tasks", json={"title": "From combined", "user_id": user_id}, headers=headers)
+        listed = await client.get(f"/api/{user_id}/tasks", headers=headers)
+        return created, listed
+
+    created, listed = run_combined(scenario)
+    assert created.status_code == 200
+    assert [task["title"] for task in listed.json()["items"]] == ["From combined"]
+
+
+def test_task_service_app_is_left_without_the_auth_routes():
+    assert combined.app is not main.app
+    assert not [route.path for route in main.app.routes if route.path.startswith("/auth")]
+    assert not main.app.dependency_overrides
@@ -0,0 +1,63 @@
+"""
+Tests for conditional GETs on the task list
+"""
+import json
+
+from conftest import run_app
+from src.services import cache
+from src.services.task_service import TaskService
+
+
+def conditional_list_scenario(user):
+    async def scenario(client):
+        url, headers = f"/api/{user['id']}/tasks", user["headers"]
+        await client.post(url, json={"title": "First", "user_id": user["id"]}, headers=headers)
+        first = await client.get(url, headers=headers)
+        repeat = await client.get(url, headers={**headers, "If-None-Match": first.headers["ETag"]})
+        await client.post(url, json={"title": "Second", "user_id": user["id"]}, headers=headers)
+        changed = await client.get(url, headers={**headers, "If-None-Match": first.headers["ETag"]})
+        return first, repeat, changed
+    return scenario
+
+
+def assert_conditional_responses(first, repeat, changed):
+    assert first.status_code == 200
+    assert repeat.status_code == 304
+    assert repeat.headers["ETag"] == first.headers["ETag"]
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != first.headers["ETag"]
+    assert len(changed.json()["items"]) == 2
+
+
+def test_list_etag_without_cache(user):
+    assert_conditional_responses(*run_app(conditional_list_scenario(user)))
+
+
+def test_list_etag_with_cache_skips_the_version_lookup(user, monkeypatch):
+    monkeypatch.setattr(cache.task_cache, "backend", cache.MemoryCacheBackend())
+
+    async def no_lookup(session, user_id):
+        raise AssertionError("the list version lookup ran although the cache is enabled")
+
+    monkeypatch.setattr(TaskService, "get_tasks_version", staticmethod(no_lookup))
+    assert_conditional_responses(*run_app(conditional_list_scenario(user)))
+
+
+def test_list_etag_changes_when_a_delete_and_an_old_import_restore_count_and_newest_row(user):
+    # Deleting the newest row lets SQLite reuse its id and the import keeps its 2020 timestamps,
+    # so the task count, newest id and newest updated_at all end up where they were
+    old_row = {"title": "Imported", "created_at": "2020-01-01T00:00:00", "updated_at": "2020-01-01T00:00:00"}
+
+    async def scenario(client):
+        url, headers = f"/api/{user['id']}/tasks", user["headers"]
+        first = (await client.post(url, json={"title": "A", "user_id": user["id"]}, headers=headers)).json()
+        second = (await client.post(url, json={"title": "B", "user_id": user["id"]}, headers=headers)).json()
+        await client.put(f"{url}/{first['id']}", json={"title": "A2"}, headers=headers)
+        etag = (await client.get(url, headers=headers)).headers["ETag"]
+        await client.delete(f"{url}/{second['id']}", headers=headers)
+        await client.post(f"{url}/import", content=json.dumps(old_row) + "\n", headers=headers)
+        return await client.get(url, headers={**headers, "If-None-Match": etag})
+
+    response = run_app(scenario)
+    assert response.status_code == 200
+    assert sorted(task["title"] for task in response.json()["items"]) == ["A2", "Imported"]
@@ -0,0 +1,46 @@
+"""
+Tests for streamed task exports
+"""
+import uuid
+
+import pytest
+
+from conftest import make_token, run_app
+
+TASKS = [
+    {"title": "Plain"},
+    {"title": 'Quotes "and", commas', "description": "Two\nlines"},
+    {"title": "Unicode ✓ задача", "description": "", "completed": True},
+]
+
+FIELDS = ("title", "description", "completed", "created_at", "updated_at")
+
+
+@pytest.mark.parametrize("file_format", ["ndjson", "csv"])
+def test_export_round_trips_through_import(user, file_format):
+    target_id = f"user-{uuid.uuid4().hex[:12]}"
+    target_headers = {"Authorization": f"Bearer {make_token(target_id)}"}
+
+    async def listed(client, user_id, headers):
+        items = (await client.get(f"/api/{user_id}/tasks", headers=headers)).json()["items"]
+        return sorted(tuple(task[field] for field in FIELDS) for task in items)
+
+    async def scenario(client):
+        url, headers = f"/api/{user['id']}/tasks", user["headers"]
+        for task in TASKS:
+            await client.post(url, json={**task, "user_id": user["id"]}, headers=headers)
+        exported = await client.get(f"{url}/export", params={"format": file_format}, headers=headers)
+        summary = await client.post(
+            f"/api/{target_id}/tasks/import", params={"format": file_format},
+            content=exported.content, headers=target_headers
+        )
+        return exported, summary, await listed(client, user["id"], headers), await listed(client, target_id, target_headers)
+
+    exported, summary, source, imported = run_app(scenario)
+    assert exported.status_code == 200
+    assert summary.json()["accepted"] == len(TASKS)
+    assert summary.json()["rejected"] == 0
+    if file_format == "csv":
+        # CSV writes a missing description as an empty field, so an empty one comes back missing
+        source = sorted((title, description or None, *rest) for title, description, *rest in source)
+    assert imported == source
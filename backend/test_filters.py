@@ -0,0 +1,40 @@
+"""
+Tests for the task list filters
+"""
+from datetime import datetime
+
+from conftest import run_app
+from src.models.task import Task, TaskQuery
+
+
+def test_query_timestamps_are_normalized_to_naive_utc():
+    query = TaskQuery(
+        created_after="2025-01-01T10:00:00+02:00",
+        created_before="2025-01-01T10:00:00Z",
+        updated_since="2025-01-01T10:00:00",
+    )
+    assert query.created_after == datetime(2025, 1, 1, 8, 0)
+    assert query.created_before == datetime(2025, 1, 1, 10, 0)
+    assert query.updated_since == datetime(2025, 1, 1, 10, 0)
+
+
+def test_filters_accept_timezone_aware_values(user):
+    from src.database_config import AsyncSessionLocal
+
+    async def scenario(client):
+        async with AsyncSessionLocal() as session:
+            session.add_all([
+                Task(user_id=user["id"], title="Early", created_at=datetime(2025, 1, 1, 7, 0), updated_at=datetime(2025, 1, 1, 7, 0)),
+                Task(user_id=user["id"], title="Late", created_at=datetime(2025, 1, 1, 9, 0), updated_at=datetime(2025, 1, 1, 9, 0)),
+            ])
+            await session.commit()
+        # 10:30+02:00 is 08:30 UTC
+        return await client.get(
+            f"/api/{user['id']}/tasks",
+            params={"created_after": "2025-01-01T10:30:00+02:00", "created_before": "2025-01-01T12:00:00Z"},
+            headers=user["headers"]
+        )
+
+    response = run_app(scenario)
+    assert response.status_code == 200
+    assert [task["title"] for task in response.json()["items"]] == ["Late"]
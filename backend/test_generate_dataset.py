@@ -0,0 +1,51 @@
+"""
+Tests for the synthetic dataset generator in benchmarks/
+"""
+import os
+import pathlib
+import re
+import sqlite3
+import subprocess
+import sys
+import uuid
+
+from conftest import TEST_DIR
+
+GENERATOR = pathlib.Path(__file__).resolve().parent.parent / "benchmarks" / "generate_dataset.py"
+
+
+def generate(tasks_db: str, auth_db: str, *options: str) -> str:
+    # A separate process, so the generator binds the services to its own databases
+    env = {**os.environ, "PYTHONPATH": ""}
+    result = subprocess.run(
+        [
+            sys.executable, str(GENERATOR),
+            "--tasks-database-url", f"sqlite+aiosqlite:///{tasks_db}",
+            "--auth-database-url", f"sqlite+aiosqlite:///{auth_db}",
+            "--bcrypt-rounds", "4", *options,
+        ],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    return result.stdout
+
+
+def count(database: str, table: str) -> int:
+    with sqlite3.connect(database) as conn:
+        return conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+
+
+def test_generator_loads_the_requested_users_and_reports_their_tasks():
+    tasks_db, auth_db = (f"{TEST_DIR}/dataset-{name}-{uuid.uuid4().hex}.db" for name in ("tasks", "auth"))
+    output = generate(tasks_db, auth_db, "--users", "120", "--mean-tasks-per-user", "5", "--batch-size", "50")
+    users, tasks = map(int, re.search(r"Generated (\d+) users and (\d+) tasks", output).groups())
+
+    assert users == 120
+    assert count(auth_db, "user") == 120
+    assert tasks > 0
+    assert count(tasks_db, "task") == tasks
+
+    # The same seed yields the same rows; --truncate replaces them instead of adding more
+    again = generate(tasks_db, auth_db, "--users", "120", "--mean-tasks-per-user", "5", "--truncate")
+    assert f"Generated 120 users and {tasks} tasks" in again
+    assert count(auth_db, "user") == 120
+    assert count(tasks_db, "task") == tasks
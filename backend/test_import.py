@@ -0,0 +1,61 @@
+"""
+Tests for streamed task imports
+"""
+import json
+from datetime import datetime
+
+from sqlalchemy.exc import DBAPIError
+
+from conftest import run_app
+from src.services.task_service import TaskService
+
+
+def ndjson(*rows) -> bytes:
+    return "".join(json.dumps(row) + "\n" for row in rows).encode("utf-8")
+
+
+def test_import_normalizes_timezone_aware_timestamps(user):
+    body = ndjson(
+        {"title": "Offset", "created_at": "2025-01-01T10:00:00+02:00", "updated_at": "2025-01-01T10:30:00Z"},
+        {"title": "Naive", "created_at": "2025-01-01T10:00:00"},
+    )
+
+    async def scenario(client):
+        summary = await client.post(f"/api/{user['id']}/tasks/import", content=body, headers=user["headers"])
+        tasks = await client.get(f"/api/{user['id']}/tasks", headers=user["headers"])
+        return summary, tasks
+
+    summary, tasks = run_app(scenario)
+    assert summary.status_code == 200
+    assert summary.json()["accepted"] == 2
+    by_title = {task["title"]: task for task in tasks.json()["items"]}
+    assert datetime.fromisoformat(by_title["Offset"]["created_at"]) == datetime(2025, 1, 1, 8, 0)
+    assert datetime.fromisoformat(by_title["Offset"]["updated_at"]) == datetime(2025, 1, 1, 10, 30)
+    assert datetime.fromisoformat(by_title["Naive"]["created_at"]) == datetime(2025, 1, 1, 10, 0)
+
+
+def test_rows_rejected_by_the_database_are_reported_per_record(user, monkeypatch):
+    insert_tasks = TaskService.insert_tasks
+
+    async def failing_insert(session, rows):
+        if any(row["title"] == "poison" for row in rows):
+            raise DBAPIError("INSERT INTO task", {}, Exception("value rejected"))
+        return await insert_tasks(session, rows)
+
+    monkeypatch.setattr(TaskService, "insert_tasks", staticmethod(failing_insert))
+    body = ndjson({"title": "first"}, {"title": "poison"}, {"title": "third"}, {"title": ""}, {"title": "fifth"})
+
+    async def scenario(client):
+        summary = await client.post(
+            f"/api/{user['id']}/tasks/import", params={"batch_size": 2}, content=body, headers=user["headers"]
+        )
+        tasks = await client.get(f"/api/{user['id']}/tasks", headers=user["headers"])
+        return summary, tasks
+
+    summary, tasks = run_app(scenario)
+    assert summary.status_code == 200
+    result = summary.json()
+    assert result["accepted"] == 3
+    assert result["rejected"] == 2
+    assert sorted(error["line"] for error in result["errors"]) == [2, 4]
+    assert sorted(task["title"] for task in tasks.json()["items"]) == ["fifth", "first", "third"]
@@ -0,0 +1,76 @@
+"""
+Tests for the /metrics exposition, in one process and aggregated across workers
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+from prometheus_client.parser import text_string_to_metric_families
+
+from conftest import run_app
+from src import metrics
+
+
+def samples(text):
+    """(name, labels) -> value for every sample in an exposition"""
+    return {
+        (sample.name, frozenset(sample.labels.items())): sample.value
+        for family in text_string_to_metric_families(text)
+        for sample in family.samples
+    }
+
+
+def labels(**values):
+    return frozenset(values.items())
+
+
+def test_histogram_count_matches_the_inf_bucket():
+    child = metrics.http_request_duration_seconds.labels(method="GET", route="/test-histogram")
+    for seconds in (0.001, 0.02, 0.3, 42.0):
+        child.observe(seconds)
+
+    values = samples(metrics.render().decode())
+    route = {"method": "GET", "route": "/test-histogram"}
+    count = values[("http_request_duration_seconds_count", labels(**route))]
+    assert count == 4
+    assert values[("http_request_duration_seconds_bucket", labels(**route, le="+Inf"))] == count
+    assert values[("http_request_duration_seconds_bucket", labels(**route, le="0.025"))] == 2
+    assert abs(values[("http_request_duration_seconds_sum", labels(**route))] - 42.321) < 1e-9
+
+
+def test_metrics_endpoint_reports_requests_and_pools(user):
+    async def scenario(client):
+        await client.get(f"/api/{user['id']}/tasks", headers=user["headers"])
+        return await client.get("/metrics")
+
+    response = run_app(scenario)
+    assert response.status_code == 200
+    values = samples(response.text)
+    assert values[("http_responses_total", labels(method="GET", route="/api/{user_id}/tasks", status="200"))] >= 1
+    assert ("db_pool_size", labels(engine="primary")) in values
+
+
+WORKER = """
+import sys
+from src import metrics
+metrics.http_responses_total.labels(method="GET", route="/", status="200").inc()
+metrics.http_requests_in_flight.inc(int(sys.argv[1]))
+if len(sys.argv) > 2:
+    sys.stdout.write(metrics.render().decode())
+"""
+
+
+def test_workers_are_aggregated_and_gauges_of_exited_workers_dropped():
+    backend = os.path.dirname(os.path.abspath(__file__))
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": tempfile.mkdtemp(prefix="metrics-test-")}
+
+    def worker(*args):
+        return subprocess.run(
+            [sys.executable, "-c", WORKER, *args], cwd=backend, env=env, check=True, capture_output=True, text=True
+        ).stdout
+
+    worker("5")  # Exits with 5 requests still counted as in flight
+    values = samples(worker("1", "render"))
+    assert values[("http_responses_total", labels(method="GET", route="/", status="200"))] == 2
+    assert values[("http_requests_in_flight", labels())] == 1
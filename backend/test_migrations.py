@@ -0,0 +1,77 @@
+"""
+Tests for the Alembic schema migrations of the task service
+"""
+import asyncio
+import uuid
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+from conftest import TEST_DIR
+from src import migrations
+from src.models.task import Task
+from src.models.user import User
+
+
+def run_on_fresh_database(scenario):
+    """Run `await scenario(engine)` against a new, empty SQLite database"""
+    async def main():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{TEST_DIR}/migrations-{uuid.uuid4().hex}.db")
+        try:
+            return await scenario(engine)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+async def table_names(engine):
+    async with engine.connect() as conn:
+        return await conn.run_sync(lambda sync_conn: set(sa.inspect(sync_conn).get_table_names()))
+
+
+def test_fresh_database_is_migrated_to_head():
+    async def scenario(engine):
+        await migrations.ensure_schema(engine)
+        return await migrations.get_schema_revision(engine), await table_names(engine)
+
+    revision, tables = run_on_fresh_database(scenario)
+    assert revision == migrations.get_head_revision()
+    assert {"user", "task", "task_fts", "alembic_version_tasks"} <= tables
+    assert "schema_version" not in tables
+
+
+def test_current_schema_runs_no_migration(monkeypatch):
+    async def scenario(engine):
+        await migrations.migrate(engine)
+
+        async def fail(*args, **kwargs):
+            raise AssertionError("migrate() ran on a current schema")
+
+        monkeypatch.setattr(migrations, "migrate", fail)
+        await migrations.ensure_schema(engine)
+
+    run_on_fresh_database(scenario)
+
+
+def test_pending_migrations_fail_startup_without_auto_migrate(monkeypatch):
+    monkeypatch.setattr(migrations, "DATABASE_AUTO_MIGRATE", False)
+
+    async def scenario(engine):
+        with pytest.raises(migrations.SchemaOutdated):
+            await migrations.ensure_schema(engine)
+
+    run_on_fresh_database(scenario)
+
+
+def test_database_from_create_all_is_adopted():
+    async def scenario(engine):
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                lambda sync_conn: SQLModel.metadata.create_all(sync_conn, tables=[User.__table__, Task.__table__])
+            )
+        return await migrations.migrate(engine)
+
+    assert run_on_fresh_database(scenario) == migrations.get_head_revision()
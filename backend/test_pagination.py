@@ -0,0 +1,75 @@
+"""
+Tests for keyset cursor pagination of the task list
+"""
+from datetime import datetime
+
+import pytest
+
+from conftest import run_app
+from src.models.task import Task, TaskQuery, TaskSortField, SortOrder
+from src.services.task_service import encode_cursor, decode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 3, 1, 12, 30, 15, 123456)
+    task = Task(id=42, user_id="u", title="Write tests", created_at=created_at, updated_at=created_at)
+    for sort in TaskSortField:
+        for order in SortOrder:
+            query = TaskQuery(sort=sort, order=order)
+            value, task_id = decode_cursor(encode_cursor(task, query), query)
+            assert value == getattr(task, sort.value)
+            assert task_id == 42
+
+
+def test_cursor_rejects_other_sort_order():
+    task = Task(id=1, user_id="u", title="t", created_at=datetime(2025, 1, 1), updated_at=datetime(2025, 1, 1))
+    cursor = encode_cursor(task, TaskQuery(sort=TaskSortField.created_at, order=SortOrder.asc))
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, TaskQuery(sort=TaskSortField.created_at, order=SortOrder.desc))
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, TaskQuery(sort=TaskSortField.title))
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", "WyJ0aXRsZSJd", "!!"])
+def test_cursor_rejects_garbage(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, TaskQuery())
+
+
+def test_pages_cover_tasks_with_equal_created_at(user):
+    """Ties on the sort column are broken by id, so no task is skipped or repeated"""
+    from src.database_config import AsyncSessionLocal
+
+    async def scenario(client):
+        tied = datetime(2025, 1, 1, 9, 0, 0)
+        async with AsyncSessionLocal() as session:
+            session.add_all([
+                Task(user_id=user["id"], title=f"Task {index}", created_at=tied, updated_at=tied)
+                for index in range(7)
+            ])
+            await session.commit()
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+            response = await client.get(f"/api/{user['id']}/tasks", params=params, headers=user["headers"])
+            assert response.status_code == 200
+            page = response.json()
+            seen.extend(task["id"] for task in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return seen
+
+    seen = run_app(scenario)
+    assert len(seen) == 7
+    assert seen == sorted(set(seen))
+
+
+def test_invalid_cursor_is_rejected_with_400(user):
+    async def scenario(client):
+        return await client.get(
+            f"/api/{user['id']}/tasks", params={"cursor": "garbage"}, headers=user["headers"]
+        )
+
+    response = run_app(scenario)
+    assert response.status_code == 400
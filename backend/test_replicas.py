@@ -0,0 +1,28 @@
+"""
+Tests for read-your-writes routing to the primary
+"""
+from conftest import run_app
+from src.replicas import replica_router
+
+
+def test_only_the_authenticated_owner_pins_reads_to_the_primary(user, monkeypatch):
+    pinned = []
+    monkeypatch.setattr(replica_router, "record_write", pinned.append)
+    victim = "some-other-user"
+
+    async def scenario(client):
+        forbidden = await client.post(
+            f"/api/{victim}/tasks", json={"title": "Nope", "user_id": victim}, headers=user["headers"]
+        )
+        anonymous = await client.post(f"/api/{victim}/tasks", json={"title": "Nope", "user_id": victim})
+        own = await client.post(
+            f"/api/{user['id']}/tasks", json={"title": "Mine", "user_id": user["id"]}, headers=user["headers"]
+        )
+        return forbidden, anonymous, own
+
+    forbidden, anonymous, own = run_app(scenario)
+    assert forbidden.status_code == 403
+    assert anonymous.status_code in (401, 403)
+    assert own.status_code == 200
+    assert victim not in pinned
+    assert user["id"] in pinned
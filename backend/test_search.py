@@ -0,0 +1,58 @@
+"""
+Tests for full-text task search and the migration that creates its index
+"""
+import asyncio
+import uuid
+from datetime import datetime
+
+from alembic import command
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from conftest import TEST_DIR, run_app
+from src import migrations
+from src.models.task import Task
+from src.services.task_service import TaskService
+
+
+def test_search_finds_tasks_written_before_the_search_migration():
+    """Databases created before search existed get the index, filled with their rows"""
+    async def main():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{TEST_DIR}/search-{uuid.uuid4().hex}.db")
+        try:
+            async with engine.connect() as conn:
+                await conn.run_sync(lambda sync_conn: command.upgrade(migrations.alembic_config(sync_conn), "0002"))
+            now = datetime.utcnow()
+            async with AsyncSession(engine) as session:
+                session.add_all([
+                    Task(user_id="u", title="Renew passport", created_at=now, updated_at=now),
+                    Task(user_id="u", title="Buy milk", description="And passport photos", created_at=now, updated_at=now),
+                    Task(user_id="u", title="Call mum", created_at=now, updated_at=now),
+                ])
+                await session.commit()
+
+            await migrations.migrate(engine)
+            async with AsyncSession(engine) as session:
+                tasks, _ = await TaskService.search_tasks(session, "u", "passport")
+                return sorted(task.title for task in tasks)
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(main()) == ["Buy milk", "Renew passport"]
+
+
+def test_search_follows_updates_and_deletes(user):
+    async def scenario(client):
+        base = f"/api/{user['id']}/tasks"
+        created = await client.post(base, json={"title": "Water plants", "user_id": user["id"]}, headers=user["headers"])
+        task_id = created.json()["id"]
+        await client.put(f"{base}/{task_id}", json={"title": "Water the garden"}, headers=user["headers"])
+        renamed = await client.get(f"{base}/search", params={"q": "garden"}, headers=user["headers"])
+        stale = await client.get(f"{base}/search", params={"q": "plants"}, headers=user["headers"])
+        await client.delete(f"{base}/{task_id}", headers=user["headers"])
+        deleted = await client.get(f"{base}/search", params={"q": "garden"}, headers=user["headers"])
+        return renamed.json(), stale.json(), deleted.json()
+
+    renamed, stale, deleted = run_app(scenario)
+    assert [task["title"] for task in renamed["items"]] == ["Water the garden"]
+    assert stale["items"] == []
+    assert deleted["items"] == []
@@ -0,0 +1,62 @@
+"""
+Tests for the production launcher's connection budget and per-worker settings
+"""
+import os
+
+import uvicorn
+
+from src import server
+
+
+def test_budget_is_split_over_primary_and_replica_pools(monkeypatch):
+    monkeypatch.setattr(server, "DATABASE_CONNECTION_BUDGET", 60)
+    monkeypatch.setenv("DATABASE_POOL_SIZE", "5")
+    monkeypatch.setenv("DATABASE_MAX_OVERFLOW", "10")
+
+    settings = server.pool_settings(workers=4, replicas=2)
+    # 4 workers x (primary + 2 replicas) pools of 5 connections each
+    assert settings == {
+        "DATABASE_POOL_SIZE": 5, "DATABASE_MAX_OVERFLOW": 0,
+        "DATABASE_READ_POOL_SIZE": 5, "DATABASE_READ_MAX_OVERFLOW": 0,
+    }
+    per_worker = sum(settings.values())
+    assert 4 * per_worker <= 60
+
+
+def test_without_replicas_the_primary_gets_the_whole_budget(monkeypatch):
+    monkeypatch.setattr(server, "DATABASE_CONNECTION_BUDGET", 40)
+    monkeypatch.setenv("DATABASE_POOL_SIZE", "5")
+
+    assert server.pool_settings(workers=4) == {"DATABASE_POOL_SIZE": 5, "DATABASE_MAX_OVERFLOW": 5}
+
+
+def test_no_budget_keeps_the_configured_pools(monkeypatch):
+    monkeypatch.setattr(server, "DATABASE_CONNECTION_BUDGET", 0)
+    monkeypatch.setenv("DATABASE_POOL_SIZE", "8")
+    monkeypatch.setenv("DATABASE_MAX_OVERFLOW", "2")
+    monkeypatch.setenv("DATABASE_READ_POOL_SIZE", "3")
+    monkeypatch.delenv("DATABASE_READ_MAX_OVERFLOW", raising=False)
+
+    assert server.pool_settings(workers=4, replicas=1) == {
+        "DATABASE_POOL_SIZE": 8, "DATABASE_MAX_OVERFLOW": 2,
+        "DATABASE_READ_POOL_SIZE": 3, "DATABASE_READ_MAX_OVERFLOW": 2,
+    }
+
+
+def test_combined_app_splits_hashing_threads_across_workers(monkeypatch):
+    monkeypatch.setattr(server, "WEB_CONCURRENCY", 4)
+    monkeypatch.setattr(server, "DATABASE_CONNECTION_BUDGET", 0)
+    monkeypatch.setattr(server.os, "cpu_count", lambda: 8)
+    monkeypatch.setattr(server, "prepare_metrics_dir", lambda workers: None)
+    # serve() exports its settings; these are restored after the test
+    monkeypatch.setenv("DATABASE_POOL_SIZE", "5")
+    monkeypatch.setenv("DATABASE_MAX_OVERFLOW", "10")
+    monkeypatch.setenv("HASH_WORKERS", "")
+    monkeypatch.delenv("HASH_WORKERS")
+    calls = []
+    monkeypatch.setattr(uvicorn, "run", lambda app, **options: calls.append((app, options)))
+
+    server.serve("src.combined:app", app_dir=".")
+    assert calls[0][0] == "src.combined:app"
+    assert calls[0][1]["workers"] == 4
+    assert os.environ["HASH_WORKERS"] == "2"
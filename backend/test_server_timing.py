@@ -0,0 +1,23 @@
+"""
+Tests for the Server-Timing header reporting per-request database time
+"""
+import re
+
+from conftest import run_app
+
+SERVER_TIMING = re.compile(r'^db;dur=(?P<db>[\d.]+);desc="(?P<queries>\d+) queries", app;dur=(?P<app>[\d.]+)$')
+
+
+def test_server_timing_reports_database_time_and_statements(user):
+    async def scenario(client):
+        url, headers = f"/api/{user['id']}/tasks", user["headers"]
+        await client.post(url, json={"title": "Timed", "user_id": user["id"]}, headers=headers)
+        return await client.get(url, headers=headers), await client.get("/health")
+
+    listed, health = run_app(scenario)
+    timing = SERVER_TIMING.match(listed.headers["Server-Timing"])
+    assert timing is not None
+    assert int(timing["queries"]) >= 1
+    assert float(timing["db"]) <= float(timing["app"])
+    # Requests without database work still get the header, with no statements counted
+    assert SERVER_TIMING.match(health.headers["Server-Timing"])["queries"] == "0"
@@ -0,0 +1,23 @@
+"""
+Tests that service tokens signed with the shared secret are not accepted as user sessions
+"""
+from conftest import run_app, make_token
+from src.dependencies import SECRET_KEY, ALGORITHM
+from src.revocation import service_token
+
+
+def test_revocation_service_token_is_not_a_user_session():
+    tokens = [
+        service_token(SECRET_KEY, ALGORITHM),
+        # Tokens issued before service tokens carried an audience
+        make_token("todo-service", scope="revocations"),
+    ]
+
+    async def scenario(client):
+        return [
+            await client.get("/api/todo-service/tasks", headers={"Authorization": f"Bearer {token}"})
+            for token in tokens
+        ]
+
+    for response in run_app(scenario):
+        assert response.status_code == 401
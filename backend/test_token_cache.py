@@ -0,0 +1,52 @@
+"""
+Tests for the cache of verified access tokens
+"""
+from types import SimpleNamespace
+
+import pytest
+from jose import jwt
+
+from conftest import make_token
+from src import dependencies
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=0.0)
+    monkeypatch.setattr(dependencies, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+@pytest.fixture
+def token_cache(monkeypatch):
+    cache = dependencies.TokenCache(max_entries=10)
+    monkeypatch.setattr(dependencies, "token_cache", cache)
+    return cache
+
+
+def test_verified_token_is_served_from_the_cache(monkeypatch, token_cache):
+    token = make_token("cached-user")
+    payload = dependencies.verify_token(token)
+
+    def no_decode(*args, **kwargs):
+        raise AssertionError("the signature was checked again")
+
+    monkeypatch.setattr(dependencies.jwt, "decode", no_decode)
+    assert dependencies.verify_token(token) == payload
+    assert token_cache.stats()["hits"] == 1
+
+
+def test_cached_token_expires_at_its_exp(clock, token_cache):
+    token = make_token("expiring-user")
+    exp = jwt.get_unverified_claims(token)["exp"]
+    clock.now = exp - 1
+    assert dependencies.verify_token(token) is not None
+    assert token_cache.get(token) is not None
+
+    clock.now = exp
+    assert token_cache.get(token) is None
+    assert token_cache.stats()["entries"] == 0
+    # Once past its exp, verifying again rejects the token instead of caching it anew
+    clock.now = exp + 1
+    assert dependencies.verify_token(token) is None
+    assert token_cache.stats()["entries"] == 0
@@ -0,0 +1,58 @@
+"""
+Tests for single-task updates with and without UPDATE ... RETURNING
+"""
+import asyncio
+
+import pytest
+
+from conftest import run_app
+from src.services import task_service
+
+
+def update_scenario(user):
+    async def scenario(client):
+        url, headers = f"/api/{user['id']}/tasks", user["headers"]
+        task = (await client.post(url, json={"title": "Original", "user_id": user["id"]}, headers=headers)).json()
+        updated = await client.put(f"{url}/{task['id']}", json={"title": "Renamed"}, headers=headers)
+        toggled = await client.patch(f"{url}/{task['id']}/complete", headers=headers)
+        missing = await client.put(f"{url}/0", json={"title": "Nobody"}, headers=headers)
+        stored = await client.get(f"{url}/{task['id']}", headers=headers)
+        return task, updated, toggled, missing, stored
+    return scenario
+
+
+@pytest.mark.parametrize("returning", [True, False], ids=["returning", "reselect"])
+def test_update_and_toggle_return_the_stored_row(user, monkeypatch, returning):
+    calls = []
+
+    def supports_returning(session):
+        calls.append(returning)
+        return returning
+
+    monkeypatch.setattr(task_service, "supports_returning", supports_returning)
+    task, updated, toggled, missing, stored = run_app(update_scenario(user))
+
+    assert calls
+    assert updated.status_code == 200
+    assert updated.json()["title"] == "Renamed"
+    assert updated.json()["updated_at"] >= task["updated_at"]
+    assert toggled.status_code == 200
+    assert toggled.json()["completed"] is True
+    assert missing.status_code == 404
+    assert stored.json() == toggled.json()
+
+
+def test_concurrent_toggles_are_not_lost(user):
+    async def scenario(client):
+        url, headers = f"/api/{user['id']}/tasks", user["headers"]
+        task = (await client.post(url, json={"title": "Toggled", "user_id": user["id"]}, headers=headers)).json()
+        responses = await asyncio.gather(*(
+            client.patch(f"{url}/{task['id']}/complete", headers=headers) for _ in range(5)
+        ))
+        return responses, await client.get(f"{url}/{task['id']}", headers=headers)
+
+    responses, stored = run_app(scenario)
+    assert [response.status_code for response in responses] == [200] * 5
+    # Each toggle flips the stored flag, so five of them leave the task completed
+    assert stored.json()["completed"] is True
+    assert sorted(response.json()["completed"] for response in responses) == [False, False, True, True, True]
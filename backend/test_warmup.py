@@ -0,0 +1,31 @@
+"""
+Tests for the connection pool warmup and keepalive
+"""
+import asyncio
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from conftest import TEST_DIR
+from src import migrations
+from src.warmup import pool_capacity, ping_idle_connections, warm_pool
+
+
+def test_warmup_primes_every_connection_of_an_empty_database():
+    async def main():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{TEST_DIR}/warmup-{uuid.uuid4().hex}.db")
+        try:
+            await migrations.migrate(engine)
+            session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            result = await warm_pool(engine, session_factory)
+            return result, pool_capacity(engine), engine.pool.checkedin(), await ping_idle_connections(engine)
+        finally:
+            await engine.dispose()
+
+    result, capacity, idle, failed_pings = asyncio.run(main())
+    assert result["failed"] == 0
+    assert result["connections"] == capacity
+    # Every primed connection went back to the pool, ready for the first requests
+    assert idle == capacity
+    assert failed_pings == 0
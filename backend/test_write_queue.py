@@ -0,0 +1,64 @@
+"""
+Tests for the SQLite write queue
+"""
+import asyncio
+
+from conftest import run_app
+from src.database_config import SQLiteWriteQueue, write_queue
+
+
+def test_write_transactions_run_one_at_a_time_in_arrival_order():
+    queue = SQLiteWriteQueue(enabled=True)
+    active, most_active, order = [0], [0], []
+
+    async def write(index):
+        async with queue.transaction():
+            active[0] += 1
+            most_active[0] = max(most_active[0], active[0])
+            order.append(index)
+            # Yield to the other writers while holding the slot
+            await asyncio.sleep(0.001)
+            active[0] -= 1
+
+    async def scenario():
+        await asyncio.gather(*(write(index) for index in range(10)))
+
+    asyncio.run(scenario())
+    assert most_active[0] == 1
+    assert order == list(range(10))
+    assert queue.stats() == {"enabled": True, "waiting": 0, "writes": 10}
+
+
+def test_disabled_queue_lets_writers_overlap():
+    queue = SQLiteWriteQueue(enabled=False)
+    active, most_active = [0], [0]
+
+    async def write():
+        async with queue.transaction():
+            active[0] += 1
+            most_active[0] = max(most_active[0], active[0])
+            await asyncio.sleep(0.001)
+            active[0] -= 1
+
+    async def scenario():
+        await asyncio.gather(*(write() for _ in range(5)))
+
+    asyncio.run(scenario())
+    assert most_active[0] == 5
+    assert queue.stats()["writes"] == 0
+
+
+def test_concurrent_creates_all_commit_through_the_queue(user):
+    assert write_queue.enabled
+    before = write_queue.writes
+
+    async def scenario(client):
+        url = f"/api/{user['id']}/tasks"
+        return await asyncio.gather(*(
+            client.post(url, json={"title": f"Task {index}", "user_id": user["id"]}, headers=user["headers"])
+            for index in range(20)
+        ))
+
+    responses = run_app(scenario)
+    assert [response.status_code for response in responses] == [200] * 20
+    assert write_queue.writes - before == 20
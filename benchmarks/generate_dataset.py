@@ -0,0 +1,296 @@
+"""
+Synthetic dataset generator for scale testing the Todo application.
+Creates users sharing one precomputed password hash and tasks with realistic
+distributions, skewed tasks per user, per-user completion ratios, varied text lengths,
+signup and activity timestamps, and loads them straight into the task and auth schemas with
+batched executemany inserts (COPY on PostgreSQL). The same seed always yields the same rows.
+
+    python benchmarks/generate_dataset.py --users 200000 --mean-tasks-per-user 15 \\
+        --tasks-database-url postgresql+asyncpg://... --auth-database-url postgresql+asyncpg://...
+
+Every generated user can log in with --password.
+"""
+import argparse
+import asyncio
+import importlib
+import importlib.util
+import itertools
+import math
+import os
+import pathlib
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+BACKEND_PATH = ROOT / "backend"
+AUTH_BACKEND_PATH = ROOT / "auth-backend"
+# Both services name their package "src"; the auth service is loaded under this name
+AUTH_PACKAGE = "auth_service"
+
+DEFAULT_PASSWORD = "dataset-password"
+DEFAULT_END = "2026-01-01"
+
+TITLE_MAX_LENGTH = 200
+DESCRIPTION_MAX_LENGTH = 1000
+
+FIRST_NAMES = [
+    "Ada", "Alan", "Amara", "Ben", "Carla", "Chen", "Dana", "Diego", "Elena", "Farah", "Grace", "Hiro",
+    "Ines", "Jamal", "Kai", "Lena", "Mateo", "Mira", "Noah", "Olga", "Priya", "Quinn", "Rosa", "Sami",
+    "Tomas", "Uma", "Victor", "Wen", "Yara", "Zoe",
+]
+LAST_NAMES = [
+    "Abe", "Bauer", "Costa", "Diaz", "Eriksen", "Fischer", "Garcia", "Haddad", "Ito", "Jensen", "Kim",
+    "Lopez", "Moreau", "Nakamura", "Okafor", "Patel", "Rossi", "Silva", "Tanaka", "Novak", "Weber", "Zhang",
+]
+VERBS = [
+    "Buy", "Call", "Email", "Review", "Fix", "Write", "Book", "Plan", "Pay", "Clean", "Update", "Schedule",
+    "Prepare", "Send", "Renew", "Check", "Organize", "Finish", "Draft", "Cancel", "Pick up", "Submit",
+]
+OBJECTS = [
+    "groceries", "the dentist", "quarterly report", "flight tickets", "rent", "the garage", "passport",
+    "car insurance", "birthday gift", "team meeting notes", "tax return", "kitchen sink", "blog post",
+    "gym membership", "project proposal", "laundry", "invoice", "slides", "doctor appointment",
+    "library books", "budget spreadsheet", "hotel reservation", "pull request", "newsletter",
+]
+CONTEXTS = [
+    "before Friday", "for mom", "at work", "this weekend", "tomorrow morning", "for the trip",
+    "with Sam", "after lunch", "next week", "for the client", "again", "online",
+]
+# Description vocabulary; drawn with Zipf-like weights so full-text search sees realistic term frequencies
+WORDS = (
+    "the to and a of for on in with remember need it this is that at by from about before after "
+    "call check make sure ask send get bring find book order pay note list update review discuss "
+    "meeting project team client budget report deadline invoice email phone appointment ticket "
+    "house car kitchen garden office school doctor bank store trip flight hotel weekend "
+    "monday tuesday wednesday thursday friday morning evening urgent later maybe important "
+    "documents receipts groceries milk bread coffee printer password account subscription renewal "
+    "presentation slides draft feedback notes agenda follow up confirm schedule reschedule cancel"
+).split()
+WORD_WEIGHTS = list(itertools.accumulate(1.0 / rank for rank in range(1, len(WORDS) + 1)))
+
+USER_COLUMNS = ["id", "email", "name", "hashed_password", "created_at", "updated_at"]
+TASK_COLUMNS = ["user_id", "title", "description", "completed", "created_at", "updated_at"]
+
+
+def user_rng(seed: int, index: int) -> random.Random:
+    """
+    Generator for one user and their tasks.
+    Seeding per user keeps every row independent of batch size and of the other users.
+    """
+    return random.Random(f"{seed}:{index}")
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(WORDS, cum_weights=WORD_WEIGHTS, k=words)).capitalize() + "."
+
+
+def task_title(rng: random.Random) -> str:
+    title = f"{rng.choice(VERBS)} {rng.choice(OBJECTS)}"
+    if rng.random() < 0.4:
+        title += f" {rng.choice(CONTEXTS)}"
+    if rng.random() < 0.05:
+        # A few long titles, as pasted from emails or tickets
+        title += " - " + sentence(rng, rng.randint(5, 30))
+    return title[:TITLE_MAX_LENGTH]
+
+
+def task_description(rng: random.Random) -> Optional[str]:
+    """No description for about half the tasks; otherwise a log-normal number of words"""
+    if rng.random() < 0.45:
+        return None
+    words = max(1, int(rng.lognormvariate(math.log(12), 0.9)))
+    sentences = []
+    while words > 0:
+        length = min(words, rng.randint(4, 14))
+        sentences.append(sentence(rng, length))
+        words -= length
+    return " ".join(sentences)[:DESCRIPTION_MAX_LENGTH]
+
+
+def generate_user(args, index: int, hashed_password: str) -> Tuple[Tuple, List[Tuple]]:
+    """
+    One user row and its task rows, in USER_COLUMNS and TASK_COLUMNS order.
+    Task counts are log-normal (most users have a few tasks, a few have thousands); each
+    user has their own completion ratio, and older tasks are more likely to be done.
+    """
+    rng = user_rng(args.seed, index)
+    span = args.end - args.start
+    user_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    signed_up = args.start + span * rng.random()
+    user = (
+        user_id, f"user{index:08d}@{args.email_domain}", f"{first} {last}",
+        hashed_password, signed_up, signed_up,
+    )
+
+    sigma = args.skew
+    mu = math.log(args.mean_tasks_per_user) - sigma * sigma / 2 if args.mean_tasks_per_user > 0 else -math.inf
+    count = min(args.max_tasks_per_user, int(rng.lognormvariate(mu, sigma))) if mu > -math.inf else 0
+    completion_ratio = rng.betavariate(2.5, 1.5)
+    active = args.end - signed_up
+
+    # Activity grows toward the present: square root of a uniform skews creation times late
+    created = sorted(signed_up + active * math.sqrt(rng.random()) for _ in range(count))
+    tasks = []
+    for created_at in created:
+        age_days = (args.end - created_at).total_seconds() / 86400
+        completed = rng.random() < completion_ratio * min(1.0, 0.3 + age_days / 14)
+        updated_at = created_at
+        if completed or rng.random() < 0.2:
+            updated_at = min(args.end, created_at + timedelta(hours=rng.expovariate(1 / 48)))
+        tasks.append((user_id, task_title(rng), task_description(rng), completed, created_at, updated_at))
+    return user, tasks
+
+
+def generate(args, hashed_password: str) -> Iterator[Tuple[List[Tuple], List[Tuple]]]:
+    """Users and their tasks in batches of --batch-size users"""
+    for start in range(0, args.users, args.batch_size):
+        users, tasks = [], []
+        for index in range(start, min(args.users, start + args.batch_size)):
+            user, user_tasks = generate_user(args, index, hashed_password)
+            users.append(user)
+            tasks.extend(user_tasks)
+        yield users, tasks
+
+
+def load_modules(tasks_url: str, auth_url: str):
+    """Import both services' migrations (and so their engines), each bound to its own database"""
+    # Statement timing would log every bulk insert as a slow query
+    os.environ["DATABASE_TIMING_ENABLED"] = "0"
+    os.environ["DATABASE_READ_URLS"] = ""
+
+    os.environ["DATABASE_URL"] = tasks_url
+    sys.path.insert(0, str(BACKEND_PATH))
+    task_migrations = importlib.import_module("src.migrations")
+
+    os.environ["DATABASE_URL"] = auth_url
+    source = AUTH_BACKEND_PATH / "src"
+    spec = importlib.util.spec_from_file_location(
+        AUTH_PACKAGE, source / "__init__.py", submodule_search_locations=[str(source)]
+    )
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[AUTH_PACKAGE] = package
+    spec.loader.exec_module(package)
+    auth_migrations = importlib.import_module(f"{AUTH_PACKAGE}.migrations")
+    return task_migrations, auth_migrations
+
+
+async def bulk_insert(conn, table, columns: List[str], rows: List[Tuple]) -> None:
+    """COPY on asyncpg, otherwise one executemany of the whole batch"""
+    if not rows:
+        return
+    if conn.dialect.name == "postgresql" and conn.dialect.driver == "asyncpg":
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(table.name, records=rows, columns=columns)
+        return
+    await conn.execute(table.insert(), [dict(zip(columns, row)) for row in rows])
+
+
+async def truncate(task_engine, auth_engine, user_table, task_table) -> None:
+    from sqlalchemy import text
+    async with task_engine.begin() as conn:
+        await conn.execute(task_table.delete())
+    async with auth_engine.begin() as conn:
+        for table in ("refresh_token", "revoked_token"):
+            await conn.execute(text(f"DELETE FROM {table}"))
+        await conn.execute(user_table.delete())
+
+
+async def analyze(engine) -> None:
+    """Refresh planner statistics so the first queries plan against the new row counts"""
+    from sqlalchemy import text
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE"))
+
+
+async def generate_dataset(args) -> Dict:
+    from passlib.hash import bcrypt
+
+    task_migrations, auth_migrations = load_modules(args.tasks_database_url, args.auth_database_url)
+    task_engine, auth_engine = task_migrations.async_engine, auth_migrations.async_engine
+    task_table = importlib.import_module("src.models.task").Task.__table__
+    user_table = importlib.import_module(f"{AUTH_PACKAGE}.models.user").User.__table__
+
+    await task_migrations.migrate(task_engine)
+    await auth_migrations.migrate(auth_engine)
+    if args.truncate:
+        await truncate(task_engine, auth_engine, user_table, task_table)
+
+    # One bcrypt hash for every row; hashing millions of passwords would dominate the run
+    hashed_password = bcrypt.using(rounds=args.bcrypt_rounds).hash(args.password)
+
+    started = time.perf_counter()
+    users_loaded = tasks_loaded = completed = 0
+    for users, tasks in generate(args, hashed_password):
+        async with auth_engine.begin() as conn:
+            await bulk_insert(conn, user_table, USER_COLUMNS, users)
+        async with task_engine.begin() as conn:
+            for offset in range(0, len(tasks), args.batch_size * 10):
+                await bulk_insert(conn, task_table, TASK_COLUMNS, tasks[offset:offset + args.batch_size * 10])
+        users_loaded += len(users)
+        tasks_loaded += len(tasks)
+        completed += sum(1 for task in tasks if task[3])
+        elapsed = time.perf_counter() - started
+        print(
+            f"{users_loaded}/{args.users} users, {tasks_loaded} tasks ({tasks_loaded / elapsed:.0f} tasks/s)",
+            file=sys.stderr
+        )
+
+    await analyze(task_engine)
+    if auth_engine.url != task_engine.url:
+        await analyze(auth_engine)
+    await task_engine.dispose()
+    await auth_engine.dispose()
+
+    return {
+        "seed": args.seed,
+        "users": users_loaded,
+        "tasks": tasks_loaded,
+        "completed_ratio": completed / tasks_loaded if tasks_loaded else 0.0,
+        "elapsed_s": time.perf_counter() - started,
+    }
+
+
+def parse_date(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks-database-url", default=os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./todo_app.db"),
+                        help="Task service database (default: DATABASE_URL)")
+    parser.add_argument("--auth-database-url", help="Auth service database (default: the task database)")
+    parser.add_argument("--users", type=int, default=10000, help="Users to generate")
+    parser.add_argument("--mean-tasks-per-user", type=float, default=20.0, help="Mean of the per-user task count")
+    parser.add_argument("--max-tasks-per-user", type=int, default=5000, help="Cap on one user's tasks")
+    parser.add_argument("--skew", type=float, default=1.2,
+                        help="Sigma of the log-normal task count; higher means a heavier tail of busy users")
+    parser.add_argument("--days", type=int, default=730, help="Signups are spread over this many days before --end")
+    parser.add_argument("--end", type=parse_date, default=parse_date(DEFAULT_END),
+                        help=f"Latest generated timestamp (default {DEFAULT_END}; fixed so runs are reproducible)")
+    parser.add_argument("--seed", type=int, default=1, help="Same seed and options, same rows")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="Password of every generated user")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12, help="bcrypt cost of the shared hash")
+    parser.add_argument("--email-domain", default="example.com", help="Domain of the generated emails")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Users per transaction")
+    parser.add_argument("--truncate", action="store_true",
+                        help="Delete ALL existing tasks, users and tokens first (scratch databases only)")
+    args = parser.parse_args(argv)
+    args.auth_database_url = args.auth_database_url or args.tasks_database_url
+    args.start = args.end - timedelta(days=args.days)
+
+    summary = asyncio.run(generate_dataset(args))
+    print(
+        f"Generated {summary['users']} users and {summary['tasks']} tasks "
+        f"({summary['completed_ratio']:.0%} completed) in {summary['elapsed_s']:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,420 @@
+"""
+End-to-end benchmark suite for the Todo application.
+Boots the auth service and the task backend in-process against fresh SQLite databases
+(or a PostgreSQL database), seeds users and tasks, drives a weighted mix of login, list,
+create, toggle and delete requests through httpx at fixed concurrency levels, and writes
+throughput and p50/p95/p99 latency per endpoint as JSON.
+
+    python benchmarks/run_benchmarks.py run --output results.json
+    python benchmarks/run_benchmarks.py run --baseline baseline.json
+    python benchmarks/run_benchmarks.py compare baseline.json results.json
+"""
+import argparse
+import asyncio
+import importlib
+import importlib.util
+import json
+import logging
+import math
+import os
+import pathlib
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+BACKEND_PATH = ROOT / "backend"
+AUTH_BACKEND_PATH = ROOT / "auth-backend"
+# Both services name their package "src"; the auth service is loaded under this name
+AUTH_PACKAGE = "auth_service"
+
+DEFAULT_MIX = "login=5,list=60,create=15,toggle=10,delete=10"
+BENCHMARK_PASSWORD = "benchmark-password"
+BENCHMARK_SECRET = "benchmark-secret-key-benchmark-secret-key"
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """Parse 'login=5,list=60,...' into operation weights"""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Unknown operation {name!r}; expected one of {', '.join(OPERATIONS)}")
+        mix[name.strip()] = int(weight)
+    return mix
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def configure_environment(args, workdir: pathlib.Path) -> Tuple[str, str]:
+    """Set the variables both services read at import time; returns the two database URLs"""
+    if args.postgres_url:
+        tasks_url = auth_url = args.postgres_url
+    else:
+        tasks_url = f"sqlite+aiosqlite:///{workdir / 'tasks.db'}"
+        auth_url = f"sqlite+aiosqlite:///{workdir / 'auth.db'}"
+    os.environ.update({
+        "AUTH_SECRET_KEY": BENCHMARK_SECRET,
+        "TODO_SERVICE_SECRET": BENCHMARK_SECRET,
+        # Revocations would be fetched over HTTP from a service that is not listening
+        "AUTH_SERVICE_URL": "",
+        "DATABASE_READ_URLS": "",
+        # Logins would otherwise be throttled long before the hashing pool is the bottleneck
+        "LOGIN_RATE_LIMIT_ENABLED": "0",
+        "PASSWORD_HASH_ROUNDS": str(args.bcrypt_rounds),
+        "DATABASE_SLOW_QUERY_MS": "0",
+    })
+    return tasks_url, auth_url
+
+
+def load_apps(tasks_url: str, auth_url: str):
+    """Import the task backend as src and the auth service as auth_service, each with its own database"""
+    os.environ["DATABASE_URL"] = tasks_url
+    sys.path.insert(0, str(BACKEND_PATH))
+    backend_main = importlib.import_module("src.main")
+
+    os.environ["DATABASE_URL"] = auth_url
+    source = AUTH_BACKEND_PATH / "src"
+    spec = importlib.util.spec_from_file_location(
+        AUTH_PACKAGE, source / "__init__.py", submodule_search_locations=[str(source)]
+    )
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[AUTH_PACKAGE] = package
+    spec.loader.exec_module(package)
+    auth_main = importlib.import_module(f"{AUTH_PACKAGE}.main")
+    return backend_main.app, auth_main.app
+
+
+async def seed(args, rng: random.Random) -> List[Dict]:
+    """
+    Insert users and tasks directly, bypassing the API.
+    Returns the benchmark sessions: the first --sessions users with their task ids.
+    """
+    from sqlalchemy import insert
+    from src.database_config import AsyncSessionLocal as TaskSession
+    from src.models.task import Task
+    auth_database = importlib.import_module(f"{AUTH_PACKAGE}.database")
+    auth_routes = importlib.import_module(f"{AUTH_PACKAGE}.routes.auth")
+    User = importlib.import_module(f"{AUTH_PACKAGE}.models.user").User
+
+    # One hash for every user; only the login benchmark pays the bcrypt cost
+    hashed_password = auth_routes.hash_password(BENCHMARK_PASSWORD)
+    run_id = f"{int(time.time())}"
+    now = datetime.utcnow()
+    users = [
+        {
+            "id": f"bench-{run_id}-{index}",
+            "email": f"bench-{run_id}-{index}@example.com",
+            "name": f"Benchmark user {index}",
+            "hashed_password": hashed_password,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for index in range(args.users)
+    ]
+    async with auth_database.AsyncSessionLocal() as session:
+        await session.execute(insert(User), users)
+        await session.commit()
+
+    tasks = []
+    for user in users:
+        for index in range(args.tasks_per_user):
+            created_at = now - timedelta(minutes=rng.randint(0, 60 * 24 * 90))
+            tasks.append({
+                "user_id": user["id"],
+                "title": f"Seeded task {index}",
+                "description": "x" * rng.randint(0, 200),
+                "completed": rng.random() < 0.3,
+                "created_at": created_at,
+                "updated_at": created_at,
+            })
+    async with TaskSession() as session:
+        for start in range(0, len(tasks), 1000):
+            await session.execute(insert(Task), tasks[start:start + 1000])
+        await session.commit()
+
+    from sqlmodel import select
+    sessions = []
+    async with TaskSession() as session:
+        for user in users[:args.sessions]:
+            result = await session.execute(select(Task.id).where(Task.user_id == user["id"]))
+            sessions.append({"user": user, "task_ids": list(result.scalars().all()), "token": None})
+    return sessions
+
+
+class Recorder:
+    """Latencies and status codes per operation for one concurrency level"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {name: [] for name in OPERATIONS}
+        self.statuses: Dict[str, Dict[str, int]] = {name: {} for name in OPERATIONS}
+
+    def record(self, operation: str, started: float, status_code: int) -> None:
+        self.latencies[operation].append((time.perf_counter() - started) * 1000)
+        statuses = self.statuses[operation]
+        statuses[str(status_code)] = statuses.get(str(status_code), 0) + 1
+
+    def summary(self, elapsed: float) -> Dict:
+        endpoints = {}
+        total = 0
+        for operation, latencies in self.latencies.items():
+            if not latencies:
+                continue
+            latencies.sort()
+            total += len(latencies)
+            errors = sum(count for status, count in self.statuses[operation].items() if not status.startswith("2"))
+            endpoints[operation] = {
+                "count": len(latencies),
+                "errors": errors,
+                "statuses": self.statuses[operation],
+                "throughput_rps": len(latencies) / elapsed,
+                "mean_ms": sum(latencies) / len(latencies),
+                "p50_ms": percentile(latencies, 0.50),
+                "p95_ms": percentile(latencies, 0.95),
+                "p99_ms": percentile(latencies, 0.99),
+                "max_ms": latencies[-1],
+            }
+        return {"duration_s": elapsed, "requests": total, "throughput_rps": total / elapsed, "endpoints": endpoints}
+
+
+async def op_login(clients, session, rng, recorder):
+    started = time.perf_counter()
+    response = await clients["auth"].post(
+        "/auth/login", data={"email": session["user"]["email"], "password": BENCHMARK_PASSWORD}
+    )
+    recorder.record("login", started, response.status_code)
+    if response.status_code == 200:
+        session["token"] = response.json()["access_token"]
+        session["headers"] = {"Authorization": f"Bearer {session['token']}"}
+
+
+async def op_list(clients, session, rng, recorder):
+    started = time.perf_counter()
+    response = await clients["tasks"].get(
+        f"/api/{session['user']['id']}/tasks", params={"limit": 50}, headers=session["headers"]
+    )
+    recorder.record("list", started, response.status_code)
+
+
+async def op_create(clients, session, rng, recorder):
+    user_id = session["user"]["id"]
+    started = time.perf_counter()
+    response = await clients["tasks"].post(
+        f"/api/{user_id}/tasks",
+        json={"title": f"Benchmark task {rng.randint(0, 1_000_000)}", "description": "created by the benchmark", "user_id": user_id},
+        headers=session["headers"]
+    )
+    recorder.record("create", started, response.status_code)
+    if response.status_code == 200:
+        session["task_ids"].append(response.json()["id"])
+
+
+async def op_toggle(clients, session, rng, recorder):
+    if not session["task_ids"]:
+        return await op_create(clients, session, rng, recorder)
+    task_id = rng.choice(session["task_ids"])
+    started = time.perf_counter()
+    response = await clients["tasks"].patch(
+        f"/api/{session['user']['id']}/tasks/{task_id}/complete", headers=session["headers"]
+    )
+    recorder.record("toggle", started, response.status_code)
+
+
+async def op_delete(clients, session, rng, recorder):
+    if not session["task_ids"]:
+        return await op_create(clients, session, rng, recorder)
+    # Removed before the request so no other worker toggles or deletes it meanwhile
+    task_id = session["task_ids"].pop(rng.randrange(len(session["task_ids"])))
+    started = time.perf_counter()
+    response = await clients["tasks"].delete(
+        f"/api/{session['user']['id']}/tasks/{task_id}", headers=session["headers"]
+    )
+    recorder.record("delete", started, response.status_code)
+
+
+OPERATIONS = {
+    "login": op_login,
+    "list": op_list,
+    "create": op_create,
+    "toggle": op_toggle,
+    "delete": op_delete,
+}
+
+
+async def run_level(clients, sessions, mix, concurrency: int, duration: float, seed_value: int) -> Dict:
+    """Run the mix with a fixed number of concurrent clients for a fixed time"""
+    recorder = Recorder()
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    deadline = time.perf_counter() + duration
+
+    async def worker(index: int):
+        rng = random.Random(seed_value * 1000 + index)
+        while time.perf_counter() < deadline:
+            session = sessions[rng.randrange(len(sessions))]
+            operation = rng.choices(names, weights)[0]
+            await OPERATIONS[operation](clients, session, rng, recorder)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    return {"concurrency": concurrency, **recorder.summary(time.perf_counter() - started)}
+
+
+async def run_benchmarks(args) -> Dict:
+    import httpx
+
+    workdir = pathlib.Path(tempfile.mkdtemp(prefix="todo-bench-"))
+    tasks_url, auth_url = configure_environment(args, workdir)
+    backend_app, auth_app = load_apps(tasks_url, auth_url)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    await auth_app.router.startup()
+    await backend_app.router.startup()
+    try:
+        rng = random.Random(args.seed)
+        sessions = await seed(args, rng)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=auth_app), base_url="http://auth") as auth_client, \
+                httpx.AsyncClient(transport=httpx.ASGITransport(app=backend_app), base_url="http://tasks") as task_client:
+            clients = {"auth": auth_client, "tasks": task_client}
+            # Every session starts logged in; the login operation refreshes its token
+            for session in sessions:
+                await op_login(clients, session, rng, Recorder())
+
+            levels = []
+            for concurrency in args.concurrency:
+                if args.warmup > 0:
+                    await run_level(clients, sessions, args.mix, concurrency, args.warmup, args.seed)
+                level = await run_level(clients, sessions, args.mix, concurrency, args.duration, args.seed)
+                levels.append(level)
+                print(
+                    f"concurrency {concurrency}: {level['throughput_rps']:.0f} req/s, "
+                    + ", ".join(
+                        f"{name} p95 {stats['p95_ms']:.1f}ms" for name, stats in level["endpoints"].items()
+                    ),
+                    file=sys.stderr
+                )
+    finally:
+        await backend_app.router.shutdown()
+        await auth_app.router.shutdown()
+
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "created_at": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": "postgresql" if args.postgres_url else "sqlite",
+            "seed": args.seed,
+            "users": args.users,
+            "tasks_per_user": args.tasks_per_user,
+            "sessions": args.sessions,
+            "mix": args.mix,
+            "bcrypt_rounds": args.bcrypt_rounds,
+            "duration_s": args.duration,
+        },
+        "levels": levels,
+    }
+
+
+def compare(baseline: Dict, current: Dict, threshold: float, min_delta_ms: float) -> List[str]:
+    """
+    Regressions of current against baseline: a p95 latency more than `threshold` (and
+    min_delta_ms) higher, or a throughput more than `threshold` lower, at the same concurrency.
+    """
+    regressions = []
+    baseline_levels = {level["concurrency"]: level for level in baseline["levels"]}
+    for level in current["levels"]:
+        base = baseline_levels.get(level["concurrency"])
+        if base is None:
+            continue
+        for name, stats in level["endpoints"].items():
+            base_stats = base["endpoints"].get(name)
+            if base_stats is None:
+                continue
+            label = f"concurrency {level['concurrency']} {name}"
+            p95, base_p95 = stats["p95_ms"], base_stats["p95_ms"]
+            if p95 > base_p95 * (1 + threshold) and p95 - base_p95 >= min_delta_ms:
+                regressions.append(f"{label}: p95 {base_p95:.1f}ms -> {p95:.1f}ms")
+            rps, base_rps = stats["throughput_rps"], base_stats["throughput_rps"]
+            if rps < base_rps * (1 - threshold):
+                regressions.append(f"{label}: throughput {base_rps:.0f} -> {rps:.0f} req/s")
+    return regressions
+
+
+def report_regressions(regressions: List[str]) -> int:
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    if not regressions:
+        print("No regressions against the baseline", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmarks and write a JSON report")
+    run.add_argument("--users", type=int, default=1000, help="Users to seed")
+    run.add_argument("--tasks-per-user", type=int, default=50, help="Tasks seeded per user")
+    run.add_argument("--sessions", type=int, default=100, help="Seeded users the benchmark logs in and acts as")
+    run.add_argument("--concurrency", type=lambda value: [int(c) for c in value.split(",")], default=[1, 8, 32],
+                     help="Comma-separated concurrency levels")
+    run.add_argument("--duration", type=float, default=10.0, help="Measured seconds per level")
+    run.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before each level")
+    run.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"Operation weights (default {DEFAULT_MIX})")
+    run.add_argument("--seed", type=int, default=1, help="Seed for the data and the request sequence")
+    run.add_argument("--bcrypt-rounds", type=int, default=10, help="bcrypt cost used for logins")
+    run.add_argument("--postgres-url", help="Benchmark against this PostgreSQL database instead of SQLite")
+    run.add_argument("--output", help="Write the JSON report here (default: stdout)")
+    run.add_argument("--baseline", help="Compare against this report and exit 1 on regressions")
+    run.add_argument("--threshold", type=float, default=0.10, help="Relative change counted as a regression")
+    run.add_argument("--min-delta-ms", type=float, default=1.0, help="Ignore p95 increases smaller than this")
+
+    compare_parser = commands.add_parser("compare", help="Compare two JSON reports")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10)
+    compare_parser.add_argument("--min-delta-ms", type=float, default=1.0)
+
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        with open(args.baseline) as baseline_file, open(args.current) as current_file:
+            baseline, current = json.load(baseline_file), json.load(current_file)
+        return report_regressions(compare(baseline, current, args.threshold, args.min_delta_ms))
+
+    report = asyncio.run(run_benchmarks(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(output + "\n")
+    else:
+        print(output)
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        return report_regressions(compare(baseline, report, args.threshold, args.min_delta_ms))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,7 +16,8 @@ export async function GET(request) {
     // Determine the correct endpoint based on the request
     const url = new URL(request.url);
     const path = url.pathname.split('/api/todo')[1] || '';
-    const targetUrl = `${todoApiUrl}/api${path}`;
+    // Forward the query string so paging parameters (limit, cursor) reach the backend
+    const targetUrl = `${todoApiUrl}/api${path}${url.search}`;
 
     const authHeader = request.headers.get('authorization');
     const response = await fetch(targetUrl, {
@@ -25,6 +25,8 @@ export default function TasksPage() {
   const [tasks, setTasks] = useState<Task[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     // Wait for the component to mount on the client side
@@ -63,8 +65,9 @@ export default function TasksPage() {
         throw new Error('Authentication token not found');
       }
 
-      const userTasks = await todoAPI.getTasks(user.id, token);
-      setTasks(userTasks);
+      const page = await todoAPI.getTasks(user.id, token);
+      setTasks(page.items);
+      setNextCursor(page.next_cursor);
     } catch (err: any) {
       console.error('Error fetching tasks:', err);
       setError(err.message || 'Failed to load tasks');
@@ -73,6 +76,37 @@ export default function TasksPage() {
     }
   };
 
+  const loadMoreTasks = async () => {
+    if (!nextCursor) {
+      return;
+    }
+
+    try {
+      setLoadingMore(true);
+
+      // Get user ID from token
+      const user = getUserFromToken();
+      if (!user) {
+        throw new Error('User not found');
+      }
+
+      // Get token from storage
+      const token = getToken();
+      if (!token) {
+        throw new Error('Authentication token not found');
+      }
+
+      const page = await todoAPI.getTasks(user.id, token, nextCursor);
+      setTasks((loaded) => [...loaded, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch (err: any) {
+      console.error('Error loading more tasks:', err);
+      setError(err.message || 'Failed to load tasks');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleDeleteTask = async (taskId: number) => {
     try {
       // Get user ID from token
@@ -223,6 +257,17 @@ export default function TasksPage() {
             ))}
           </div>
         )}
+        {nextCursor && (
+          <div className="mt-8 text-center">
+            <button
+              onClick={loadMoreTasks}
+              disabled={loadingMore}
+              className="button-primary"
+            >
+              {loadingMore ? 'Loading...' : 'Load more tasks'}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
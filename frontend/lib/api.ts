@@ -7,6 +7,9 @@
 const PROXY_AUTH_URL = '/api/auth';
 const PROXY_TODO_URL = '/api/todo';
 
+// Largest page the task list endpoint serves
+const TASK_PAGE_SIZE = 200;
+
 // Function to handle API responses
 const handleResponse = async (response: Response) => {
   if (!response.ok) {
@@ -58,15 +61,17 @@ export const authAPI = {
 
 // Todo API functions
 export const todoAPI = {
-  // Get all tasks for a user
-  getTasks: async (userId: string, token: string) => {
-    const response = await fetch(`${PROXY_TODO_URL}?userId=${encodeURIComponent(userId)}`, {
+  // Get one page of tasks for a user; pass the previous page's next_cursor to get the next one
+  getTasks: async (userId: string, token: string, cursor?: string | null) => {
+    const cursorParam = cursor ? `&cursor=${encodeURIComponent(cursor)}` : '';
+    const response = await fetch(`${PROXY_TODO_URL}?userId=${encodeURIComponent(userId)}&limit=${TASK_PAGE_SIZE}${cursorParam}`, {
       headers: {
         'Authorization': `Bearer ${token}`,
         'Content-Type': 'application/json',
       },
     });
 
+    // The list endpoint returns a page: { items, next_cursor }
     return handleResponse(response);
   },
 